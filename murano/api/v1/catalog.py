@@ -31,6 +31,7 @@ from murano.api.v1 import validation_schemas
 from murano.common import exceptions
 from murano.common.i18n import _
 from murano.common import policy
+from murano.common import rpc
 import murano.common.utils as murano_utils
 from murano.common import wsgi
 from murano.db.catalog import api as db_api
@@ -91,6 +92,27 @@ def _get_filters(query_params):
     return filters
 
 
+def _invalidate_schemas(package_name):
+    try:
+        rpc.engine().invalidate_schemas(package_name)
+    except Exception:
+        LOG.warning('Unable to invalidate cached schemas of package '
+                    '{name}'.format(name=package_name), exc_info=True)
+
+
+def _cache_schemas(context, package_name, package_version):
+    credentials = {
+        'token': context.auth_token,
+        'project_id': context.tenant
+    }
+    try:
+        rpc.engine().cache_schemas(
+            credentials, package_name, package_version)
+    except Exception:
+        LOG.warning('Unable to cache schemas of package {name}'.format(
+            name=package_name), exc_info=True)
+
+
 def _validate_body(body):
     """Check multipart/form-data has two parts
 
@@ -189,6 +211,7 @@ class Controller(object):
                     LOG.error(msg)
                     raise exc.HTTPBadRequest(explanation=msg)
         package = db_api.package_update(package_id, body, req.context)
+        _invalidate_schemas(package.fully_qualified_name)
         return package.to_dict()
 
     def get(self, req, package_id):
@@ -222,6 +245,48 @@ class Controller(object):
         result['packages'] = [package.to_dict() for package in packages]
         return result
 
+    def resolve(self, req, body):
+        """Resolves many package references at once
+
+        Request body lists the references, each one is either a package
+        fully qualified name or a name of a class::
+
+            {"packages": [{"fqn": "com.example.App"},
+                          {"class_name": "com.example.Class"}]}
+
+        The response contains the best matching package (or null) for each
+        reference in the same order. Packages are matched like catalog
+        search does: only enabled packages owned by the tenant or public
+        ones are considered and own packages take precedence.
+        """
+        policy.check("get_package", req.context)
+        try:
+            jsonschema.validate(body, validation_schemas.PKG_RESOLVE_SCHEMA)
+        except jsonschema.ValidationError as e:
+            msg = _("Request body is not valid: {reason}").format(reason=e)
+            LOG.error(msg)
+            raise exc.HTTPBadRequest(explanation=msg)
+
+        references = body['packages']
+        if len(references) > CONF.murano.api_limit_max:
+            msg = _("Number of packages to resolve must not exceed "
+                    "{limit}").format(limit=CONF.murano.api_limit_max)
+            LOG.error(msg)
+            raise exc.HTTPBadRequest(explanation=msg)
+
+        packages_by_fqn, packages_by_class = db_api.package_resolve(
+            [ref['fqn'] for ref in references if 'fqn' in ref],
+            [ref['class_name'] for ref in references if 'class_name' in ref],
+            req.context)
+        result = []
+        for ref in references:
+            if 'fqn' in ref:
+                package = packages_by_fqn.get(ref['fqn'])
+            else:
+                package = packages_by_class.get(ref['class_name'])
+            result.append(None if package is None else package.to_dict())
+        return {'packages': result}
+
     def upload(self, req, body=None):
         """Upload new file archive
 
@@ -276,6 +341,11 @@ class Controller(object):
                             'name is already registered')
                     LOG.exception(msg)
                     raise exc.HTTPConflict(msg)
+                # the package may shadow a dependency of cached schemas
+                _invalidate_schemas(package.fully_qualified_name)
+                if CONF.engine.cache_schemas_on_upload:
+                    _cache_schemas(req.context, package.fully_qualified_name,
+                                   str(pkg_to_upload.version))
                 return package.to_dict()
         except pkg_exc.PackageLoadError as e:
             msg = _("Couldn't load package from file: {reason}").format(
@@ -331,6 +401,7 @@ class Controller(object):
         if package.is_public:
             policy.check("manage_public_package", req.context, target)
         db_api.package_delete(package_id, req.context)
+        _invalidate_schemas(package.fully_qualified_name)
 
     def get_category(self, req, category_id):
         policy.check("get_category", req.context)
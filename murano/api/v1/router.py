@@ -231,6 +231,10 @@ class API(wsgi.Router):
                        controller=catalog_resource,
                        action='show_categories',
                        conditions={'method': ['GET']})
+        mapper.connect('/catalog/packages/resolve',
+                       controller=catalog_resource,
+                       action='resolve',
+                       conditions={'method': ['POST']})
         mapper.connect('/catalog/packages/{package_id}',
                        controller=catalog_resource,
                        action='get',
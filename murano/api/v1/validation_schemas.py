@@ -116,3 +116,27 @@ PKG_UPDATE_SCHEMA = {
     "additionalProperties": False,
     "minProperties": 1,
 }
+
+PKG_RESOLVE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+
+    "type": "object",
+    "properties": {
+        "packages": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "fqn": {"type": "string"},
+                    "class_name": {"type": "string"}
+                },
+                "additionalProperties": False,
+                "minProperties": 1,
+                "maxProperties": 1
+            }
+        }
+    },
+    "additionalProperties": False,
+    "required": ["packages"]
+}
@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import glob
 import os
 
 import eventlet
@@ -31,6 +32,7 @@ import sys
 from oslo_concurrency import processutils
 from oslo_log import log as logging
 from oslo_service import service
+from oslo_utils import fileutils
 
 from murano.common import config
 from murano.common import engine
@@ -50,6 +52,10 @@ def main():
         config.parse_args()
 
         logging.setup(CONF, 'murano')
+        if CONF.engine.ready_file:
+            # ready files of the workers of the previous launch
+            for path in glob.glob(engine.get_ready_file('*')):
+                fileutils.delete_if_exists(path)
         workers = CONF.engine.engine_workers
         if not workers:
             workers = processutils.get_worker_count()
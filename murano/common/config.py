@@ -255,11 +255,120 @@ engine_opts = [
                        'deployments.'),
                 deprecated_group='packages_opts'),
 
+    cfg.IntOpt('packages_cache_max_size', default=0, min=0,
+               help=_('Maximum total size in megabytes of the packages kept '
+                      'in packages_cache. Least recently used packages are '
+                      'evicted first, packages used by running deployments '
+                      'are never evicted. 0 means no limit. Only applies '
+                      'when enable_packages_cache is set.')),
+
+    cfg.IntOpt('packages_cache_max_entries', default=0, min=0,
+               help=_('Maximum number of packages kept in packages_cache. '
+                      '0 means no limit. Only applies when '
+                      'enable_packages_cache is set.')),
+
     cfg.StrOpt('packages_service', default='murano',
                help=_('The service to store murano packages: murano (stands '
                       'for legacy behavior using murano-api) or glance '
                       '(stands for glance-glare artifact service)'),
                deprecated_group='packages_opts'),
+
+    cfg.IntOpt('class_definitions_cache_size', default=1000, min=0,
+               help=_('Maximum number of parsed MuranoPL class definitions '
+                      'kept in memory by each engine worker and shared '
+                      'between tasks. Least recently used definitions are '
+                      'evicted first. 0 disables the cache.')),
+
+    cfg.IntOpt('packages_download_concurrency', default=8, min=1,
+               help=_('Maximum number of packages each engine worker '
+                      'downloads at the same time. Also limits the number '
+                      'of pooled connections to the packages service.')),
+
+    cfg.BoolOpt('enable_warm_up', default=False,
+                help=_('Prepare each engine worker for processing of tasks '
+                       'before it starts consuming them: preload and parse '
+                       'the warm_up_packages available in load_packages_from '
+                       'directories and build the yaql contexts of all '
+                       'MuranoPL runtime versions.')),
+
+    cfg.ListOpt('warm_up_packages',
+                default=['io.murano', 'io.murano.applications'],
+                help=_('List of packages preloaded by engine workers at '
+                       'startup when enable_warm_up is set.')),
+
+    cfg.StrOpt('ready_file',
+               help=_('Path prefix of the ready files of engine workers. '
+                      'Each worker creates its own file, named by the path '
+                      'followed by a dot and the worker process id, once it '
+                      'has finished the warm-up and started consuming tasks, '
+                      'and removes it when it stops. The files are removed '
+                      'when the engine is launched. The engine is ready '
+                      'once there is a file for each of engine_workers. Can '
+                      'be used as a readiness probe.')),
+
+    cfg.BoolOpt('enable_lazy_model_loading', default=False,
+                help=_('Load only the part of the object model required by '
+                       'an action: the object the action is called on with '
+                       'all the objects it owns and references, and its '
+                       'owners. Other objects stored in lists of the loaded '
+                       'objects are not loaded and are passed to the '
+                       'resulting object model untouched. Note that such '
+                       'objects are not visible to the action.')),
+
+    cfg.StrOpt('profiler_dir', default=None,
+               help=_('Directory to write MuranoPL execution profiles to. '
+                      'If set, calls of MuranoPL methods and YAQL '
+                      'expressions of each deployment task are timed and '
+                      'two files are written per task: <env id>-<time>.'
+                      'stacks in the collapsed stacks format accepted by '
+                      'flame graph tools and <env id>-<time>.stats with '
+                      'per-method call counts, inclusive, exclusive and '
+                      'waiting times. Profiling slows the execution '
+                      'down.')),
+
+    cfg.IntOpt('max_concurrent_tasks', default=0, min=0,
+               help=_('Maximum number of deployments processed by an '
+                      'engine worker at once. Other deployments are queued '
+                      'per project and the projects are served in turn. '
+                      'Deployments of the same environment are always '
+                      'processed one at a time. Static actions and schema '
+                      'generation requests are not limited. 0 means no '
+                      'limit.')),
+
+    cfg.IntOpt('schema_cache_size', default=500, min=0,
+               help=_('Maximum number of JSON schemas of classes and their '
+                      'model builders cached by an engine worker. Schemas '
+                      'are dropped once a package with the name of any of '
+                      'the packages they were generated from is uploaded, '
+                      'updated or deleted. 0 disables the cache.')),
+
+    cfg.BoolOpt('cache_schemas_on_upload', default=False,
+                help=_('Generate and cache JSON schemas of all classes of '
+                       'a package in every engine worker as soon as the '
+                       'package is uploaded to the catalog.')),
+
+    cfg.IntOpt('static_action_executor_pool_size', default=0, min=0,
+               help=_('Maximum number of idle MuranoPL executors kept by an '
+                      'engine worker to run static actions with. Executors '
+                      'are reused by subsequent calls made with the same '
+                      'project and token, so that packages and classes '
+                      'loaded by a call are not loaded again. 0 disables '
+                      'the pool.')),
+
+    cfg.IntOpt('static_action_executor_ttl', default=60, min=1,
+               help=_('Time in seconds an idle executor is kept in the '
+                      'static action executor pool. Packages updated or '
+                      'deleted in the catalog may still be used by static '
+                      'actions for that long.')),
+
+    cfg.IntOpt('process_pool_size', default=0, min=0,
+               help=_('Number of worker processes each engine worker '
+                      'spawns to run CPU-bound stages of tasks: encoding '
+                      'of task results to JSON, computing object model '
+                      'patches and the closure of object relationships '
+                      'for Congress. The engine keeps processing other '
+                      'tasks meanwhile. 0 disables the pool and the '
+                      'stages are run in the engine worker.')),
 ]
 
 # TODO(sjmc7): move into engine opts?
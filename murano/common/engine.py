@@ -13,11 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
 import copy
+import io
+import os
+import timeit
 import traceback
 import uuid
 
 import eventlet.debug
+from eventlet import event
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging as messaging
@@ -25,19 +31,30 @@ from oslo_messaging.rpc import dispatcher
 from oslo_messaging import target
 from oslo_serialization import jsonutils
 from oslo_service import service
+from oslo_utils import fileutils
+from oslo_utils import timeutils
+import six
 
 from murano.common import auth_utils
 from murano.common.helpers import token_sanitizer
 from murano.common.plugins import extensions_loader
 from murano.common import rpc
+from murano.common import utils
+from murano.dsl import constants
 from murano.dsl import context_manager
+from murano.dsl.contracts import contracts
 from murano.dsl import dsl_exception
+from murano.dsl import exceptions as dsl_exceptions
 from murano.dsl import executor as dsl_executor
 from murano.dsl import helpers
+from murano.dsl import lock_table
+from murano.dsl import profiler
 from murano.dsl import schema_generator
 from murano.dsl import serializer
 from murano.engine import execution_session
 from murano.engine import package_loader
+from murano.engine import partial_model
+from murano.engine import process_pool
 from murano.engine.system import status_reporter
 from murano.engine.system import yaql_functions
 from murano.policy import model_policy_enforcer as enforcer
@@ -46,6 +63,12 @@ CONF = cfg.CONF
 
 PLUGIN_LOADER = None
 
+TASK_SCHEDULER = None
+
+SCHEMA_CACHE = None
+
+STATIC_ACTION_POOL = None
+
 LOG = logging.getLogger(__name__)
 
 eventlet.debug.hub_exceptions(False)
@@ -56,8 +79,14 @@ class EngineService(service.Service):
     def __init__(self):
         super(EngineService, self).__init__()
         self.server = None
+        self.ready = event.Event()
 
     def start(self):
+        if CONF.engine.enable_warm_up:
+            warm_up()
+        # worker processes are forked before any task is processed
+        process_pool.get_pool()
+
         endpoints = [
             TaskProcessingEndpoint(),
             StaticActionEndpoint(),
@@ -71,13 +100,31 @@ class EngineService(service.Service):
             transport, s_target, endpoints, 'eventlet',
             access_policy=access_policy)
         self.server.start()
+        self._signal_ready()
         super(EngineService, self).start()
 
+    def _signal_ready(self):
+        LOG.info('Engine worker is ready to process tasks')
+        if not self.ready.ready():
+            self.ready.send()
+        ready_file = get_ready_file()
+        if ready_file:
+            try:
+                open(ready_file, 'a').close()
+            except (IOError, OSError):
+                LOG.warning('Unable to create ready file {path}'.format(
+                    path=ready_file), exc_info=True)
+
     def stop(self, graceful=False):
         if self.server:
             self.server.stop()
             if graceful:
                 self.server.wait()
+        ready_file = get_ready_file()
+        if ready_file:
+            fileutils.delete_if_exists(ready_file)
+        process_pool.shutdown()
+        get_static_action_pool().clear()
         super(EngineService, self).stop()
 
     def reset(self):
@@ -94,6 +141,211 @@ def get_plugin_loader():
     return PLUGIN_LOADER
 
 
+def get_ready_file(pid=None):
+    """Returns the path of the ready file of the engine worker
+
+    Each worker signals its own readiness with a file named by the
+    ready_file path followed by the id of the worker process. The file of
+    the current process is returned unless pid is given.
+    """
+    if not CONF.engine.ready_file:
+        return None
+    return '{0}.{1}'.format(CONF.engine.ready_file, pid or os.getpid())
+
+
+def get_task_scheduler():
+    global TASK_SCHEDULER
+
+    if TASK_SCHEDULER is None:
+        TASK_SCHEDULER = TaskScheduler(CONF.engine.max_concurrent_tasks)
+    return TASK_SCHEDULER
+
+
+def get_schema_cache():
+    global SCHEMA_CACHE
+
+    if SCHEMA_CACHE is None:
+        SCHEMA_CACHE = helpers.LruCache(CONF.engine.schema_cache_size)
+    return SCHEMA_CACHE
+
+
+def get_static_action_pool():
+    global STATIC_ACTION_POOL
+
+    if STATIC_ACTION_POOL is None:
+        STATIC_ACTION_POOL = StaticActionExecutorPool(
+            CONF.engine.static_action_executor_pool_size,
+            CONF.engine.static_action_executor_ttl)
+    return STATIC_ACTION_POOL
+
+
+class TaskStats(object):
+    __slots__ = ('tasks', 'queued_tasks', 'wait_time', 'max_wait_time')
+
+    def __init__(self):
+        self.tasks = 0
+        self.queued_tasks = 0
+        self.wait_time = 0
+        self.max_wait_time = 0
+
+    def __repr__(self):
+        return ('<TaskStats tasks={0} queued_tasks={1} wait_time={2:.6f} '
+                'max_wait_time={3:.6f}>'.format(
+                    self.tasks, self.queued_tasks, self.wait_time,
+                    self.max_wait_time))
+
+
+class TaskScheduler(object):
+    """Admission control of deployment tasks processed by the engine worker
+
+    Tasks of the same environment are executed one at a time in the order
+    they arrived. No more than max_concurrent_tasks tasks (0 means no
+    limit) are executed at once. Tasks waiting for a free slot are queued
+    per project and the projects are served in turn, so that a burst of
+    tasks of one project does not hold back the others. Static actions and
+    schema generation requests are short synchronous calls and do not go
+    through the scheduler, so they are never queued behind deployments.
+
+    The number of running and queued tasks and the time the tasks spent
+    waiting are exposed for monitoring.
+    """
+
+    def __init__(self, max_concurrent_tasks=0):
+        self._limit = max_concurrent_tasks
+        self._running = 0
+        # project id -> deque of events of the tasks waiting for a slot,
+        # projects are served in the order of the keys
+        self._queues = collections.OrderedDict()
+        self._environment_locks = lock_table.LockTable()
+        self._stats = TaskStats()
+
+    @property
+    def running(self):
+        return self._running
+
+    @property
+    def queue_depth(self):
+        return sum(len(t) for t in six.itervalues(self._queues))
+
+    @property
+    def queue_depths(self):
+        return dict((project_id, len(queue))
+                    for project_id, queue in six.iteritems(self._queues))
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @contextlib.contextmanager
+    def task(self, project_id, environment_id=None):
+        """Holds an execution slot for a task of the project
+
+        If the environment id is given, waits for the preceding tasks of
+        the environment to finish first.
+        """
+        start = timeit.default_timer()
+        if environment_id is None:
+            with self._slot(project_id, start):
+                yield
+        else:
+            with self._environment_locks.acquire(
+                    None, environment_id, object(), 'environment'):
+                with self._slot(project_id, start):
+                    yield
+
+    @contextlib.contextmanager
+    def _slot(self, project_id, start):
+        self._acquire_slot(project_id)
+        try:
+            wait_time = timeit.default_timer() - start
+            self._record_wait(wait_time)
+            LOG.debug('Task of project {project} started after waiting for '
+                      '{wait:.3f} s, {running} tasks running, {queued} '
+                      'queued'.format(project=project_id, wait=wait_time,
+                                      running=self._running,
+                                      queued=self.queue_depth))
+            yield
+        finally:
+            self._release_slot()
+
+    def _acquire_slot(self, project_id):
+        if not self._limit or self._running < self._limit:
+            self._running += 1
+            return
+        waiter = event.Event()
+        queue = self._queues.get(project_id)
+        if queue is None:
+            queue = self._queues[project_id] = collections.deque()
+        queue.append(waiter)
+        self._stats.queued_tasks += 1
+        try:
+            waiter.wait()
+        except BaseException:
+            if waiter.ready():
+                # the slot has already been handed over to this task
+                self._release_slot()
+            else:
+                queue.remove(waiter)
+                if not queue:
+                    del self._queues[project_id]
+            raise
+
+    def _release_slot(self):
+        if not self._queues:
+            self._running -= 1
+            return
+        # the slot is handed over to the first task of the next project
+        project_id, queue = self._queues.popitem(last=False)
+        waiter = queue.popleft()
+        if queue:
+            self._queues[project_id] = queue
+        waiter.send()
+
+    def _record_wait(self, wait_time):
+        self._stats.tasks += 1
+        self._stats.wait_time += wait_time
+        self._stats.max_wait_time = max(self._stats.max_wait_time, wait_time)
+
+
+def warm_up():
+    """Prepares the worker for processing of tasks
+
+    Loads the plugins, builds the root and contract contexts of every
+    runtime version and parses classes of the warm_up_packages found in
+    local package directories, so that the first task handled by the
+    worker does not have to.
+    """
+    LOG.info('Warming up engine worker')
+    plugin_loader = get_plugin_loader()
+    context_mgr = ContextManager()
+    for runtime_version in constants.RUNTIME_VERSIONS:
+        context_mgr.create_root_context(runtime_version)
+        contracts.Contract.prepare_contexts(runtime_version)
+
+    session = execution_session.ExecutionSession()
+    version_spec = helpers.parse_version_spec('>=0.0.0')
+    with package_loader.CombinedPackageLoader(session) as pkg_loader:
+        plugin_loader.register_in_loader(pkg_loader)
+        for package_name in CONF.engine.warm_up_packages:
+            package = None
+            for loader in pkg_loader.directory_loaders:
+                try:
+                    package = loader.load_package(package_name, version_spec)
+                    break
+                except dsl_exceptions.NoPackageFound:
+                    continue
+            if package is None:
+                LOG.debug('Package {name} is not available locally, skipping '
+                          'its warm-up'.format(name=package_name))
+                continue
+            for class_name in package.classes:
+                try:
+                    package.find_class(class_name, search_requirements=False)
+                except Exception:
+                    LOG.warning('Unable to load class {name} during warm-up'
+                                .format(name=class_name), exc_info=True)
+
+
 class ContextManager(context_manager.ContextManager):
     def create_root_context(self, runtime_version):
         root_context = super(ContextManager, self).create_root_context(
@@ -111,38 +363,149 @@ class ContextManager(context_manager.ContextManager):
 
 
 class SchemaEndpoint(object):
+    """Generates JSON schemas of classes and their model builders
+
+    Generated schemas are cached by the project, the id of the package the
+    class was loaded from, class name, package version and the requested
+    model builders. The project is a part of the key as dependencies are
+    resolved to the packages of the project first. Each entry remembers the
+    fully qualified names of all packages loaded from the API to generate
+    it. An upload, update or deletion of a package with any of these names
+    drops the entry, as it may change the package a dependency resolves to.
+    """
+
+    @classmethod
+    def generate_schema(cls, context, class_name, method_names=None,
+                        class_version=None, package_name=None):
+        session = execution_session.ExecutionSession()
+        session.token = context['token']
+        session.project_id = context['project_id']
+        with package_loader.CombinedPackageLoader(session) as pkg_loader:
+            package = schema_generator.find_class_package(
+                pkg_loader, class_name, class_version, package_name)
+            return cls._generate_schema(
+                session.project_id, pkg_loader, package, class_name,
+                method_names, class_version, package_name)
+
+    @staticmethod
+    def _generate_schema(project_id, pkg_loader, package, class_name,
+                         method_names, class_version, package_name):
+        cache = get_schema_cache()
+        key = None
+        if package.package_id is not None:
+            if method_names and not isinstance(method_names, (list, tuple)):
+                method_names = (method_names,)
+            key = (project_id, package.package_id, class_name,
+                   str(package.version), frozenset(method_names or ()))
+            cached = cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached[1])
+
+        result = schema_generator.generate_schema(
+            pkg_loader, ContextManager(), class_name, method_names,
+            class_version, package_name)
+        if key is not None:
+            package_names = set(
+                t.name for t in pkg_loader.api_loader.packages)
+            package_names.add(package.name)
+            cache.put(key, (package_names, copy.deepcopy(result)))
+        return result
+
     @classmethod
-    def generate_schema(cls, context, *args, **kwargs):
+    def cache_schemas(cls, context, package_name, package_version):
+        """Generates and caches schemas of all classes of the package"""
+
         session = execution_session.ExecutionSession()
         session.token = context['token']
         session.project_id = context['project_id']
+        version = '=={0}'.format(package_version)
         with package_loader.CombinedPackageLoader(session) as pkg_loader:
-            return schema_generator.generate_schema(
-                pkg_loader, ContextManager(), *args, **kwargs)
+            package = pkg_loader.load_package(
+                package_name, helpers.parse_version_spec(version))
+            for class_name in package.classes:
+                try:
+                    cls._generate_schema(
+                        session.project_id, pkg_loader, package,
+                        class_name, None, version, package_name)
+                except Exception:
+                    LOG.warning('Unable to generate schema of class '
+                                '{name}'.format(name=class_name),
+                                exc_info=True)
+
+    @staticmethod
+    def invalidate_schemas(context, package_name):
+        """Drops cached schemas that depend on packages with the name"""
+
+        cache = get_schema_cache()
+        for key in cache.keys():
+            if package_name in cache.get(key)[0]:
+                cache.pop(key)
 
 
 class TaskProcessingEndpoint(object):
     @classmethod
     def handle_task(cls, context, task):
-        result = cls.execute(task)
-        rpc.api().process_result(result, task['id'])
+        # the result is sent before the next task of the environment starts
+        with get_task_scheduler().task(task['project_id'], task['id']):
+            task_executor, result = cls._execute(task)
+            cls._send_result(task_executor, result, task['id'])
 
     @staticmethod
-    def execute(task):
+    def _send_result(task_executor, result, task_id):
+        api = rpc.api()
+        try:
+            return api.process_serialized_result(
+                result, task_id, task_executor.return_model_patch)
+        except messaging.RemoteError as e:
+            if rpc.is_not_supported(e):
+                # the API has not been upgraded yet
+                LOG.debug('API does not accept serialized results, falling '
+                          'back to process_result')
+                return api.process_result(
+                    task_executor.get_full_result(jsonutils.loads(result)),
+                    task_id)
+            if e.exc_type != 'ModelPatchError':
+                raise
+        LOG.warning('API cannot apply the object model patch of task '
+                    '{task_id}, sending the whole object model'.format(
+                        task_id=task_id))
+        result = task_executor.get_full_result(jsonutils.loads(result))
+        return api.process_serialized_result(
+            process_pool.run(jsonutils.dumps, result), task_id)
+
+    @staticmethod
+    def execute(task, serialize=False):
+        """Executes the task
+
+        Returns the result of the task or, if serialize is True, its JSON
+        representation.
+        """
+        result = TaskProcessingEndpoint._execute(task)[1]
+        return result if serialize else jsonutils.loads(result)
+
+    @staticmethod
+    def _execute(task):
+        """Executes the task
+
+        Returns the executor of the task and the JSON representation of the
+        result. The result is encoded only once and the same JSON is written
+        to the log and sent to the API.
+        """
         s_task = token_sanitizer.TokenSanitizer().sanitize(task)
         LOG.info('Starting processing task: {task_desc}'.format(
             task_desc=jsonutils.dumps(s_task)))
 
-        result = None
+        result_json = jsonutils.dumps(None)
         reporter = status_reporter.StatusReporter(task['id'])
 
         try:
             task_executor = TaskExecutor(task, reporter)
             result = task_executor.execute()
-            return result
+            result_json = process_pool.run(jsonutils.dumps, result)
+            return task_executor, result_json
         finally:
             LOG.info('Finished processing task: {task_desc}'.format(
-                task_desc=jsonutils.dumps(result)))
+                task_desc=result_json))
 
 
 class StaticActionEndpoint(object):
@@ -177,24 +540,38 @@ class TaskExecutor(object):
     def model(self):
         return self._model
 
+    @property
+    def return_model_patch(self):
+        return self._return_model_patch
+
     def __init__(self, task, reporter=None):
         if reporter is None:
             reporter = status_reporter.StatusReporter(task['id'])
         self._action = task.get('action')
-        self._model = task['model']
+        self._task_id = task['id']
+        self._source_model = task['model']
+        self._model = dict(self._source_model)
+        self._return_model_patch = task.get('return_model_patch', False)
+        self._source_digest = None
         self._session = execution_session.ExecutionSession()
         self._session.token = task['token']
         self._session.project_id = task['project_id']
         self._session.user_id = task['user_id']
         self._session.environment_owner_project_id = self._model['project_id']
         self._session.environment_owner_user_id = self._model['user_id']
-        self._session.system_attributes = self._model.get('SystemData', {})
+        self._session.system_attributes = dict(
+            self._model.get('SystemData', {}))
         self._reporter = reporter
 
         self._model_policy_enforcer = enforcer.ModelPolicyEnforcer(
             self._session)
 
     def execute(self):
+        if self._return_model_patch:
+            # the API checks the patch is applied to the same model, which
+            # may be changed in place while the task is executed
+            self._source_digest = process_pool.run(
+                utils.get_model_digest, self._source_model)
         try:
             self._create_trust()
         except Exception as e:
@@ -209,7 +586,12 @@ class TaskExecutor(object):
         self._model['SystemData'] = self._session.system_attributes
         self._model['project_id'] = self._session.environment_owner_project_id
         self._model['user_id'] = self._session.environment_owner_user_id
-        result['model'] = self._model
+        if self._return_model_patch:
+            result['model_patch'] = process_pool.run(
+                utils.make_json_patch, self._source_model, self._model)
+            result['model_digest'] = self._source_digest
+        else:
+            result['model'] = self._model
 
         if (not self._model.get('Objects') and
                 not self._model.get('ObjectsCopy')):
@@ -220,13 +602,44 @@ class TaskExecutor(object):
 
         return result
 
+    def get_full_result(self, result):
+        """Replaces the object model patch in the result with the model"""
+
+        if 'model_patch' not in result:
+            return result
+        result = dict(result)
+        del result['model_patch']
+        result.pop('model_digest', None)
+        result['model'] = self._model
+        return result
+
     def _execute(self, pkg_loader):
 
         get_plugin_loader().register_in_loader(pkg_loader)
+        model = self.model
+        partial = None
+        if CONF.engine.enable_lazy_model_loading and self.action:
+            partial = partial_model.PartialModel(
+                model, [self.action['object_id']])
+            model = partial.model
+        mpl_profiler = None
+        if CONF.engine.profiler_dir:
+            mpl_profiler = profiler.Profiler()
+            mpl_profiler.start()
+        try:
+            return self._execute_model(pkg_loader, model, partial,
+                                       mpl_profiler)
+        finally:
+            if mpl_profiler is not None:
+                mpl_profiler.stop()
+                self._save_profile(mpl_profiler)
+
+    def _execute_model(self, pkg_loader, model, partial, mpl_profiler):
         with dsl_executor.MuranoDslExecutor(
-                pkg_loader, ContextManager(), self.session) as executor:
+                pkg_loader, ContextManager(), self.session,
+                mpl_profiler) as executor:
             try:
-                obj = executor.load(self.model)
+                obj = executor.load(model)
             except Exception as e:
                 return self.exception_result(e, None, '<load>')
 
@@ -238,17 +651,18 @@ class TaskExecutor(object):
             try:
                 LOG.debug('Invoking pre-cleanup hooks')
                 self.session.start()
-                executor.object_store.cleanup()
+                executor.object_store.cleanup([obj] if obj else [])
             except Exception as e:
                 return self.exception_result(e, obj, '<GC>')
             finally:
                 LOG.debug('Invoking post-cleanup hooks')
                 self.session.finish()
-            self._model['ObjectsCopy'] = \
-                copy.deepcopy(self._model.get('Objects'))
-
             action_result = None
-            if self.action:
+            if not self.action:
+                self._model['ObjectsCopy'] = \
+                    copy.deepcopy(self._model.get('Objects'))
+            else:
+                restore_result = None
                 try:
                     LOG.debug('Invoking pre-execution hooks')
                     self.session.start()
@@ -259,6 +673,17 @@ class TaskExecutor(object):
                     LOG.debug('Invoking post-execution hooks')
                     self.session.finish()
                     self._model = executor.finalize(obj)
+                    if partial is not None:
+                        try:
+                            self._model = partial.restore(self._model)
+                        except partial_model.RestoreError as e:
+                            # the objects that were not loaded must not be
+                            # lost, so the model is left as it was
+                            self._model = dict(self._source_model)
+                            restore_result = self.exception_result(
+                                e, obj, '<restore>')
+                if restore_result is not None:
+                    return restore_result
             try:
                 action_result = serializer.serialize(action_result, executor)
             except Exception as e:
@@ -294,6 +719,23 @@ class TaskExecutor(object):
             }
         }
 
+    def _save_profile(self, mpl_profiler):
+        name = '{0}-{1}'.format(
+            self._task_id,
+            timeutils.utcnow().strftime('%Y%m%d%H%M%S%f'))
+        path = os.path.join(CONF.engine.profiler_dir, name)
+        try:
+            with io.open(path + '.stacks', 'w', encoding='utf-8') as f:
+                mpl_profiler.write_collapsed_stacks(f)
+            with io.open(path + '.stats', 'w', encoding='utf-8') as f:
+                mpl_profiler.write_stats(f)
+        except Exception:
+            LOG.warning('Cannot save MuranoPL profile to {path}'.format(
+                path=path), exc_info=True)
+        else:
+            LOG.info('MuranoPL profile is saved to {path}.stacks'.format(
+                path=path))
+
     def _validate_model(self, obj, pkg_loader, executor):
         if CONF.engine.enable_model_policy_enforcer:
             if obj is not None:
@@ -327,6 +769,75 @@ class TaskExecutor(object):
             self._session.trust_id = None
 
 
+class StaticActionExecutorPool(object):
+    """Reusable MuranoPL executors for static actions
+
+    Static actions are independent calls, so an executor together with its
+    package loader can be reused by subsequent calls made for the same
+    project with the same token. Such calls do not load packages, parse
+    classes and build contexts again. The object store of the executor is
+    recycled after each call. Idle executors are dropped once their ttl
+    expires or the pool gets over its size, least recently used first.
+    Executors of failed calls are not reused.
+    """
+
+    def __init__(self, max_size=0, ttl=60):
+        self._max_size = max_size
+        self._ttl = ttl
+        # (key, expiration time, package loader, executor) ordered by
+        # the expiration time
+        self._idle = collections.deque()
+
+    def __len__(self):
+        return len(self._idle)
+
+    @contextlib.contextmanager
+    def executor(self, session):
+        key = (session.project_id, session.token)
+        entry = self._acquire(key)
+        if entry is None:
+            pkg_loader = package_loader.CombinedPackageLoader(session)
+            get_plugin_loader().register_in_loader(pkg_loader)
+            executor = dsl_executor.MuranoDslExecutor(
+                pkg_loader, ContextManager())
+        else:
+            pkg_loader, executor = entry
+        try:
+            yield executor
+        except BaseException:
+            pkg_loader.cleanup()
+            raise
+        self._release(key, pkg_loader, executor)
+
+    def _acquire(self, key):
+        self._purge()
+        for i in six.moves.range(len(self._idle) - 1, -1, -1):
+            if self._idle[i][0] == key:
+                entry = self._idle[i]
+                del self._idle[i]
+                return entry[2], entry[3]
+        return None
+
+    def _release(self, key, pkg_loader, executor):
+        if not self._max_size:
+            pkg_loader.cleanup()
+            return
+        executor.recycle()
+        self._idle.append(
+            (key, timeit.default_timer() + self._ttl, pkg_loader, executor))
+        self._purge()
+
+    def _purge(self):
+        now = timeit.default_timer()
+        while self._idle and (len(self._idle) > self._max_size or
+                              self._idle[0][1] <= now):
+            self._idle.popleft()[2].cleanup()
+
+    def clear(self):
+        while self._idle:
+            self._idle.popleft()[2].cleanup()
+
+
 class StaticActionExecutor(object):
     @property
     def action(self):
@@ -349,10 +860,7 @@ class StaticActionExecutor(object):
             self._session)
 
     def execute(self):
-        with package_loader.CombinedPackageLoader(self._session) as pkg_loader:
-            get_plugin_loader().register_in_loader(pkg_loader)
-            executor = dsl_executor.MuranoDslExecutor(pkg_loader,
-                                                      ContextManager())
+        with get_static_action_pool().executor(self._session) as executor:
             action_result = self._invoke(executor)
             action_result = serializer.serialize(action_result, executor)
             return action_result
@@ -71,3 +71,7 @@ class PolicyViolationException(Exception):
 
 class RouterInfoException(Exception):
     pass
+
+
+class ModelPatchError(Exception):
+    pass
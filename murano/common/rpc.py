@@ -22,7 +22,23 @@ CONF = cfg.CONF
 TRANSPORT = None
 
 
+def is_not_supported(error):
+    """Tells if the call failed as the server lacks the method or version"""
+
+    return (isinstance(error, messaging.RemoteError) and
+            error.exc_type in ('NoSuchMethod', 'UnsupportedVersion'))
+
+
 class ApiClient(object):
+    """Client of the API results endpoint
+
+    API version history:
+
+        1.0 - process_result
+        1.1 - process_serialized_result
+        1.2 - results with model_patch and model_digest instead of model
+    """
+
     def __init__(self, transport):
         client_target = target.Target('murano', 'results')
         self._client = rpc.RPCClient(transport, client_target, timeout=15)
@@ -31,6 +47,13 @@ class ApiClient(object):
         return self._client.call({}, 'process_result', result=result,
                                  environment_id=environment_id)
 
+    def process_serialized_result(self, result, environment_id,
+                                  model_patch=False):
+        version = '1.2' if model_patch else '1.1'
+        return self._client.prepare(version=version).call(
+            {}, 'process_serialized_result', result=result,
+            environment_id=environment_id)
+
 
 class EngineClient(object):
     def __init__(self, transport):
@@ -53,6 +76,15 @@ class EngineClient(object):
             package_name=package_name
         )
 
+    def cache_schemas(self, credentials, package_name, package_version):
+        return self._client.prepare(fanout=True).cast(
+            credentials, 'cache_schemas', package_name=package_name,
+            package_version=package_version)
+
+    def invalidate_schemas(self, package_name):
+        return self._client.prepare(fanout=True).cast(
+            {}, 'invalidate_schemas', package_name=package_name)
+
 
 def api():
     global TRANSPORT
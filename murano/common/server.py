@@ -14,21 +14,26 @@
 
 import uuid
 
+import jsonpatch
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging as messaging
 from oslo_messaging.rpc import dispatcher
 from oslo_messaging import target
+from oslo_serialization import jsonutils
 from oslo_service import service
 from oslo_utils import timeutils
 import pytz
 from sqlalchemy import desc
 
+from murano.common import exceptions
 from murano.common.helpers import token_sanitizer
+from murano.common import utils
 from murano.db import models
 from murano.db.services import environments
 from murano.db.services import instances
 from murano.db import session
+from murano.services import actions
 from murano.services import states
 
 CONF = cfg.CONF
@@ -37,13 +42,23 @@ LOG = logging.getLogger(__name__)
 
 
 class ResultEndpoint(object):
+    # see murano.common.rpc.ApiClient for the version history
+    target = target.Target(version='1.2')
+
+    @staticmethod
+    @messaging.expected_exceptions(exceptions.ModelPatchError)
+    def process_serialized_result(context, result, environment_id):
+        return ResultEndpoint.process_result(
+            context, jsonutils.loads(result), environment_id)
+
     @staticmethod
+    @messaging.expected_exceptions(exceptions.ModelPatchError)
     def process_result(context, result, environment_id):
         secure_result = token_sanitizer.TokenSanitizer().sanitize(result)
         LOG.debug('Got result from orchestration '
                   'engine:\n{result}'.format(result=secure_result))
 
-        model = result['model']
+        model = result.get('model')
         action_result = result.get('action', {})
 
         unit = session.get_session()
@@ -54,6 +69,11 @@ class ResultEndpoint(object):
                         'specified environment not found in database')
             return
 
+        if model is None and 'model_patch' in result:
+            model = apply_model_patch(
+                unit, environment.id, result['model_patch'],
+                result.get('model_digest'))
+
         if model['Objects'] is None and model.get('ObjectsCopy', {}) is None:
             environments.EnvironmentServices.remove(environment_id)
             return
@@ -191,6 +211,35 @@ def report_notification(report):
         unit.add(status)
 
 
+def apply_model_patch(unit, env_id, patch, digest):
+    """Applies the patch to the model of the deployed session
+
+    ModelPatchError is raised if the model is not the one the engine has
+    built the patch against, so that the engine sends the whole model.
+    """
+    conf_session = unit.query(models.Session).filter(
+        models.Session.environment_id == env_id,
+        models.Session.state.in_([states.SessionState.DEPLOYING,
+                                  states.SessionState.DELETING])).first()
+    if conf_session is None:
+        raise ValueError('Cannot apply the object model patch: no '
+                         'session is deployed in environment {0}'.format(
+                             env_id))
+    model = actions.ActionServices.get_task_model(
+        conf_session.description, env_id)
+    if digest is None or utils.get_model_digest(model) != digest:
+        LOG.warning('Object model of environment {0} has changed since the '
+                    'task was sent'.format(env_id))
+        raise exceptions.ModelPatchError(
+            'Cannot apply the object model patch: the model has changed')
+    try:
+        return jsonpatch.apply_patch(model, patch)
+    except (jsonpatch.JsonPatchException,
+            jsonpatch.JsonPointerException) as e:
+        raise exceptions.ModelPatchError(
+            'Cannot apply the object model patch: {0}'.format(e))
+
+
 def get_last_deployment(unit, env_id):
     query = unit.query(models.Task) \
         .filter_by(environment_id=env_id) \
@@ -14,10 +14,12 @@
 
 import collections
 import functools as func
+import hashlib
 import re
 
 import jsonschema
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import six
 
 from murano.common.i18n import _
@@ -207,6 +209,92 @@ def is_different(obj1, obj2):
         return False
 
 
+def _escape_json_pointer(key):
+    return six.text_type(key).replace('~', '~0').replace('/', '~1')
+
+
+def _is_equal(obj1, obj2):
+    if obj1 is obj2:
+        return True
+    elif isinstance(obj1, dict):
+        return (isinstance(obj2, dict) and len(obj1) == len(obj2) and
+                all(key in obj2 and _is_equal(value, obj2[key])
+                    for key, value in six.iteritems(obj1)))
+    elif isinstance(obj1, (list, tuple)):
+        return (isinstance(obj2, (list, tuple)) and
+                len(obj1) == len(obj2) and
+                all(_is_equal(t1, t2) for t1, t2 in zip(obj1, obj2)))
+    elif isinstance(obj1, six.string_types):
+        return isinstance(obj2, six.string_types) and obj1 == obj2
+    return type(obj1) is type(obj2) and obj1 == obj2
+
+
+def get_model_digest(model):
+    """Returns SHA-256 digest of the JSON document
+
+    The digest does not depend on the order of keys in dicts.
+    """
+    return hashlib.sha256(
+        jsonutils.dump_as_bytes(model, sort_keys=True)).hexdigest()
+
+
+def make_json_patch(src, dst):
+    """Builds JSON patch (RFC 6902) that turns src document into dst
+
+    Unlike jsonpatch.make_patch doesn't look for the longest common
+    subsequence of lists: lists are compared element by element after their
+    common head and tail are skipped. This keeps the comparison linear on
+    large object models at the cost of less compact patches for lists which
+    items were reordered.
+    """
+    patch = []
+
+    def rec(obj1, obj2, path):
+        if isinstance(obj1, dict) and isinstance(obj2, dict):
+            for key in obj1:
+                if key not in obj2:
+                    patch.append({
+                        'op': 'remove',
+                        'path': path + '/' + _escape_json_pointer(key)
+                    })
+            for key, value in six.iteritems(obj2):
+                key_path = path + '/' + _escape_json_pointer(key)
+                if key in obj1:
+                    rec(obj1[key], value, key_path)
+                else:
+                    patch.append({
+                        'op': 'add', 'path': key_path, 'value': value
+                    })
+        elif (isinstance(obj1, (list, tuple)) and
+                isinstance(obj2, (list, tuple))):
+            length = min(len(obj1), len(obj2))
+            head = 0
+            while head < length and _is_equal(obj1[head], obj2[head]):
+                head += 1
+            tail = 0
+            while tail < length - head and _is_equal(
+                    obj1[-1 - tail], obj2[-1 - tail]):
+                tail += 1
+            common = length - head - tail
+            for index in range(head, head + common):
+                rec(obj1[index], obj2[index], '{0}/{1}'.format(path, index))
+            index = head + common
+            patch.extend(
+                {'op': 'remove', 'path': '{0}/{1}'.format(path, index)}
+                for __ in range(len(obj1) - length))
+            for item in obj2[index:len(obj2) - tail]:
+                patch.append({
+                    'op': 'add', 'path': '{0}/{1}'.format(path, index),
+                    'value': item
+                })
+                index += 1
+        elif not _is_equal(obj1, obj2):
+            patch.append({'op': 'replace', 'path': path, 'value': obj2})
+
+    rec(src, dst, '')
+    return patch
+
+
 def build_entity_map(value):
     def build_entity_map_recursive(value, id_map):
         if isinstance(value, dict):
@@ -392,6 +392,53 @@ def package_search(filters, context, manage_public=False,
     return query.all()
 
 
+def package_resolve(fqns, class_names, context):
+    """Finds packages for many names with a single query
+
+    Only enabled packages the tenant can deploy (own and public) are
+    considered. When several packages match the same name the one that
+    belongs to the tenant takes precedence over public ones.
+
+    :param fqns: fully qualified names of the packages to find
+    :param class_names: names of the classes to find packages for
+    :param context: request context
+    :returns: tuple of two dicts mapping fully qualified names and class
+              names to the matching packages
+    """
+    fqns = set(fqns)
+    class_names = set(class_names)
+    conditions = []
+    pkg = models.Package
+    if fqns:
+        conditions.append(pkg.fully_qualified_name.in_(fqns))
+    if class_names:
+        conditions.append(pkg.class_definitions.any(
+            models.Class.name.in_(class_names)))
+    if not conditions:
+        return {}, {}
+
+    session = db_session.get_session()
+    query = session.query(pkg).filter(
+        or_(pkg.owner_id == context.tenant, pkg.is_public),
+        pkg.enabled, or_(*conditions)).order_by(pkg.id)
+
+    def put(result, key, package):
+        current = result.get(key)
+        if current is None or (current.owner_id != context.tenant and
+                               package.owner_id == context.tenant):
+            result[key] = package
+
+    packages_by_fqn = {}
+    packages_by_class = {}
+    for package in query:
+        if package.fully_qualified_name in fqns:
+            put(packages_by_fqn, package.fully_qualified_name, package)
+        for class_definition in package.class_definitions:
+            if class_definition.name in class_names:
+                put(packages_by_class, class_definition.name, package)
+    return packages_by_fqn, packages_by_class
+
+
 @oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
 def package_upload(values, tenant_id):
     """Upload a package with new application
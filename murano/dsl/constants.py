@@ -17,11 +17,13 @@ import semantic_version
 
 EXPRESSION_MEMORY_QUOTA = 512 * 1024
 ITERATORS_LIMIT = 2000
+PARSED_EXPRESSIONS_CACHE_SIZE = 20000
 
 CTX_ACTIONS_ONLY = '?actionsOnly'
 CTX_ALLOW_PROPERTY_WRITES = '$?allowPropertyWrites'
 CTX_ARGUMENT_OWNER = '$?argumentOwner'
 CTX_CALLER_CONTEXT = '$?callerContext'
+CTX_CONTRACT_ACTION = '$?contractAction'
 CTX_CURRENT_INSTRUCTION = '$?currentInstruction'
 CTX_CURRENT_EXCEPTION = '$?currentException'
 CTX_CURRENT_METHOD = '$?currentMethod'
@@ -60,3 +62,7 @@ RUNTIME_VERSION_1_2 = semantic_version.Version('1.2.0')
 RUNTIME_VERSION_1_3 = semantic_version.Version('1.3.0')
 RUNTIME_VERSION_1_4 = semantic_version.Version('1.4.0')
 RUNTIME_VERSION_1_5 = semantic_version.Version('1.5.0')
+RUNTIME_VERSIONS = (
+    RUNTIME_VERSION_1_0, RUNTIME_VERSION_1_1, RUNTIME_VERSION_1_2,
+    RUNTIME_VERSION_1_3, RUNTIME_VERSION_1_4, RUNTIME_VERSION_1_5
+)
@@ -22,6 +22,9 @@ class ContextManager(object):
     DSL hosting project should subclass this and override methods in order
     to insert yaql function at various scopes. For example it may override
     create_root_context to register its own global yaql functions.
+
+    The executor creates package contexts once and reuses type contexts
+    for as long as create_type_context returns the same context object.
     """
 
     def create_root_context(self, runtime_version):
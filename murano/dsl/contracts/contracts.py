@@ -14,6 +14,10 @@
 
 import copy
 
+import six
+
+from yaql.language import exceptions as yaql_exceptions
+from yaql.language import expressions
 from yaql.language import specs
 from yaql.language import utils
 from yaql.language import yaqltypes
@@ -46,19 +50,26 @@ class Contract(object):
     def __init__(self, spec, declaring_type):
         self._spec = spec
         self._runtime_version = declaring_type.package.runtime_version
+        self._compiled = {}
 
     @property
     def spec(self):
         return self._spec
 
+    @staticmethod
+    def _invoke_contract_method(cls, action_func, context, value,
+                                *args, **kwargs):
+        instance = object.__new__(cls)
+        instance.value = value
+        instance.context = context
+        instance.__init__(*args, **kwargs)
+        return action_func(instance)
+
     @staticmethod
     def _get_contract_factory(cls, action_func):
         def payload(context, value, *args, **kwargs):
-            instance = object.__new__(cls)
-            instance.value = value
-            instance.context = context
-            instance.__init__(*args, **kwargs)
-            return action_func(instance)
+            return Contract._invoke_contract_method(
+                cls, action_func, context, value, *args, **kwargs)
 
         name = yaql_integration.CONVENTION.convert_function_name(cls.name)
         try:
@@ -84,8 +95,130 @@ class Contract(object):
         for cls in CONTRACT_METHODS:
             context.register_function(Contract._get_contract_factory(
                 cls, action))
+        context[constants.CTX_CONTRACT_ACTION] = action
         return context
 
+    @staticmethod
+    @helpers.memoize
+    def _get_contract_definitions():
+        return dict(
+            (definition.name, (cls, definition))
+            for cls, definition in (
+                (cls, Contract._get_contract_factory(cls, None))
+                for cls in CONTRACT_METHODS))
+
+    @staticmethod
+    def _compile_argument(definition, parameter, arg, engine):
+        value_type = parameter.value_type
+        if isinstance(value_type, yaqltypes.Context):
+            return lambda receiver, context: context
+        elif isinstance(value_type, yaqltypes.Engine):
+            return lambda receiver, context: engine
+        elif isinstance(value_type, yaqltypes.HiddenParameterType):
+            return None
+        elif isinstance(arg, expressions.MappingRuleExpression):
+            return None
+        elif (isinstance(arg, expressions.Expression) and
+                not isinstance(arg, expressions.Constant) and
+                not isinstance(value_type, yaqltypes.LazyParameterType)):
+            evaluate = arg
+        else:
+            evaluate = None
+
+        def convert(receiver, context):
+            if parameter.name == 'self':
+                value = receiver
+            elif evaluate is None:
+                value = arg
+            else:
+                value = evaluate(utils.NO_VALUE, context, engine)
+            if not value_type.check(value, context, engine):
+                raise yaql_exceptions.NoMatchingMethodException(
+                    definition.name, receiver)
+            try:
+                return value_type.convert(
+                    value, receiver, context, definition, engine)
+            except yaql_exceptions.ArgumentValueException:
+                raise yaql_exceptions.ArgumentException(parameter.name)
+        return convert
+
+    @staticmethod
+    def _compile_call(expr, engine):
+        definitions = Contract._get_contract_definitions()
+        if (type(expr) is not expressions.Function or
+                expr.name not in definitions):
+            return None
+        cls, definition = definitions[expr.name]
+        parameters = list(six.itervalues(definition.parameters))
+        if any(p.position is None for p in parameters):
+            return None
+        args = list(expr.args)
+        converters = []
+        for parameter in sorted(parameters, key=lambda p: p.position):
+            if (parameter.name == 'self' or isinstance(
+                    parameter.value_type, yaqltypes.HiddenParameterType)):
+                arg = None
+            elif args:
+                arg = args.pop(0)
+            elif parameter.default is not specs.NO_DEFAULT:
+                arg = parameter.default
+            else:
+                return None
+            converter = Contract._compile_argument(
+                definition, parameter, arg, engine)
+            if converter is None:
+                return None
+            converters.append(converter)
+        if args:
+            return None
+
+        def call(receiver, context, action):
+            values = [c(receiver, context) for c in converters]
+            return Contract._invoke_contract_method(cls, action, *values)
+        return call
+
+    @staticmethod
+    def _compile(spec):
+        """Compiles contract expression into a chain of Python calls
+
+        Expressions made of contract methods called one after another on $
+        (e.g. $.string().notNull()) are evaluated without yaql function
+        resolution. Arguments of contract methods (including check()
+        predicates) are still evaluated by yaql. Returns None for
+        expressions that can only be evaluated by yaql.
+        """
+        statement = spec.parsed_expression
+        engine = statement.engine
+        expr = statement.expression
+        calls = []
+        while (isinstance(expr, expressions.BinaryOperator) and
+               expr.operator == '.'):
+            call = Contract._compile_call(expr.args[1], engine)
+            if call is None:
+                return None
+            calls.append(call)
+            expr = expr.args[0]
+        if not (isinstance(expr, expressions.GetContextValue) and
+                expr.path.value == '$'):
+            return None
+        calls.reverse()
+
+        def evaluate(data, context):
+            action = context[constants.CTX_CONTRACT_ACTION]
+            for call in calls:
+                data = call(data, context, action)
+            return helpers.evaluate(data, context)
+        return evaluate
+
+    def _get_compiled(self, spec):
+        key = id(spec)
+        try:
+            return self._compiled[key]
+        except KeyError:
+            compiled = self._compile(spec)
+            self._compiled[key] = compiled
+            return compiled
+
     @staticmethod
     @helpers.memoize
     def _prepare_transform_context(runtime_version, finalize):
@@ -132,6 +265,16 @@ class Contract(object):
         return Contract._prepare_context(
             runtime_version, lambda c: c.finalize())
 
+    @staticmethod
+    def prepare_contexts(runtime_version):
+        """Builds all contract contexts of the runtime version in advance"""
+        for finalize in (False, True):
+            Contract._prepare_transform_context(runtime_version, finalize)
+        Contract._prepare_validate_context(runtime_version)
+        Contract._prepare_check_type_context(runtime_version)
+        Contract._prepare_schema_generation_context(runtime_version)
+        Contract._prepare_finalize_context(runtime_version)
+
     def _map_dict(self, data, spec, context, path):
         if data is None or data is dsl.NO_VALUE:
             data = {}
@@ -224,9 +367,12 @@ class Contract(object):
         child_context = context.create_child_context()
         if isinstance(spec, dsl_types.YaqlExpression):
             child_context[''] = data
+            compiled = self._get_compiled(spec)
             try:
-                result = spec(context=child_context)
-                return result
+                if compiled is None:
+                    return spec(context=child_context)
+                child_context[constants.CTX_CURRENT_INSTRUCTION] = spec
+                return compiled(data, child_context)
             except exceptions.ContractViolationException as e:
                 e.path = path
                 raise
@@ -12,12 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import contextlib
 import itertools
 import traceback
 
-import eventlet
-import eventlet.event
 from oslo_log import log as logging
 import six
 from yaql.language import exceptions as yaql_exceptions
@@ -31,6 +30,7 @@ from murano.dsl import dsl_exception
 from murano.dsl import dsl_types
 from murano.dsl import exceptions as dsl_exceptions
 from murano.dsl import helpers
+from murano.dsl import lock_table
 from murano.dsl import object_store
 from murano.dsl.principal_objects import stack_trace
 from murano.dsl import serializer
@@ -38,22 +38,40 @@ from murano.dsl import yaql_integration
 
 LOG = logging.getLogger(__name__)
 
+SYNCHRONIZE_META = 'io.murano.metadata.engine.Synchronize'
+
+MethodDescriptor = collections.namedtuple(
+    'MethodDescriptor', ['name', 'lock_on_this', 'lock_args', 'trace'])
+
 
 class MuranoDslExecutor(object):
-    def __init__(self, package_loader, context_manager, session=None):
+    def __init__(self, package_loader, context_manager, session=None,
+                 profiler=None):
         self._package_loader = package_loader
         self._context_manager = context_manager
         self._session = session
         self._attribute_store = attribute_store.AttributeStore()
         self._object_store = object_store.ObjectStore(self)
-        self._locks = {}
+        self._locks = lock_table.LockTable()
         self._root_context_cache = {}
+        self._package_context_cache = {}
+        self._type_context_cache = {}
+        self._method_descriptors = {}
         self._static_properties = {}
+        self._profiler = profiler
 
     @property
     def object_store(self):
         return self._object_store
 
+    @property
+    def profiler(self):
+        return self._profiler
+
+    @property
+    def lock_stats(self):
+        return self._locks.stats
+
     @property
     def execution_session(self):
         return self._session
@@ -70,6 +88,10 @@ class MuranoDslExecutor(object):
     def context_manager(self):
         return self._context_manager
 
+    @property
+    def static_property_values(self):
+        return self._static_properties.values()
+
     def invoke_method(self, method, this, context, args, kwargs,
                       skip_stub=False, invoke_action=True):
         if isinstance(this, dsl.MuranoObjectInterface):
@@ -80,8 +102,7 @@ class MuranoDslExecutor(object):
         if context is None or not skip_stub:
             actions_only = (context is None and not method.name.startswith('.')
                             and invoke_action)
-            method_context = self.create_method_context(
-                self.create_object_context(this, context), method)
+            method_context = self._create_call_context(this, method, context)
             method_context[constants.CTX_SKIP_FRAME] = True
             method_context[constants.CTX_ACTIONS_ONLY] = actions_only
 
@@ -101,12 +122,9 @@ class MuranoDslExecutor(object):
             raise dsl_exceptions.MethodNotExposed(
                 '{0} is not an action'.format(method.name))
 
-        if method.is_static:
-            obj_context = self.create_object_context(
-                method.declaring_type, context)
-        else:
-            obj_context = self.create_object_context(this, context)
-        context = self.create_method_context(obj_context, method)
+        context = self._create_call_context(
+            method.declaring_type if method.is_static else this,
+            method, context)
 
         if isinstance(this, dsl_types.MuranoObject):
             if this.destroyed:
@@ -117,25 +135,18 @@ class MuranoDslExecutor(object):
             args, kwargs = self._canonize_parameters(
                 method.arguments_scheme, args, kwargs, method.name, this)
 
-        this_lock = this
+        descriptor = self._get_method_descriptor(method, context)
+        this_lock = this if descriptor.lock_on_this else None
         arg_values_for_lock = {}
-        method_meta = [m for m in method.get_meta(context)
-                       if m.type.name == ('io.murano.metadata.'
-                                          'engine.Synchronize')]
-        if method_meta:
-            method_meta = method_meta[0]
-
-        if method_meta:
-            if not method_meta.get_property('onThis', context):
-                this_lock = None
-            for arg_name in method_meta.get_property('onArgs', context):
-                arg_val = kwargs.get(arg_name)
-                if arg_val is not None:
-                    arg_values_for_lock[arg_name] = arg_val
+        for arg_name in descriptor.lock_args:
+            arg_val = kwargs.get(arg_name)
+            if arg_val is not None:
+                arg_values_for_lock[arg_name] = arg_val
 
         arg_values_for_lock = utils.filter_parameters_dict(arg_values_for_lock)
 
-        with self._acquire_method_lock(method, this_lock, arg_values_for_lock):
+        with self._acquire_method_lock(method, this_lock, arg_values_for_lock,
+                                       descriptor.name):
             for i, arg in enumerate(args, 2):
                 context[str(i)] = arg
             for key, value in kwargs.items():
@@ -156,91 +167,65 @@ class MuranoDslExecutor(object):
                     return (None if method.body is None
                             else method.body.execute(context))
 
-            if (not isinstance(method.body, specs.FunctionDefinition) or
-                    not method.body.meta.get(constants.META_NO_TRACE)):
-                with self._log_method(context, args, kwargs) as log:
+            if descriptor.trace:
+                with self._log_method(context, args, kwargs,
+                                      descriptor.name) as log:
                     result = call()
                     log(result)
                     return result
             else:
                 return call()
 
+    def _get_method_descriptor(self, method, context):
+        cached = self._method_descriptors.get(id(method))
+        if cached is not None and cached[0] is method:
+            return cached[1]
+        # method meta is static so Synchronize settings are evaluated
+        # once per method rather than on each call
+        lock_on_this, lock_args = True, ()
+        for m in method.get_meta(context):
+            if m.type.name == SYNCHRONIZE_META:
+                lock_on_this = bool(m.get_property('onThis', context))
+                lock_args = tuple(m.get_property('onArgs', context))
+                break
+        descriptor = MethodDescriptor(
+            name='::'.join((method.declaring_type.name, method.name)),
+            lock_on_this=lock_on_this,
+            lock_args=lock_args,
+            trace=(not isinstance(method.body, specs.FunctionDefinition) or
+                   not method.body.meta.get(constants.META_NO_TRACE)))
+        self._method_descriptors[id(method)] = (method, descriptor)
+        return descriptor
+
     @contextlib.contextmanager
-    def _acquire_method_lock(self, method, this, arg_val_dict):
+    def _acquire_method_lock(self, method, this, arg_val_dict, name):
         if this is None:
             if not arg_val_dict:
                 # if neither "this" nor argument values are set then no
                 # locking is needed
-                key = None
-            else:
-                # if only the argument values are passed then find the lock
-                # list only by the method
-                key = (None, id(method))
+                yield
+                return
+            # if only the argument values are passed then lock only by
+            # the method
+            scope = (None, id(method))
+        elif method.is_static:
+            # lock by the type and method
+            scope = (id(method.declaring_type), id(method))
         else:
-            if method.is_static:
-                # find the lock list by the type and method
-                key = (id(method.declaring_type), id(method))
-            else:
-                # find the lock list by the object and method
-                key = (this.object_id, id(method))
-        thread_id = helpers.get_current_thread_id()
-        while True:
-            event, event_owner = None, None
-            if key is None:  # no locking needed
-                break
-
-            lock_list = self._locks.setdefault(key, [])
-            # lock list contains a list of tuples:
-            # first item of each tuple is a dict with the values of locking
-            # arguments (it is used for argument values comparison),
-            # second item is an event to wait on,
-            # third one is the owner thread id
-
-            # If this lock list is empty it means no locks on this object and
-            # method at all.
-            for arg_vals, l_event, l_event_owner in lock_list:
-                if arg_vals == arg_val_dict:
-                    event = l_event
-                    event_owner = l_event_owner
-                    break
-
-            if event:
-                if event_owner == thread_id:
-                    # this means a re-entrant lock: the tuple with the same
-                    # value of the first element exists in the list, but it was
-                    # acquired by the same green thread. We may proceed with
-                    # the call in this case
-                    event = None
-                    break
-                else:
-                    event.wait()
-            else:
-                # this means either the lock list was empty or didn't contain a
-                # tuple with the first element equal to arg_val_dict.
-                # Then let's acquire a lock, i.e. create a new tuple and place
-                # it into the list
-                event = eventlet.event.Event()
-                event_owner = thread_id
-                lock_list.append((arg_val_dict, event, event_owner))
-                break
-        try:
+            # lock by the object and method
+            scope = (this.object_id, id(method))
+        # the lock is re-entrant for the green thread that holds it
+        with self._locks.acquire(
+                scope, arg_val_dict, helpers.get_current_thread_id(), name):
             yield
-        finally:
-            if event is not None:
-                lock_list.remove((arg_val_dict, event, event_owner))
-                if len(lock_list) == 0:
-                    del self._locks[key]
-                event.send()
 
     @contextlib.contextmanager
-    def _log_method(self, context, args, kwargs):
-        method = helpers.get_current_method(context)
+    def _log_method(self, context, args, kwargs, method_name):
         param_gen = itertools.chain(
             (six.text_type(arg) for arg in args),
             (u'{0} => {1}'.format(name, value)
              for name, value in kwargs.items()))
         params_str = u', '.join(param_gen)
-        method_name = '::'.join((method.declaring_type.name, method.name))
         thread_id = helpers.get_current_thread_id()
         caller_str = ''
         caller_ctx = helpers.get_caller_context(context)
@@ -252,6 +237,8 @@ class MuranoDslExecutor(object):
         LOG.trace(u'{thread}: Begin execution {method}({params}){caller}'
                   .format(thread=thread_id, method=method_name,
                           params=params_str, caller=caller_str))
+        if self._profiler is not None:
+            self._profiler.enter(method_name, caller_ctx)
         try:
             def log_result(result):
                 LOG.trace(
@@ -264,6 +251,9 @@ class MuranoDslExecutor(object):
                 u'{thread}: End execution {method} with exception '
                 u'{exc}'.format(thread=thread_id, method=method_name, exc=e))
             raise
+        finally:
+            if self._profiler is not None:
+                self._profiler.exit()
 
     @staticmethod
     def _canonize_parameters(arguments_scheme, args, kwargs,
@@ -383,21 +373,36 @@ class MuranoDslExecutor(object):
         return context
 
     def create_package_context(self, package):
+        cached = self._package_context_cache.get(id(package))
+        if cached is not None and cached[0] is package:
+            return cached[1]
         root_context = self.create_root_context(package.runtime_version)
         context = helpers.link_contexts(
             root_context,
             self.context_manager.create_package_context(package))
+        self._package_context_cache[id(package)] = (package, context)
         return context
 
     def create_type_context(self, murano_type, caller_context=None):
+        # type contexts are shared by all calls and thus must not be
+        # modified. They are rebuilt whenever the context manager
+        # returns a different context for the type (e.g. once the type
+        # got new methods)
         package_context = self.create_package_context(
             murano_type.package)
-        context = helpers.link_contexts(
-            package_context,
-            self.context_manager.create_type_context(
-                murano_type)).create_child_context()
-        context[constants.CTX_TYPE] = murano_type
+        type_context = self.context_manager.create_type_context(murano_type)
+        cached = self._type_context_cache.get(id(murano_type))
+        if (cached is not None and cached[0] is murano_type and
+                cached[1] is type_context):
+            context = cached[2]
+        else:
+            context = helpers.link_contexts(
+                package_context, type_context).create_child_context()
+            context[constants.CTX_TYPE] = murano_type
+            self._type_context_cache[id(murano_type)] = (
+                murano_type, type_context, context)
         if caller_context:
+            context = context.create_child_context()
             context[constants.CTX_NAMES_SCOPE] = caller_context[
                 constants.CTX_NAMES_SCOPE]
         return context
@@ -442,6 +447,13 @@ class MuranoDslExecutor(object):
         context[constants.CTX_CURRENT_METHOD] = method
         return context
 
+    def _create_call_context(self, this, method, caller_context):
+        # object context is created for each call so there is no need
+        # for a separate method context on top of it
+        context = self.create_object_context(this, caller_context)
+        context[constants.CTX_CURRENT_METHOD] = method
+        return context
+
     def run(self, cls, method_name, this, args, kwargs):
         with helpers.with_object_store(self.object_store):
             return cls.invoke(method_name, this, args, kwargs)
@@ -474,6 +486,10 @@ class MuranoDslExecutor(object):
                 self.object_store.prepare_finalize(None)
                 self.object_store.finalize()
             self._static_properties.clear()
+            for name, stats in six.iteritems(self._locks.stats):
+                if stats.contentions:
+                    LOG.debug('Contended lock of {0}: {1}'.format(
+                        name, stats))
             return model
         except Exception as e:
             LOG.exception(
@@ -481,6 +497,16 @@ class MuranoDslExecutor(object):
                 " during MuranoDslExecutor finalization", e)
             return None
 
+    def recycle(self):
+        """Prepares the executor to run another independent call
+
+        Objects left in the object store are dropped without destruction
+        and values of static properties are reset. Loaded types and
+        cached contexts are kept.
+        """
+        self.object_store.finalize()
+        self._static_properties.clear()
+
     def __enter__(self):
         return self
 
@@ -384,6 +384,53 @@ def get_memoize_func(func, cache):
     return wrap
 
 
+class LruCache(object):
+    """Bounded dictionary that evicts least recently used entries
+
+    :param max_size: maximum number of entries to keep. Zero or negative
+                     value disables the cache (nothing is stored)
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._data = collections.OrderedDict()
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def get(self, key, default=None):
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            return default
+        self._data[key] = value
+        return value
+
+    def put(self, key, value):
+        if self._max_size <= 0:
+            return
+        self._data.pop(key, None)
+        self._data[key] = value
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+    def keys(self):
+        return list(self._data.keys())
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
 def normalize_version_spec(version_spec):
     def coerce(v):
         return semantic_version.Version('{0}.{1}.{2}'.format(
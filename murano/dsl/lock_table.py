@@ -0,0 +1,168 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import timeit
+
+import eventlet.event
+import six
+from yaql.language import utils
+
+
+_timer = timeit.default_timer
+
+
+def canonize(value):
+    """Converts a value to a hashable one with the same equality
+
+    Values equal to each other are converted to equal hashable values and
+    different values (e.g. a list and a tuple with the same items) to
+    different ones. Raises TypeError for values that cannot be hashed.
+    """
+    if isinstance(value, utils.MappingType):
+        return dict, frozenset(
+            (canonize(k), canonize(v)) for k, v in six.iteritems(value))
+    elif isinstance(value, list):
+        return list, tuple(canonize(t) for t in value)
+    elif isinstance(value, tuple):
+        return tuple, tuple(canonize(t) for t in value)
+    elif isinstance(value, utils.SetType):
+        return frozenset, frozenset(canonize(t) for t in value)
+    hash(value)
+    return value
+
+
+class LockStats(object):
+    __slots__ = ('acquisitions', 'contentions', 'wait_time', 'max_wait_time')
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_time = 0
+        self.max_wait_time = 0
+
+    def __repr__(self):
+        return ('<LockStats acquisitions={0} contentions={1} '
+                'wait_time={2:.6f} max_wait_time={3:.6f}>'.format(
+                    self.acquisitions, self.contentions, self.wait_time,
+                    self.max_wait_time))
+
+
+class _Lock(object):
+    __slots__ = ('owner', 'waiters')
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.waiters = collections.deque()
+
+
+class LockTable(object):
+    """Re-entrant locks of green threads keyed by hashable values
+
+    Each lock has a FIFO queue of waiting threads. On release the lock is
+    handed over to the first waiting thread directly, so threads are not
+    woken up just to find the lock taken again. Values that cannot be
+    canonized to hashable ones are kept in a list per lock scope and
+    compared by equality.
+
+    Acquisition statistics are collected per lock name (e.g. method name):
+    number of acquisitions, number of them that had to wait, total and
+    maximal wait time.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._unhashable = collections.defaultdict(list)
+        self._stats = collections.defaultdict(LockStats)
+
+    @property
+    def stats(self):
+        return self._stats
+
+    def __len__(self):
+        return len(self._locks) + sum(
+            len(t) for t in six.itervalues(self._unhashable))
+
+    def _find(self, scope, value):
+        try:
+            key = scope, canonize(value)
+        except TypeError:
+            for item_value, lock in self._unhashable[scope]:
+                if item_value == value:
+                    return lock, None
+            return None, None
+        return self._locks.get(key), key
+
+    def _add(self, scope, value, key, lock):
+        if key is None:
+            self._unhashable[scope].append((value, lock))
+        else:
+            self._locks[key] = lock
+
+    def _remove(self, scope, value, key):
+        if key is not None:
+            del self._locks[key]
+            return
+        locks = self._unhashable[scope]
+        for i, (item_value, lock) in enumerate(locks):
+            if item_value == value:
+                del locks[i]
+                break
+        if not locks:
+            del self._unhashable[scope]
+
+    @contextlib.contextmanager
+    def acquire(self, scope, value, owner, name=None):
+        """Holds the lock for the value within the scope
+
+        The lock is re-entrant: if it is already held by the owner the
+        call proceeds without waiting and does not release the lock.
+        """
+        stats = self._stats[name]
+        stats.acquisitions += 1
+        lock, key = self._find(scope, value)
+        if lock is None:
+            lock = _Lock(owner)
+            self._add(scope, value, key, lock)
+        elif lock.owner == owner:
+            yield
+            return
+        else:
+            event = eventlet.event.Event()
+            lock.waiters.append((owner, event))
+            stats.contentions += 1
+            start = _timer()
+            try:
+                event.wait()
+            except BaseException:
+                if event.ready():
+                    # the lock has already been handed over to this thread
+                    self._release(scope, value, key, lock)
+                else:
+                    lock.waiters.remove((owner, event))
+                raise
+            finally:
+                wait_time = _timer() - start
+                stats.wait_time += wait_time
+                stats.max_wait_time = max(stats.max_wait_time, wait_time)
+        try:
+            yield
+        finally:
+            self._release(scope, value, key, lock)
+
+    def _release(self, scope, value, key, lock):
+        if lock.waiters:
+            lock.owner, event = lock.waiters.popleft()
+            event.send()
+        else:
+            self._remove(scope, value, key)
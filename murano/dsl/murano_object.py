@@ -211,15 +211,29 @@ class MuranoObject(dsl_types.MuranoObject):
             garbage_collector.GarbageCollector.subscribe_destruction(
                 self, subscriber, record.get('handler'))
 
+    def iterate_references(self):
+        """Values the object holds strong references to
+
+        These are the owner of the object, values of properties of all
+        its parent class parts and its extensions. Destruction dependencies
+        are not included as they hold weak references to the subscribers.
+        """
+        real_this = self.real_this
+        yield real_this.owner
+        for part in helpers.traverse(
+                real_this, lambda t: t._parents.values()):
+            if part._properties:
+                yield part._properties
+            if part._extension is not None:
+                yield part._extension
+
     def get_property(self, name, context=None):
         start_type, derived = self.type, False
         caller_class = None if not context else helpers.get_type(context)
         if caller_class is not None and caller_class.is_compatible(self):
             start_type, derived = caller_class, True
 
-        declared_properties = start_type.find_properties(
-            lambda p: p.name == name)
-        if len(declared_properties) > 0:
+        if start_type.find_property(name):
             spec = self.real_this.type.find_single_property(name)
             if spec.usage == dsl_types.PropertyUsages.Static:
                 return self.executor.get_static_property(
@@ -245,11 +259,9 @@ class MuranoObject(dsl_types.MuranoObject):
             start_type, derived = caller_class, True
         if context is None:
             context = self.executor.create_object_context(self)
-        declared_properties = start_type.find_properties(
-            lambda p: p.name == name)
-        if len(declared_properties) > 0:
+        if start_type.find_property(name):
             ultimate_spec = self.real_this.type.find_single_property(name)
-            property_list = list(self._list_properties(name))
+            property_list = self._list_properties(name)
             for spec in property_list:
                 if (caller_class is not None and not
                         helpers.are_property_modifications_allowed(context) and
@@ -291,10 +303,16 @@ class MuranoObject(dsl_types.MuranoObject):
         raise TypeError('Cannot cast {0} to {1}'.format(self.type, cls))
 
     def _list_properties(self, name):
-        for p in helpers.traverse(
-                self.real_this, lambda t: t._parents.values()):
-            if name in p.type.properties:
-                yield p.type.properties[name]
+        # object hierarchy is built from the class hierarchy, thus the
+        # result is the same for all objects of the class
+        def producer():
+            return tuple(
+                p.type.properties[name] for p in helpers.traverse(
+                    self.real_this, lambda t: t._parents.values())
+                if name in p.type.properties)
+
+        return self.real_this.type.cached_lookup(
+            ('object_properties', name), producer)
 
     def __repr__(self):
         return '<{0}/{1} {2} ({3})>'.format(
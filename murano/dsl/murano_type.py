@@ -91,6 +91,13 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         self._meta = dslmeta.MetaData(meta, dsl_types.MetaTargets.Type, self)
         self._meta_values = None
         self._imports = list(self._resolve_imports(imports))
+        # incremented each time a method or property is added to the class.
+        # Kept in a list to be shared with the altered clones of the class
+        # along with its methods and properties
+        self._revision = [0]
+        self._hierarchy_revisions = None
+        self._symbols = {}
+        self._symbols_revision = None
 
     def _adjusted_parents(self, remappings):
         seen = {}
@@ -113,6 +120,8 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
             res._meta_values = None
             res._context = None
             res._exported_context = None
+            res._hierarchy_revisions = None
+            res._symbols = {}
             seen[class_] = res
             return res
         return [altered_clone(p) for p in self._parents]
@@ -142,10 +151,12 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
 
     @property
     def all_method_names(self):
-        names = set(self.methods.keys())
-        for c in self.ancestors():
-            names.update(c.methods.keys())
-        return tuple(names)
+        def producer():
+            names = set(self.methods.keys())
+            for c in self.ancestors():
+                names.update(c.methods.keys())
+            return tuple(names)
+        return self.cached_lookup('all_method_names', producer)
 
     @property
     def extension_class(self):
@@ -162,6 +173,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         self._methods[name] = method
         self._context = None
         self._exported_context = None
+        self._revision[0] += 1
         return method
 
     @property
@@ -170,15 +182,40 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
 
     @property
     def all_property_names(self):
-        names = set(self.properties.keys())
-        for c in self.ancestors():
-            names.update(c.properties.keys())
-        return tuple(names)
+        def producer():
+            names = set(self.properties.keys())
+            for c in self.ancestors():
+                names.update(c.properties.keys())
+            return tuple(names)
+        return self.cached_lookup('all_property_names', producer)
 
     def add_property(self, property_typespec):
         if not isinstance(property_typespec, murano_property.MuranoProperty):
             raise TypeError('property_typespec')
         self._properties[property_typespec.name] = property_typespec
+        self._revision[0] += 1
+
+    def cached_lookup(self, key, producer):
+        """Returns result of the class hierarchy lookup identified by key
+
+        The producer is called only once for each key and the result is
+        reused until a method or property is added to the class or any of
+        its ancestors.
+        """
+        revisions = self._hierarchy_revisions
+        if revisions is None:
+            revisions = self._hierarchy_revisions = [self._revision] + [
+                c._revision for c in self.ancestors()]
+        # revisions only grow, so their sum changes with any of them
+        revision = sum(t[0] for t in revisions)
+        if self._symbols_revision != revision:
+            self._symbols = {}
+            self._symbols_revision = revision
+        try:
+            return self._symbols[key]
+        except KeyError:
+            result = self._symbols[key] = producer()
+            return result
 
     def _find_symbol_chains(self, func):
         queue = collections.deque([(self, ())])
@@ -232,12 +269,19 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                 result.append(chains[i][0])
         return result
 
+    def _find_methods(self, name):
+        return self.cached_lookup(('method', name), lambda: tuple(
+            self._choose_symbol(lambda cls: cls.methods.get(name))))
+
+    def _find_properties(self, name):
+        return self.cached_lookup(('property', name), lambda: tuple(
+            self._choose_symbol(lambda cls: cls.properties.get(name))))
+
     def find_method(self, name):
-        return self._choose_symbol(lambda cls: cls.methods.get(name))
+        return list(self._find_methods(name))
 
     def find_property(self, name):
-        return self._choose_symbol(
-            lambda cls: cls.properties.get(name))
+        return list(self._find_properties(name))
 
     def find_static_property(self, name):
         def prop_func(cls):
@@ -245,7 +289,8 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
             if prop is not None and prop.usage == 'Static':
                 return prop
 
-        result = self._choose_symbol(prop_func)
+        result = self.cached_lookup(('static_property', name), lambda: tuple(
+            self._choose_symbol(prop_func)))
         if len(result) < 1:
             raise exceptions.NoPropertyFound(name)
         elif len(result) > 1:
@@ -253,7 +298,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
         return result[0]
 
     def find_single_method(self, name):
-        result = self.find_method(name)
+        result = self._find_methods(name)
         if len(result) < 1:
             raise exceptions.NoMethodFound(name)
         elif len(result) > 1:
@@ -287,7 +332,7 @@ class MuranoClass(dsl_types.MuranoClass, MuranoType, dslmeta.MetaProvider):
                     self, name, func, ephemeral=True)
 
     def find_single_property(self, name):
-        result = self.find_property(name)
+        result = self._find_properties(name)
         if len(result) < 1:
             raise exceptions.NoPropertyFound(name)
         elif len(result) > 1:
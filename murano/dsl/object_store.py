@@ -14,9 +14,11 @@
 
 import collections
 import gc
+import types
 import weakref
 
 from oslo_log import log as logging
+from yaql.language import utils
 
 from murano.dsl import dsl_types
 from murano.dsl import helpers
@@ -25,6 +27,12 @@ from murano.dsl import murano_object
 
 LOG = logging.getLogger(__name__)
 
+# objects which references are not followed when the state of extensions
+# is traversed, as they lead to the whole interpreter state rather than to
+# objects of the model
+_OPAQUE_TYPES = (type, types.ModuleType, types.CodeType, types.FrameType,
+                 dsl_types.MuranoType, dsl_types.MuranoPackage)
+
 
 class ObjectStore(object):
     def __init__(self, executor, parent_store=None, weak_store=True):
@@ -98,10 +106,24 @@ class ObjectStore(object):
     def parent_store(self):
         return self._parent_store
 
-    def cleanup(self):
+    def cleanup(self, roots=None):
+        """Destroys objects that are no longer referenced
+
+        If roots are given, objects are considered to be alive only if
+        they can be reached from the roots (or static properties) through
+        owner links, property values and the state of extensions. This is
+        cheap but requires the roots to be the only entry points of the
+        object graph, which holds when no MuranoPL code is running, e.g.
+        right after the model load. Otherwise (GC.collect() called from
+        MuranoPL code, where method frames may hold objects) orphans are
+        detected by a full Python garbage collection.
+        """
         LOG.debug('Cleaning up orphan objects')
         with helpers.with_object_store(self):
-            n = self._collect_garbage()
+            if roots is None:
+                n = self._collect_garbage()
+            else:
+                n = self._collect_unreachable(roots)
             LOG.debug('{} orphan objects were destroyed'.format(n))
             return n
 
@@ -140,13 +162,76 @@ class ObjectStore(object):
                         obj.mark_destroyed(True)
             obj = None
             del gc.garbage[:]
-            if self._pending_destruction:
-                for obj in self._destroy_garbage(self._pending_destruction):
-                    if obj in self._pending_destruction:
-                        repeat = True
-                        obj.mark_destroyed()
-                        self._pending_destruction.remove(obj)
-                        count += 1
+            n = self._destroy_pending()
+            repeat = repeat or n > 0
+            count += n
+        return count
+
+    def _collect_unreachable(self, roots):
+        count = 0
+        while True:
+            reachable = self._find_reachable(roots)
+            for obj in list(self._store.values()):
+                if (obj in reachable or obj.destroyed or
+                        obj in self._pending_destruction or
+                        not isinstance(
+                            obj, murano_object.RecyclableMuranoObject)):
+                    continue
+                if obj.initialized:
+                    self._pending_destruction.add(obj)
+                else:
+                    obj.mark_destroyed(True)
+            n = self._destroy_pending()
+            if not n:
+                return count
+            count += n
+
+    def _find_reachable(self, roots):
+        executor = self.executor
+        reachable = set()
+        visited = set()
+        queue = collections.deque(roots)
+        queue.extend(executor.static_property_values)
+        while queue:
+            value = queue.popleft()
+            if isinstance(value, dsl_types.MuranoObjectInterface):
+                value = value.object
+            if isinstance(value, dsl_types.MuranoObject):
+                value = value.real_this
+                if value not in reachable:
+                    reachable.add(value)
+                    queue.extend(value.iterate_references())
+            elif isinstance(value, utils.MappingType):
+                if id(value) not in visited:
+                    visited.add(id(value))
+                    queue.extend(value.keys())
+                    queue.extend(value.values())
+            elif utils.is_sequence(value) or isinstance(value, utils.SetType):
+                if id(value) not in visited:
+                    visited.add(id(value))
+                    queue.extend(value)
+            elif (gc.is_tracked(value) and id(value) not in visited and
+                    not isinstance(value, (ObjectStore,) + _OPAQUE_TYPES) and
+                    value is not executor):
+                # extensions and objects they hold (e.g. helpers of plugins,
+                # objects with __slots__) are followed through the references
+                # the Python collector sees
+                visited.add(id(value))
+                referents = gc.get_referents(value)
+                if isinstance(value, types.FunctionType):
+                    referents = [t for t in referents
+                                 if t is not value.__globals__]
+                queue.extend(referents)
+        return reachable
+
+    def _destroy_pending(self):
+        count = 0
+        if self._pending_destruction:
+            for obj in self._destroy_garbage(self._pending_destruction):
+                if obj in self._pending_destruction:
+                    obj.mark_destroyed()
+                    self._pending_destruction.remove(obj)
+                    count += 1
         return count
 
     def is_doomed(self, obj):
@@ -0,0 +1,229 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import os
+import timeit
+import weakref
+
+import eventlet.greenthread
+import greenlet
+import six
+
+from murano.dsl import helpers
+
+
+WAIT_FRAME = '[wait]'
+
+_timer = timeit.default_timer
+# greenlet -> [time it was switched out at, total time it was switched out]
+_switches = weakref.WeakKeyDictionary()
+_active_profilers = 0
+_previous_tracer = None
+
+
+def _trace_switch(event, args):
+    if event in ('switch', 'throw'):
+        origin, target = args
+        now = _timer()
+        record = _switches.get(origin)
+        if record is None:
+            try:
+                _switches[origin] = [now, 0]
+            except TypeError:
+                pass
+        else:
+            record[0] = now
+        record = _switches.get(target)
+        if record is not None and record[0] is not None:
+            record[1] += now - record[0]
+            record[0] = None
+    if _previous_tracer is not None:
+        _previous_tracer(event, args)
+
+
+def _get_wait_time(thread):
+    record = _switches.get(thread)
+    return 0 if record is None else record[1]
+
+
+def _install_tracer():
+    global _active_profilers, _previous_tracer
+    _active_profilers += 1
+    if _active_profilers == 1 and hasattr(greenlet, 'settrace'):
+        _previous_tracer = greenlet.settrace(_trace_switch)
+
+
+def _uninstall_tracer():
+    global _active_profilers, _previous_tracer
+    _active_profilers -= 1
+    if _active_profilers == 0 and hasattr(greenlet, 'settrace'):
+        greenlet.settrace(_previous_tracer)
+        _previous_tracer = None
+        _switches.clear()
+
+
+def get_profiler():
+    """Returns the profiler of the current executor if there is one"""
+
+    if not _active_profilers:
+        return None
+    executor = helpers.get_executor()
+    return None if executor is None else executor.profiler
+
+
+def _format_position(position):
+    return '{0}:{1}:{2}'.format(
+        os.path.basename(position.file_path),
+        position.start_line, position.start_column)
+
+
+class Frame(object):
+    __slots__ = ('name', 'path', 'start', 'wait',
+                 'children_time', 'children_wait')
+
+    def __init__(self, name, path, start, wait):
+        self.name = name
+        self.path = path
+        self.start = start
+        self.wait = wait
+        self.children_time = 0
+        self.children_wait = 0
+
+
+class MethodStats(object):
+    __slots__ = ('calls', 'inclusive', 'exclusive', 'wait')
+
+    def __init__(self):
+        self.calls = 0
+        self.inclusive = 0
+        self.exclusive = 0
+        self.wait = 0
+
+
+class Profiler(object):
+    """Collects execution times of MuranoPL methods and expressions
+
+    For each method (Type::method) and YAQL expression (file:line:column)
+    the profiler counts calls and sums inclusive and exclusive wall time
+    along with the time the green thread was switched out (waiting for
+    I/O, events or other green threads) during the call. Inclusive time
+    of recursive calls is counted for each active call.
+
+    Call stacks are tracked per green thread. The stack of a thread
+    spawned by MuranoPL code continues the MuranoPL call stack of the
+    spawning method. Exclusive times are also aggregated by stack, which
+    can be written in the collapsed stacks format used by flame graph
+    tools. The time a frame spent waiting is reported as a separate
+    [wait] child frame.
+    """
+
+    def __init__(self):
+        self._stacks = {}
+        self._stats = collections.defaultdict(MethodStats)
+        self._collapsed = collections.defaultdict(float)
+        self._started = False
+
+    def start(self):
+        if not self._started:
+            self._started = True
+            _install_tracer()
+
+    def stop(self):
+        if self._started:
+            self._started = False
+            _uninstall_tracer()
+
+    @property
+    def stats(self):
+        return self._stats
+
+    @staticmethod
+    def _get_base_path(context):
+        names = []
+        while context is not None:
+            method = helpers.get_current_method(context)
+            if method is not None:
+                names.append('::'.join((method.declaring_type.name,
+                                        method.name)))
+            context = helpers.get_caller_context(context)
+        return ';'.join(reversed(names))
+
+    def enter(self, name, context=None):
+        """Starts a frame on the stack of the current green thread
+
+        If the stack is empty, the path of the frame is prefixed with
+        the MuranoPL call stack of the context (the caller context for
+        methods) so that frames of spawned threads get full paths.
+        """
+        thread = eventlet.greenthread.getcurrent()
+        stack = self._stacks.get(thread)
+        if stack:
+            path = stack[-1].path + ';' + name
+        else:
+            if stack is None:
+                stack = self._stacks[thread] = []
+            base_path = self._get_base_path(context)
+            path = base_path + ';' + name if base_path else name
+        stack.append(Frame(name, path, _timer(), _get_wait_time(thread)))
+
+    def enter_expression(self, expression, context=None):
+        position = expression.source_file_position
+        if position is None:
+            name = u'yaql ' + u' '.join(expression.expression.split())
+        else:
+            name = u'yaql ' + _format_position(position)
+        self.enter(name.replace(';', ','), context)
+
+    def exit(self):
+        now = _timer()
+        thread = eventlet.greenthread.getcurrent()
+        stack = self._stacks[thread]
+        frame = stack.pop()
+        inclusive = now - frame.start
+        wait = _get_wait_time(thread) - frame.wait
+        if stack:
+            stack[-1].children_time += inclusive
+            stack[-1].children_wait += wait
+        else:
+            del self._stacks[thread]
+
+        exclusive = inclusive - frame.children_time
+        stats = self._stats[frame.name]
+        stats.calls += 1
+        stats.inclusive += inclusive
+        stats.exclusive += exclusive
+        stats.wait += wait
+        own_wait = wait - frame.children_wait
+        self._collapsed[frame.path] += exclusive - own_wait
+        if own_wait > 0:
+            self._collapsed[frame.path + ';' + WAIT_FRAME] += own_wait
+
+    def write_collapsed_stacks(self, stream):
+        """Writes stacks with their exclusive times in microseconds"""
+
+        for path in sorted(self._collapsed):
+            value = int(self._collapsed[path] * 1000000)
+            if value > 0:
+                stream.write(u'{0} {1}\n'.format(path, value))
+
+    def write_stats(self, stream):
+        """Writes a table of call statistics sorted by exclusive time"""
+
+        stream.write(u'{0:>10} {1:>12} {2:>12} {3:>12}  {4}\n'.format(
+            'calls', 'inclusive', 'exclusive', 'wait', 'name'))
+        for name, stats in sorted(six.iteritems(self._stats),
+                                  key=lambda t: -t[1].exclusive):
+            stream.write(
+                u'{0:>10} {1:>12.6f} {2:>12.6f} {3:>12.6f}  {4}\n'.format(
+                    stats.calls, stats.inclusive, stats.exclusive,
+                    stats.wait, name))
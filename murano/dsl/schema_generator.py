@@ -36,11 +36,8 @@ def generate_schema(pkg_loader, context_manager,
 
     if method_names and not isinstance(method_names, (list, tuple)):
         method_names = (method_names,)
-    version = helpers.parse_version_spec(class_version)
-    if package_name:
-        package = pkg_loader.load_package(package_name, version)
-    else:
-        package = pkg_loader.load_class_package(class_name, version)
+    package = find_class_package(
+        pkg_loader, class_name, class_version, package_name)
 
     cls = package.find_class(class_name, search_requirements=False)
     exc = executor.MuranoDslExecutor(pkg_loader, context_manager)
@@ -59,6 +56,16 @@ def generate_schema(pkg_loader, context_manager,
         return result
 
 
+def find_class_package(pkg_loader, class_name, class_version=None,
+                       package_name=None):
+    """Find the package of the class to generate schema for"""
+
+    version = helpers.parse_version_spec(class_version)
+    if package_name:
+        return pkg_loader.load_package(package_name, version)
+    return pkg_loader.load_class_package(class_name, version)
+
+
 def list_model_builders(cls, context):
     """List model builder names of the class
 
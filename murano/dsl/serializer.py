@@ -49,13 +49,25 @@ def _serialize_object(root_object, designer_attributes, allow_refs,
     if isinstance(obj, dsl.MuranoObjectInterface):
         obj = obj.object
     parent = obj.owner if isinstance(obj,  dsl_types.MuranoObject) else None
-    while True:
+    # places of all references made by the first pass
+    refs = []
+    obj, need_another_pass = _pass12_serialize(
+        obj, parent, serialized_objects, designer_attributes, executor,
+        serialize_actions, serialization_type, allow_refs,
+        with_destruction_dependencies, refs)
+    if all(ref.ref_obj.object_id in serialized_objects
+           for _, _, ref in refs):
+        # the usual case: all referenced objects were serialized by their
+        # owners, so references are replaced in place without another walk
+        # through the tree
+        for container, key, ref in refs:
+            container[key] = ref.ref_obj.object_id
+        return obj, serialized_objects
+    while need_another_pass:
         obj, need_another_pass = _pass12_serialize(
             obj, parent, serialized_objects, designer_attributes, executor,
             serialize_actions, serialization_type, allow_refs,
             with_destruction_dependencies)
-        if not need_another_pass:
-            break
     tree = [obj]
     _pass3_serialize(tree, serialized_objects, allow_refs)
     return tree[0], serialized_objects
@@ -81,10 +93,16 @@ def serialize_model(root_object, executor,
                 serialize_actions, serialization_type,
                 with_destruction_dependencies)
 
-            tree_copy = _serialize_object(
-                root_object, None, allow_refs, executor, serialize_actions,
-                serialization_type,
-                with_destruction_dependencies)[0] if make_copy else None
+            if not make_copy:
+                tree_copy = None
+            elif serialization_type == dsl_types.DumpTypes.Serializable:
+                tree_copy = _copy_without_designer_attributes(
+                    tree, serialized_objects)
+            else:
+                tree_copy = _serialize_object(
+                    root_object, None, allow_refs, executor,
+                    serialize_actions, serialization_type,
+                    with_destruction_dependencies)[0]
 
             attributes = executor.attribute_store.serialize(
                 serialized_objects) if serialize_attributes else None
@@ -96,6 +114,27 @@ def serialize_model(root_object, executor,
     }
 
 
+def _copy_without_designer_attributes(value, serialized_objects):
+    # designer attributes and actions are the only keys starting with
+    # underscore in headers of serialized objects
+    if isinstance(value, dict):
+        result = dict(
+            (key, _copy_without_designer_attributes(
+                item, serialized_objects))
+            for key, item in six.iteritems(value))
+        header = result.get('?')
+        if (isinstance(header, dict) and
+                header.get('id') in serialized_objects):
+            result['?'] = dict(
+                (key, item) for key, item in six.iteritems(header)
+                if not str(key).startswith('_'))
+        return result
+    elif isinstance(value, list):
+        return [_copy_without_designer_attributes(t, serialized_objects)
+                for t in value]
+    return value
+
+
 def _serialize_available_action(obj, current_actions, executor):
     result = {}
     actions = obj.type.find_methods(lambda m: m.is_action)
@@ -124,7 +163,7 @@ def _serialize_available_action(obj, current_actions, executor):
 def _pass12_serialize(value, parent, serialized_objects,
                       designer_attributes_getter, executor,
                       serialize_actions, serialization_type, allow_refs,
-                      with_destruction_dependencies):
+                      with_destruction_dependencies, refs=None):
     if isinstance(value, dsl.MuranoObjectInterface):
         value = value.object
     if isinstance(value, (six.string_types,
@@ -165,7 +204,7 @@ def _pass12_serialize(value, parent, serialized_objects,
         return _pass12_serialize(
             result, value, serialized_objects, designer_attributes_getter,
             executor, serialize_actions, serialization_type, allow_refs,
-            with_destruction_dependencies)
+            with_destruction_dependencies, refs)
     elif isinstance(value, utils.MappingType):
         result = {}
         need_another_pass = False
@@ -185,8 +224,10 @@ def _pass12_serialize(value, parent, serialized_objects,
                     d_value, parent, serialized_objects,
                     designer_attributes_getter, executor, serialize_actions,
                     serialization_type, allow_refs,
-                    with_destruction_dependencies)
+                    with_destruction_dependencies, refs)
             result[result_key] = result_value[0]
+            if refs is not None and isinstance(result_value[0], ObjRef):
+                refs.append((result, result_key, result_value[0]))
             if result_value[1]:
                 need_another_pass = True
         return result, need_another_pass
@@ -197,9 +238,11 @@ def _pass12_serialize(value, parent, serialized_objects,
             v, nmp = _pass12_serialize(
                 t, parent, serialized_objects, designer_attributes_getter,
                 executor, serialize_actions, serialization_type, allow_refs,
-                with_destruction_dependencies)
+                with_destruction_dependencies, refs)
             if nmp:
                 need_another_pass = True
+            if refs is not None and isinstance(v, ObjRef):
+                refs.append((result, len(result), v))
             result.append(v)
         return result, need_another_pass
     else:
@@ -20,6 +20,7 @@ from yaql.language import expressions
 
 from murano.dsl import constants
 from murano.dsl import dsl_types
+from murano.dsl import profiler
 from murano.dsl import yaql_integration
 
 
@@ -53,6 +54,10 @@ class YaqlExpression(dsl_types.YaqlExpression):
     def version(self):
         return self._version
 
+    @property
+    def parsed_expression(self):
+        return self._parsed_expression
+
     @property
     def source_file_position(self):
         return self._file_position
@@ -82,4 +87,11 @@ class YaqlExpression(dsl_types.YaqlExpression):
     def __call__(self, context):
         if context:
             context[constants.CTX_CURRENT_INSTRUCTION] = self
-        return self._parsed_expression.evaluate(context=context)
+        expression_profiler = profiler.get_profiler()
+        if expression_profiler is None:
+            return self._parsed_expression.evaluate(context=context)
+        expression_profiler.enter_expression(self, context)
+        try:
+            return self._parsed_expression.evaluate(context=context)
+        finally:
+            expression_profiler.exit()
@@ -122,8 +122,18 @@ def choose_yaql_engine(runtime_version):
             else ENGINE_12)
 
 
+PARSED_EXPRESSIONS = helpers.LruCache(constants.PARSED_EXPRESSIONS_CACHE_SIZE)
+
+
 def parse(expression, runtime_version):
-    return choose_yaql_engine(runtime_version)(expression)
+    # parsed statements are immutable and not bound to any context so the
+    # same statement can be shared by all expressions with identical text
+    key = (expression, runtime_version)
+    result = PARSED_EXPRESSIONS.get(key)
+    if result is None:
+        result = choose_yaql_engine(runtime_version)(expression)
+        PARSED_EXPRESSIONS.put(key, result)
+    return result
 
 
 def call_func(__context, __name, *args, **kwargs):
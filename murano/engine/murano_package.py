@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import json
 import os
 
@@ -23,10 +24,22 @@ from murano.dsl import murano_package
 
 CONF = cfg.CONF
 
+# (class_configs, class name, version) -> (directory mtime, config path,
+#                                          config file mtime, config)
+CLASS_CONFIGS_CACHE = {}
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
 
 class MuranoPackage(murano_package.MuranoPackage):
-    def __init__(self, package_loader, application_package):
+    def __init__(self, package_loader, application_package, package_id=None):
         self.application_package = application_package
+        self._package_id = package_id
         super(MuranoPackage, self).__init__(
             package_loader,
             application_package.full_name,
@@ -36,7 +49,39 @@ class MuranoPackage(murano_package.MuranoPackage):
             application_package.meta
         )
 
+    @property
+    def package_id(self):
+        """Unique id of the package contents or None if it is unknown"""
+        return self._package_id
+
     def get_class_config(self, name):
+        # Config files are looked up once per class and version. Adding,
+        # removing or renaming a file in the class configs directory
+        # changes its mtime while edits change the mtime of the file itself
+        configs_dir = CONF.engine.class_configs
+        key = (configs_dir, name, str(self.version))
+        dir_mtime = _get_mtime(configs_dir)
+        cached = CLASS_CONFIGS_CACHE.get(key)
+        if cached is not None and cached[0] == dir_mtime and (
+                cached[1] is None or _get_mtime(cached[1]) == cached[2]):
+            return copy.deepcopy(cached[3])
+
+        path = None
+        if dir_mtime is not None:
+            path = self._find_class_config(configs_dir, name)
+        if path is None:
+            config, file_mtime = {}, None
+        else:
+            file_mtime = _get_mtime(path)
+            with open(path) as f:
+                if path.endswith('.json'):
+                    config = json.load(f)
+                else:
+                    config = yaml.safe_load(f)
+        CLASS_CONFIGS_CACHE[key] = (dir_mtime, path, file_mtime, config)
+        return copy.deepcopy(config)
+
+    def _find_class_config(self, configs_dir, name):
         version_parts = (
             str(self.version.major),
             str(self.version.minor),
@@ -56,15 +101,10 @@ class MuranoPackage(murano_package.MuranoPackage):
                         version_parts[:num_parts - i])
                 file_name = '{name}{version}.{extension}'.format(
                     name=name, version=version_suffix, extension=ext)
-                path = os.path.join(CONF.engine.class_configs, file_name)
+                path = os.path.join(configs_dir, file_name)
                 if os.path.exists(path):
-                    if ext == 'json':
-                        with open(path) as f:
-                            return json.load(f)
-                    else:
-                        with open(path) as f:
-                            return yaml.safe_load(f)
-        return {}
+                    return path
+        return None
 
     def get_resource(self, name):
         return self.application_package.get_resource(name)
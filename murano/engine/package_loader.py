@@ -14,7 +14,10 @@
 # limitations under the License.
 
 import collections
+import glob
+import hashlib
 import itertools
+import json
 import os
 import os.path
 import shutil
@@ -23,14 +26,20 @@ import tempfile
 import uuid
 
 import eventlet
+from eventlet import semaphore
 from muranoclient.common import exceptions as muranoclient_exc
 from muranoclient.glance import client as glare_client
+from muranoclient.v1 import artifact_packages
 import muranoclient.v1.client as muranoclient
+from muranoclient.v1 import packages as muranoclient_packages
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_log import versionutils
 from oslo_utils import fileutils
+from oslo_utils import units
+import requests
 import six
+from six.moves import http_cookiejar
 
 from murano.common import auth_utils
 from murano.dsl import constants
@@ -47,6 +56,20 @@ from murano import utils as m_utils
 CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+CLASS_DEFINITIONS_CACHE = None
+# pre-parsed class definitions are stored in this subdirectory of
+# the cached package. Increment the format number whenever the
+# representation produced by yaql_yaml_loader.dump changes
+PARSED_CLASSES_DIRECTORY = '.parsed-classes'
+PARSED_CLASSES_FORMAT = 1
+# maps local package folder to a tuple of its signature and loaded package
+LOCAL_PACKAGES_INDEX = {}
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_SEMAPHORE = None
+HTTP_SESSION = None
+# maps packages cache directory to its PackagesCacheManager
+PACKAGES_CACHE_MANAGERS = {}
+
 download_mem_locks = collections.defaultdict(m_utils.ReaderWriterLock)
 usage_mem_locks = collections.defaultdict(m_utils.ReaderWriterLock)
 
@@ -60,8 +83,17 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
         self._execution_session = execution_session
         self._last_glare_token = None
         self._glare_client = None
+        self._glare_session = None
         self._murano_client = None
         self._murano_client_session = None
+        self._batch_resolution = True
+        self._resolved_definitions = {}
+        self._prefetched_packages = {}
+        self._locked_ids = set()
+        if CONF.engine.enable_packages_cache:
+            self._cache_manager = get_cache_manager(self._cache_directory)
+        else:
+            self._cache_manager = PackagesCacheManager(self._cache_directory)
 
         self._mem_locks = []
         self._ipc_locks = []
@@ -71,11 +103,17 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
 
     def _get_glare_client(self):
         glare_settings = CONF.glare
-        session = auth_utils.get_client_session(self._execution_session)
+        if self._glare_session is None:
+            self._glare_session = auth_utils.get_client_session(
+                self._execution_session)
+        session = self._glare_session
         token = session.auth.get_token(session)
         if self._last_glare_token != token:
             self._last_glare_token = token
-            self._glare_client = None
+            if self._glare_client is not None:
+                # keep the client (and murano client that wraps it) with
+                # its connections and just replace the expired token
+                self._glare_client.http_client.auth_token = token
 
         if self._glare_client is None:
             url = glare_settings.url
@@ -110,10 +148,15 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
         if artifacts_client != last_glare_client:
             self._murano_client = None
         if not self._murano_client:
+            session = auth_utils.get_client_session(
+                execution_session=self._execution_session,
+                conf=murano_settings)
+            session.session = get_http_session()
             parameters = auth_utils.get_session_client_parameters(
                 service_type='application-catalog',
                 execution_session=self._execution_session,
-                conf=murano_settings
+                conf=murano_settings,
+                session=session
             )
             self._murano_client = muranoclient.Client(
                 artifacts_client=artifacts_client, **parameters)
@@ -138,7 +181,8 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
                         exceptions.NoPackageForClassFound(class_name),
                         exc_info[2])
         return self._to_dsl_package(
-            self._get_package_by_definition(package_definition))
+            self._get_package_by_definition(package_definition),
+            package_definition.id)
 
     def load_package(self, package_name, version_spec):
         fixed_versions = self._fixations[package_name]
@@ -167,7 +211,7 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             package = self._get_package_by_definition(package_definition)
             self._fixations[package_name].add(package.version)
             self._new_fixations[package_name].add(package.version)
-            return self._to_dsl_package(package)
+            return self._to_dsl_package(package, package_definition.id)
 
     def register_package(self, package):
         for name in package.classes:
@@ -175,6 +219,12 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
         self._package_cache.setdefault(package.name, {})[
             package.version] = package
 
+    @property
+    def packages(self):
+        for package_versions in self._package_cache.values():
+            for package in package_versions.values():
+                yield package
+
     @staticmethod
     def _get_cache_directory():
         base_directory = (
@@ -196,6 +246,18 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
         return directory
 
     def _get_definition(self, filter_opts):
+        for key in ('fqn', 'class_name'):
+            if key not in filter_opts:
+                continue
+            reference = (key, filter_opts[key])
+            if reference in self._resolved_definitions:
+                package_definition = self._resolved_definitions[reference]
+                if package_definition is None:
+                    LOG.debug('There are no packages matching filter '
+                              '{opts}'.format(opts=filter_opts))
+                    raise LookupError()
+                return package_definition
+
         filter_opts['catalog'] = True
         try:
             packages = list(self.client.packages.filter(
@@ -215,20 +277,110 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             LOG.debug('Failed to get package definition from repository')
             raise LookupError()
 
-    def _to_dsl_package(self, app_package):
+    def _to_dsl_package(self, app_package, package_id=None):
         dsl_package = murano_package.MuranoPackage(
-            self._root_loader, app_package)
+            self._root_loader, app_package, package_id)
+        persist = CONF.engine.enable_packages_cache
         for name in app_package.classes:
             dsl_package.register_class(
-                (lambda cls: lambda: get_class(app_package, cls))(name),
+                (lambda cls: lambda: get_class(
+                    app_package, cls, package_id, persist))(name),
                 name)
         if app_package.full_name == constants.CORE_LIBRARY:
             system_objects.register(dsl_package)
         self.register_package(dsl_package)
+        self._prefetch_requirements(app_package)
         return dsl_package
 
+    def _resolve_definitions(self, references):
+        """Resolves package references with batch catalog requests
+
+        References are sent in chunks of at most api_limit_max, the number
+        of references the catalog resolves in a single request.
+
+        :param references: list of ('fqn' | 'class_name', name) tuples
+        :return: True if the references were resolved, False if the
+                 catalog does not support batch resolution or the request
+                 failed
+        """
+        packages = self.client.packages
+        # Glare and other package managers have no batch resolution API
+        batch_supported = isinstance(
+            packages, muranoclient_packages.PackageManager)
+        if not (self._batch_resolution and batch_supported):
+            return False
+        chunk_size = max(CONF.murano.api_limit_max, 1)
+        for i in six.moves.range(0, len(references), chunk_size):
+            chunk = references[i:i + chunk_size]
+            try:
+                resp, body = packages.api.json_request(
+                    '/v1/catalog/packages/resolve', 'POST',
+                    data={'packages': [{key: name} for key, name in chunk]})
+            except (muranoclient_exc.HTTPNotFound,
+                    muranoclient_exc.HTTPMethodNotAllowed) as e:
+                LOG.debug('Batch package resolution is not available, '
+                          'falling back to per-package queries: {}'.format(e))
+                self._batch_resolution = False
+                return False
+            except muranoclient_exc.HTTPException as e:
+                LOG.warning('Batch package resolution failed, falling back '
+                            'to per-package queries: {}'.format(e))
+                return False
+
+            for reference, info in zip(chunk, body['packages']):
+                self._resolved_definitions[reference] = (
+                    None if info is None else
+                    muranoclient_packages.Package(packages, info,
+                                                  loaded=True))
+        return True
+
+    def _prefetch_requirements(self, app_package):
+        """Resolves and downloads the Require closure of the package
+
+        Each level of the dependency tree is resolved with a single
+        catalog request and downloaded concurrently so that packages
+        are already in cache by the time the engine asks for them.
+        """
+        pool = eventlet.GreenPool(CONF.engine.packages_download_concurrency)
+        pending = [app_package]
+        while pending:
+            references = []
+            for package in pending:
+                for name in package.requirements:
+                    reference = ('fqn', name)
+                    if (name in self._package_cache or
+                            reference in self._resolved_definitions or
+                            reference in references):
+                        continue
+                    references.append(reference)
+            if not references or not self._resolve_definitions(references):
+                return
+
+            definitions = []
+            for reference in references:
+                package_definition = self._resolved_definitions[reference]
+                if package_definition is None:
+                    continue
+                self._lock_usage(package_definition)
+                definitions.append(package_definition)
+            pending = [package for package in pool.imap(
+                self._prefetch_package, definitions) if package is not None]
+
+    def _prefetch_package(self, package_definition):
+        try:
+            app_package = self._get_package_by_definition(package_definition)
+        except pkg_exc.PackageLoadError:
+            # the error is reported when the package is actually requested
+            LOG.debug('Unable to prefetch package {}'.format(
+                package_definition.fully_qualified_name))
+            return None
+        self._prefetched_packages[package_definition.id] = app_package
+        return app_package
+
     def _get_package_by_definition(self, package_def):
         package_id = package_def.id
+        if package_id in self._prefetched_packages:
+            return self._prefetched_packages.pop(package_id)
         package_directory = os.path.join(
             self._cache_directory,
             package_def.fully_qualified_name,
@@ -237,7 +389,9 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
 
         if os.path.isdir(package_directory):
             try:
-                return load_utils.load_from_dir(package_directory)
+                app_package = load_utils.load_from_dir(package_directory)
+                self._cache_manager.record_hit(package_directory)
+                return app_package
             except pkg_exc.PackageLoadError:
                 LOG.exception('Unable to load package from cache. Clean-up.')
                 shutil.rmtree(package_directory, ignore_errors=True)
@@ -255,28 +409,22 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             # already downloaded this package. Check before trying to download
             if os.path.isdir(package_directory):
                 try:
-                    return load_utils.load_from_dir(package_directory)
+                    app_package = load_utils.load_from_dir(package_directory)
+                    self._cache_manager.record_hit(package_directory)
+                    return app_package
                 except pkg_exc.PackageLoadError:
                     LOG.error('Unable to load package from cache. Clean-up.')
                     shutil.rmtree(package_directory, ignore_errors=True)
 
-            # attempt the download itself
-            try:
-                LOG.debug("Attempting to download package {} {}".format(
-                    package_def.fully_qualified_name, package_id))
-                package_data = self.client.packages.download(package_id)
-            except muranoclient_exc.HTTPException as e:
-                msg = 'Error loading package id {0}: {1}'.format(
-                    package_id, str(e)
-                )
-                exc_info = sys.exc_info()
-                six.reraise(pkg_exc.PackageLoadError,
-                            pkg_exc.PackageLoadError(msg),
-                            exc_info[2])
+            self._cache_manager.record_miss()
             package_file = None
             try:
-                with tempfile.NamedTemporaryFile(delete=False) as package_file:
-                    package_file.write(package_data)
+                with tempfile.NamedTemporaryFile(
+                        dir=self._cache_directory, delete=False) as \
+                        package_file:
+                    LOG.debug("Attempting to download package {} {}".format(
+                        package_def.fully_qualified_name, package_id))
+                    self._download_package(package_id, package_file)
 
                 with load_utils.load_from_file(
                         package_file.name,
@@ -291,8 +439,18 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
                     self.try_cleanup_cache(
                         os.path.split(package_directory)[0],
                         current_id=package_id)
+                    if CONF.engine.enable_packages_cache:
+                        self._cache_manager.enforce_quota(keep=package_id)
                     return app_package
-            except IOError:
+            except muranoclient_exc.HTTPException as e:
+                msg = 'Error loading package id {0}: {1}'.format(
+                    package_id, str(e)
+                )
+                exc_info = sys.exc_info()
+                six.reraise(pkg_exc.PackageLoadError,
+                            pkg_exc.PackageLoadError(msg),
+                            exc_info[2])
+            except (IOError, requests.RequestException):
                 msg = 'Unable to extract package data for %s' % package_id
                 exc_info = sys.exc_info()
                 six.reraise(pkg_exc.PackageLoadError,
@@ -305,6 +463,46 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
                 except OSError:
                     pass
 
+    def _download_package(self, package_id, package_file):
+        """Streams package archive to the file
+
+        Downloads are limited to `packages_download_concurrency` at a time
+        per worker. The archive is written by chunks as it arrives instead
+        of being kept in memory as a whole.
+        """
+        packages = self.client.packages
+        with get_download_semaphore():
+            expected_size = None
+            if isinstance(packages, muranoclient_packages.PackageManager):
+                response = packages.api.request(
+                    '/v1/catalog/packages/{0}/download'.format(package_id),
+                    'GET', log=False, stream=True)
+                if response.status_code != 200:
+                    raise muranoclient_exc.from_response(response)
+                length = response.headers.get('content-length')
+                encoding = response.headers.get('content-encoding')
+                # the length of an encoded body differs from the number of
+                # decoded bytes written to the file
+                if (length and length.isdigit() and
+                        encoding in (None, '', 'identity')):
+                    expected_size = int(length)
+                chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+            elif isinstance(packages,
+                            artifact_packages.PackageManagerAdapter):
+                chunks = artifact_packages.rewrap_http_exceptions(
+                    packages.glare.download)(package_id)
+            else:
+                chunks = [packages.download(package_id)]
+
+            size = 0
+            for chunk in chunks:
+                package_file.write(chunk)
+                size += len(chunk)
+            if expected_size is not None and size != expected_size:
+                raise IOError('Package {0} download is incomplete: got {1} '
+                              'of {2} bytes'.format(
+                                  package_id, size, expected_size))
+
     def try_cleanup_cache(self, package_directory=None, current_id=None):
         """Attempts to cleanup cache in a given directory.
 
@@ -333,40 +531,8 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             if not os.path.isdir(package_directory):
                 continue
 
-            usage_lock_path = os.path.join(
-                self._cache_directory,
-                '{}_usage.lock'.format(pkg_id))
-            ipc_lock = m_utils.ExclusiveInterProcessLock(
-                path=usage_lock_path, sleep_func=eventlet.sleep)
-
-            try:
-                with usage_mem_locks[pkg_id].write_lock(False) as acquired:
-                    if not acquired:
-                        # the package is in use by other deployment in this
-                        # process will do nothing, someone else would delete it
-                        continue
-                    acquired_ipc_lock = ipc_lock.acquire(blocking=False)
-                    if not acquired_ipc_lock:
-                        # the package is in use by other deployment in another
-                        # process, will do nothing, someone else would delete
-                        continue
-
-                    shutil.rmtree(stale_directory,
-                                  ignore_errors=True)
-                    ipc_lock.release()
-
-                    for lock_type in ('usage', 'download'):
-                        lock_path = os.path.join(
-                            self._cache_directory,
-                            '{}_{}.lock'.format(pkg_id, lock_type))
-                        try:
-                            os.remove(lock_path)
-                        except OSError:
-                            LOG.warning("Couldn't delete lock file: "
-                                        "{}".format(lock_path))
-            except RuntimeError:
-                # couldn't upgrade read lock to write-lock. go on.
-                continue
+            remove_cached_package(
+                self._cache_directory, stale_directory, pkg_id)
 
     def _get_best_package_match(self, packages):
         public = None
@@ -391,6 +557,9 @@ class ApiPackageLoader(package_loader.MuranoPackageLoader):
             return
 
         package_id = package_definition.id
+        if package_id in self._locked_ids:
+            return
+        self._locked_ids.add(package_id)
 
         # A work around the fact that read_lock only supports `with` syntax.
         mem_lock = _with_to_generator(
@@ -451,15 +620,20 @@ class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
         self._build_index()
 
     def _build_index(self):
+        folders = set()
         for folder in self.search_package_folders(self._base_path):
+            folders.add(folder)
             try:
-                package = load_utils.load_from_dir(folder)
+                package, signature = load_local_package(folder)
+                package_id = None if signature is None else (
+                    folder, signature)
                 dsl_package = murano_package.MuranoPackage(
-                    self._root_loader, package)
+                    self._root_loader, package, package_id)
                 for class_name in package.classes:
                     dsl_package.register_class(
-                        (lambda pkg, cls:
-                            lambda: get_class(pkg, cls))(package, class_name),
+                        (lambda pkg, cls, pkg_id:
+                            lambda: get_class(pkg, cls, pkg_id))(
+                                package, class_name, package_id),
                         class_name
                     )
                 if dsl_package.name == constants.CORE_LIBRARY:
@@ -470,6 +644,13 @@ class DirectoryPackageLoader(package_loader.MuranoPackageLoader):
                     folder))
                 continue
             LOG.info('Loaded package from path {0}'.format(folder))
+        self._prune_index(folders)
+
+    def _prune_index(self, folders):
+        prefix = os.path.join(self._base_path, '')
+        for folder in list(LOCAL_PACKAGES_INDEX.keys()):
+            if folder.startswith(prefix) and folder not in folders:
+                del LOCAL_PACKAGES_INDEX[folder]
 
     def import_fixation_table(self, fixations):
         self._fixations = deserialize_package_fixations(fixations)
@@ -610,11 +791,361 @@ class CombinedPackageLoader(package_loader.MuranoPackageLoader):
             d_loader.cleanup()
 
 
-def get_class(package, name):
-    version = package.runtime_version
-    loader = yaql_yaml_loader.get_loader(version)
+def _get_local_package_signature(folder):
+    """Returns a value that changes whenever the package in folder changes
+
+    The signature is built from modification times of the package manifest
+    and of everything under its Classes directory, so that both edits of
+    existing class files and additions or removals of files are detected
+    without reading and parsing any of them.
+    """
+    try:
+        signature = [os.path.getmtime(os.path.join(folder, 'manifest.yaml'))]
+        for root, _, files in os.walk(os.path.join(folder, 'Classes')):
+            signature.append((root, os.path.getmtime(root)))
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                signature.append((path, os.path.getmtime(path)))
+    except OSError:
+        return None
+    return tuple(signature)
+
+
+def load_local_package(folder):
+    """Loads package from local folder using the process-wide index
+
+    Packages that did not change since they were loaded last time are taken
+    from the index instead of loading and parsing their manifests again.
+
+    :param folder: package directory
+    :return: tuple of application package and its signature
+    """
+    signature = _get_local_package_signature(folder)
+    cached = LOCAL_PACKAGES_INDEX.get(folder)
+    if (signature is not None and cached is not None and
+            cached[0] == signature):
+        return cached[1], signature
+    try:
+        package = load_utils.load_from_dir(folder)
+    except pkg_exc.PackageLoadError:
+        LOCAL_PACKAGES_INDEX.pop(folder, None)
+        raise
+    if signature is not None:
+        LOCAL_PACKAGES_INDEX[folder] = signature, package
+    return package, signature
+
+
+def get_class_definitions_cache():
+    global CLASS_DEFINITIONS_CACHE
+
+    if CLASS_DEFINITIONS_CACHE is None:
+        CLASS_DEFINITIONS_CACHE = helpers.LruCache(
+            CONF.engine.class_definitions_cache_size)
+    return CLASS_DEFINITIONS_CACHE
+
+
+def invalidate_class_definitions(package_name, version=None):
+    """Drops cached class definitions of the package
+
+    :param package_name: FQN of the package
+    :param version: optional package version. If omitted all versions
+                    of the package are dropped
+    """
+    cache = get_class_definitions_cache()
+    for key in cache.keys():
+        if key[0] == package_name and (
+                version is None or key[1] == str(version)):
+            cache.pop(key)
+
+
+def _get_parsed_class_path(package, name):
+    file_name = hashlib.sha256(name.encode('utf-8')).hexdigest() + '.json'
+    return os.path.join(
+        package.source_directory, PARSED_CLASSES_DIRECTORY, file_name)
+
+
+def _hash_class_contents(contents):
+    if isinstance(contents, six.text_type):
+        contents = contents.encode('utf-8')
+    return hashlib.sha256(contents).hexdigest()
+
+
+def _load_parsed_class(package, name, package_id, contents_hash, file_id):
+    path = _get_parsed_class_path(package, name)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if (data['format'] != PARSED_CLASSES_FORMAT or
+                data['package_id'] != package_id or
+                data['hash'] != contents_hash):
+            return None
+        return yaql_yaml_loader.restore(
+            data['documents'], file_id, package.runtime_version)
+    except Exception:
+        LOG.debug('Unable to load pre-parsed class {0} from {1}'.format(
+            name, path), exc_info=True)
+        return None
+
+
+def _save_parsed_class(package, name, package_id, contents_hash, documents):
+    dumped = yaql_yaml_loader.dump(documents)
+    if dumped is None:
+        return
+    path = _get_parsed_class_path(package, name)
+    tmp_path = '{0}.{1}.tmp'.format(path, uuid.uuid4().hex)
+    try:
+        fileutils.ensure_tree(os.path.dirname(path))
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'format': PARSED_CLASSES_FORMAT,
+                'package_id': package_id,
+                'hash': contents_hash,
+                'documents': dumped
+            }, f)
+        os.rename(tmp_path, path)
+    except (IOError, OSError):
+        LOG.debug('Unable to save pre-parsed class {0} to {1}'.format(
+            name, path), exc_info=True)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def get_class(package, name, package_id=None, persist=False):
+    """Returns parsed class definition from the package
+
+    Parsed definitions are shared between all tasks handled by the engine
+    worker. The cache is keyed by package FQN, version and class name and
+    each entry remembers the id of the package it was parsed from so that
+    a package re-uploaded under the same version invalidates it.
+
+    :param package: application package that contains the class
+    :param name: class name
+    :param package_id: unique id of the package contents. Definitions of
+                       packages without an id are never cached
+    :param persist: if True, parsed definition is also stored in the
+                    package directory and reused by other engine workers
+                    and after engine restart. The stored definition is
+                    validated by the package id and hash of the class file
+    """
+    cache = get_class_definitions_cache()
+    key = (package.full_name, str(package.version), name)
+    if package_id is not None:
+        cached = cache.get(key)
+        if cached is not None and cached[0] == package_id:
+            return cached[1]
+
     contents, file_id = package.get_class(name)
-    return loader(contents, file_id)
+    persist = persist and package_id is not None
+    result = None
+    if persist:
+        contents_hash = _hash_class_contents(contents)
+        result = _load_parsed_class(
+            package, name, package_id, contents_hash, file_id)
+    if result is None:
+        loader = yaql_yaml_loader.get_loader(package.runtime_version)
+        result = loader(contents, file_id)
+        if persist:
+            _save_parsed_class(
+                package, name, package_id, contents_hash, result)
+    if package_id is not None:
+        cache.put(key, (package_id, result))
+    return result
+
+
+def get_download_semaphore():
+    global DOWNLOAD_SEMAPHORE
+    if DOWNLOAD_SEMAPHORE is None:
+        DOWNLOAD_SEMAPHORE = semaphore.Semaphore(
+            CONF.engine.packages_download_concurrency)
+    return DOWNLOAD_SEMAPHORE
+
+
+def get_http_session():
+    """Returns HTTP session shared by package loaders of the worker
+
+    The session keeps a pool of connections to the packages service so that
+    they are reused across tasks instead of being established for every
+    deployment. The session serves requests of all tenants, so it never
+    stores cookies.
+    """
+    global HTTP_SESSION
+    if HTTP_SESSION is None:
+        pool_size = CONF.engine.packages_download_concurrency
+        session = requests.Session()
+        session.cookies.set_policy(
+            http_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, requests.adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size))
+        HTTP_SESSION = session
+    return HTTP_SESSION
+
+
+def remove_cached_package(cache_directory, package_directory, package_id):
+    """Removes package from cache unless it is used by any deployment
+
+    :return: True if the package was removed
+    """
+    usage_lock_path = os.path.join(
+        cache_directory, '{}_usage.lock'.format(package_id))
+    ipc_lock = m_utils.ExclusiveInterProcessLock(
+        path=usage_lock_path, sleep_func=eventlet.sleep)
+
+    try:
+        with usage_mem_locks[package_id].write_lock(False) as acquired:
+            if not acquired:
+                # the package is in use by other deployment in this
+                # process will do nothing, someone else would delete it
+                return False
+            acquired_ipc_lock = ipc_lock.acquire(blocking=False)
+            if not acquired_ipc_lock:
+                # the package is in use by other deployment in another
+                # process, will do nothing, someone else would delete
+                return False
+
+            shutil.rmtree(package_directory, ignore_errors=True)
+            ipc_lock.release()
+
+            for lock_type in ('usage', 'download'):
+                lock_path = os.path.join(
+                    cache_directory,
+                    '{}_{}.lock'.format(package_id, lock_type))
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    LOG.warning("Couldn't delete lock file: "
+                                "{}".format(lock_path))
+            return True
+    except RuntimeError:
+        # couldn't upgrade read lock to write-lock. go on.
+        return False
+
+
+class PackagesCacheManager(object):
+    """Keeps the packages cache within the configured budget
+
+    Cached packages are stored as <fqn>/<version>/<id> directories. The
+    modification time of the directory is updated each time the package is
+    taken from cache so that all engine processes sharing the cache agree on
+    the least recently used packages, which are evicted first once either
+    packages_cache_max_size or packages_cache_max_entries is exceeded.
+    Packages that are in use by any deployment are never evicted.
+    """
+
+    def __init__(self, cache_directory):
+        self._cache_directory = cache_directory
+        # package directories are not changed once unpacked (apart from
+        # the parsed classes added to them) so sizes are computed once
+        self._sizes = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def statistics(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def record_hit(self, package_directory):
+        self.hits += 1
+        try:
+            os.utime(package_directory, None)
+        except OSError:
+            LOG.debug('Unable to update access time of cached package '
+                      '{}'.format(package_directory))
+
+    def record_miss(self):
+        self.misses += 1
+
+    def _get_size(self, package_directory):
+        size = self._sizes.get(package_directory)
+        if size is None:
+            size = 0
+            for root, dirs, files in os.walk(package_directory):
+                for name in files:
+                    try:
+                        size += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        continue
+            self._sizes[package_directory] = size
+        return size
+
+    def _list_entries(self):
+        entries = []
+        for path in glob.glob(os.path.join(self._cache_directory, '*/*/*')):
+            if not os.path.isdir(path):
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            entries.append((mtime, path, os.path.basename(path)))
+        entries.sort()
+        return entries
+
+    def enforce_quota(self, keep=None):
+        """Evicts least recently used packages exceeding the budget
+
+        :param keep: optional id of the package that must not be evicted
+        :return: number of evicted packages
+        """
+        max_size = CONF.engine.packages_cache_max_size * units.Mi
+        max_entries = CONF.engine.packages_cache_max_entries
+        if not max_size and not max_entries:
+            return 0
+
+        entries = self._list_entries()
+        listed = set(path for _, path, _ in entries)
+        for path in list(self._sizes):
+            if path not in listed:
+                # the package was removed by another process
+                del self._sizes[path]
+        total_size = sum(self._get_size(path) for _, path, _ in entries)
+        total_entries = len(entries)
+        evicted = 0
+        for _, path, package_id in entries:
+            if not ((max_size and total_size > max_size) or
+                    (max_entries and total_entries > max_entries)):
+                break
+            if package_id == keep:
+                continue
+            if not remove_cached_package(
+                    self._cache_directory, path, package_id):
+                continue
+            LOG.debug('Evicted package {} from cache'.format(path))
+            total_size -= self._sizes.pop(path, 0)
+            total_entries -= 1
+            evicted += 1
+            # remove <fqn>/<version> directories left empty
+            for parent in (os.path.dirname(path),
+                           os.path.dirname(os.path.dirname(path))):
+                try:
+                    os.rmdir(parent)
+                except OSError:
+                    break
+
+        self.evictions += evicted
+        if (max_size and total_size > max_size or
+                max_entries and total_entries > max_entries):
+            LOG.warning('Packages cache exceeds its budget: all other '
+                        'packages are in use')
+        LOG.debug('Packages cache statistics: {}'.format(self.statistics))
+        return evicted
+
+
+def get_cache_manager(cache_directory):
+    manager = PACKAGES_CACHE_MANAGERS.get(cache_directory)
+    if manager is None:
+        manager = PackagesCacheManager(cache_directory)
+        PACKAGES_CACHE_MANAGERS[cache_directory] = manager
+    return manager
 
 
 def _with_to_generator(context_obj):
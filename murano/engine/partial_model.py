@@ -0,0 +1,229 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+
+from oslo_log import log as logging
+import six
+
+from murano.dsl import constants
+
+
+LOG = logging.getLogger(__name__)
+
+RemovedObject = collections.namedtuple(
+    'RemovedObject', ['owner', 'path', 'index', 'value'])
+
+
+class RestoreError(Exception):
+    pass
+
+
+def get_object_id(value):
+    if isinstance(value, dict):
+        header = value.get('?')
+        if isinstance(header, dict):
+            return header.get('id')
+    return None
+
+
+class ObjectIndex(object):
+    """Relations between objects of serialized object model trees"""
+
+    def __init__(self, *trees):
+        self.owners = {}
+        self.children = collections.defaultdict(set)
+        self.pinned_children = collections.defaultdict(set)
+        self.references = collections.defaultdict(set)
+        for tree in trees:
+            self._index(tree, None, False, False)
+        for object_id, strings in six.iteritems(self.references):
+            strings.intersection_update(self.owners)
+            strings.discard(object_id)
+
+    def _index(self, value, owner, in_list, nested):
+        # only objects stored directly in lists reached from their owner
+        # through dict keys can be cut out of the model, objects nested in
+        # list items have no stable place to be put back to
+        object_id = get_object_id(value)
+        if object_id is not None:
+            self.owners.setdefault(object_id, owner)
+            if owner is not None:
+                self.children[owner].add(object_id)
+                if not in_list:
+                    self.pinned_children[owner].add(object_id)
+            owner = object_id
+            nested = False
+        if isinstance(value, dict):
+            for item in six.itervalues(value):
+                self._index(item, owner, False, nested)
+        elif isinstance(value, list):
+            for item in value:
+                self._index(item, owner, not nested, True)
+        elif isinstance(value, six.string_types) and owner is not None:
+            self.references[owner].add(value)
+
+    def get_owners(self, object_id):
+        owner = self.owners.get(object_id)
+        while owner is not None:
+            yield owner
+            owner = self.owners.get(owner)
+
+
+class PartialModel(object):
+    """Part of the object model required to run an action
+
+    Contains the objects the action is called on with everything they own
+    and reference (transitively) and their owners up to the model root.
+    Owners are loaded with the objects stored in their properties, but other
+    objects stored in their lists are cut out of the model. Only lists
+    reached from the owner through dict keys are cut, so that the place of
+    the cut objects does not depend on positions of other list items. These
+    objects are put back to the resulting model by restore(). ObjectsCopy
+    objects missing in Objects are always loaded as they are going to be
+    destroyed.
+    """
+
+    def __init__(self, model, object_ids):
+        objects = model.get(constants.DM_OBJECTS)
+        objects_copy = model.get(constants.DM_OBJECTS_COPY)
+        index = ObjectIndex(objects, objects_copy)
+        copy_only_ids = set(ObjectIndex(objects_copy).owners).difference(
+            ObjectIndex(objects).owners)
+        self._loaded = self._collect(
+            index, [t for t in object_ids if t in index.owners],
+            copy_only_ids)
+        self._removed = {}
+        self._model = dict(model)
+        self._removed_attributes = []
+        if len(self._loaded) == len(index.owners):
+            return
+        for key in (constants.DM_OBJECTS, constants.DM_OBJECTS_COPY):
+            removed = []
+            self._model[key] = self._cut(
+                model.get(key), None, (), False, removed)
+            self._removed[key] = removed
+        attributes = []
+        for item in model.get(constants.DM_ATTRIBUTES) or []:
+            if item[0] in index.owners and item[0] not in self._loaded:
+                self._removed_attributes.append(item)
+            else:
+                attributes.append(item)
+        self._model[constants.DM_ATTRIBUTES] = attributes
+        LOG.debug('{0} of {1} objects of the model are going to be '
+                  'loaded'.format(len(self._loaded), len(index.owners)))
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def complete(self):
+        return not any(six.itervalues(self._removed))
+
+    @staticmethod
+    def _collect(index, object_ids, copy_only_ids):
+        if not object_ids:
+            return set(index.owners)
+        target_owners = set()
+        for object_id in object_ids:
+            target_owners.update(index.get_owners(object_id))
+
+        loaded = set()
+        owners = set()
+        queue = collections.deque((t, False) for t in object_ids)
+        queue.extend((t, False) for t in copy_only_ids)
+        while queue:
+            object_id, as_owner = queue.popleft()
+            if object_id in loaded or as_owner and object_id in owners:
+                continue
+            owner = index.owners.get(object_id)
+            if owner is not None:
+                queue.append((owner, True))
+            if as_owner:
+                owners.add(object_id)
+                children = index.pinned_children[object_id]
+            else:
+                loaded.add(object_id)
+                children = index.children[object_id]
+            queue.extend((t, False) for t in children)
+            queue.extend((t, t in target_owners)
+                         for t in index.references[object_id])
+        return loaded.union(owners)
+
+    def _cut(self, value, owner, path, nested, removed):
+        object_id = get_object_id(value)
+        if object_id is not None:
+            owner = object_id
+            path = ()
+            nested = False
+        if isinstance(value, dict):
+            return dict(
+                (key, self._cut(item, owner, path + (key,), nested, removed))
+                for key, item in six.iteritems(value))
+        elif isinstance(value, list):
+            result = []
+            for index, item in enumerate(value):
+                item_id = get_object_id(item)
+                if (not nested and item_id is not None and
+                        item_id not in self._loaded):
+                    removed.append(RemovedObject(owner, path, index, item))
+                else:
+                    result.append(self._cut(item, owner, path, True, removed))
+            return result
+        return value
+
+    @staticmethod
+    def _find_objects(value, result):
+        object_id = get_object_id(value)
+        if object_id is not None:
+            result[object_id] = value
+        if isinstance(value, dict):
+            for item in six.itervalues(value):
+                PartialModel._find_objects(item, result)
+        elif isinstance(value, list):
+            for item in value:
+                PartialModel._find_objects(item, result)
+        return result
+
+    def restore(self, model):
+        """Puts objects that were not loaded back to the resulting model
+
+        Objects whose owner was removed by the action are dropped along with
+        it. RestoreError is raised if an owner is still in the model but
+        the list the object was cut out of is not.
+        """
+
+        if model is None or self.complete:
+            return model
+        for key, removed in six.iteritems(self._removed):
+            objects = self._find_objects(model.get(key), {})
+            for item in removed:
+                container = objects.get(item.owner)
+                if container is None:
+                    LOG.debug('Object {0} is dropped from {1} along with its '
+                              'owner {2}'.format(get_object_id(item.value),
+                                                 key, item.owner))
+                    continue
+                for step in item.path:
+                    container = (container.get(step)
+                                 if isinstance(container, dict) else None)
+                if not isinstance(container, list):
+                    raise RestoreError(
+                        'Object {0} cannot be put back to {1} as the list '
+                        '{2} of its owner {3} has not survived the '
+                        'action'.format(get_object_id(item.value), key,
+                                        '.'.join(item.path), item.owner))
+                container.insert(item.index, item.value)
+        if model.get(constants.DM_ATTRIBUTES) is not None:
+            model[constants.DM_ATTRIBUTES].extend(self._removed_attributes)
+        return model
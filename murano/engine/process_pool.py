@@ -0,0 +1,166 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import os
+
+from eventlet import hubs
+from eventlet import queue
+from oslo_config import cfg
+from oslo_log import log as logging
+import six
+
+
+CONF = cfg.CONF
+
+LOG = logging.getLogger(__name__)
+
+_pool = None
+
+
+def _work(requests, results, parent_ends):
+    # the hub inherited from the engine process holds its green threads
+    # which must not be run by the worker
+    hubs.use_hub()
+    # ends of the pipes used by the engine process are closed so that the
+    # worker gets EOF once the engine process exits
+    for connection in parent_ends:
+        connection.close()
+    while True:
+        try:
+            message = requests.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        func, args = message
+        try:
+            result = True, func(*args)
+        except Exception as e:
+            result = False, e
+        try:
+            results.send(result)
+        except Exception as e:
+            # the result or the exception cannot be pickled
+            results.send((False, RuntimeError(six.text_type(e))))
+
+
+class _Worker(object):
+    def __init__(self):
+        # simplex pipes are built on os.pipe() and, unlike socket pairs,
+        # stay blocking when the socket module is patched by eventlet
+        child_requests, self.requests = multiprocessing.Pipe(duplex=False)
+        self.results, child_results = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=_work, args=(child_requests, child_results,
+                                (self.requests, self.results)))
+        self.process.daemon = True
+        self.process.start()
+        child_requests.close()
+        child_results.close()
+
+    def call(self, func, args):
+        self.requests.send((func, args))
+        # the green thread sleeps until the result is ready
+        hubs.trampoline(self.results.fileno(), read=True)
+        return self.results.recv()
+
+    def stop(self):
+        try:
+            self.requests.send(None)
+        except (IOError, OSError):
+            pass
+        self.close()
+
+    def close(self):
+        self.requests.close()
+        self.results.close()
+
+    def terminate(self):
+        self.close()
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class ProcessPool(object):
+    """Pool of worker processes for CPU-bound stages of tasks
+
+    Functions and their arguments are pickled and sent to an idle worker
+    process while the calling green thread sleeps, so that other green
+    threads of the engine keep running. Only module level functions of
+    plain data can be run in the pool. If a worker process dies, it is
+    replaced and the function is run in the engine process.
+    """
+
+    def __init__(self, size):
+        self._pid = os.getpid()
+        self._workers = queue.LightQueue()
+        for _ in six.moves.range(size):
+            self._workers.put(_Worker())
+
+    @property
+    def pid(self):
+        return self._pid
+
+    def run(self, func, *args):
+        worker = self._workers.get()
+        try:
+            success, result = worker.call(func, args)
+        except (EOFError, IOError, OSError):
+            LOG.warning('Worker process {pid} is not available, running '
+                        '{func} in the engine process'.format(
+                            pid=worker.process.pid, func=func.__name__))
+            worker.terminate()
+            self._workers.put(_Worker())
+            return func(*args)
+        except BaseException:
+            # the worker is in the middle of the call and cannot be reused
+            worker.terminate()
+            self._workers.put(_Worker())
+            raise
+        self._workers.put(worker)
+        if not success:
+            raise result
+        return result
+
+    def shutdown(self):
+        while not self._workers.empty():
+            self._workers.get().stop()
+
+
+def get_pool():
+    """Returns the pool of the engine process or None if it is disabled"""
+
+    global _pool
+
+    if not CONF.engine.process_pool_size:
+        return None
+    if _pool is None or _pool.pid != os.getpid():
+        _pool = ProcessPool(CONF.engine.process_pool_size)
+    return _pool
+
+
+def run(func, *args):
+    """Runs the function in the pool if it is enabled or in place if not"""
+
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+    return pool.run(func, *args)
+
+
+def shutdown():
+    global _pool
+
+    if _pool is not None and _pool.pid == os.getpid():
+        _pool.shutdown()
+    _pool = None
@@ -13,68 +13,227 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
+import six
 import yaml
 import yaml.composer
 import yaml.constructor
+import yaml.parser
+import yaml.reader
+import yaml.resolver
+import yaml.scanner
 
 from murano.dsl import dsl_types
 from murano.dsl import helpers
 from murano.dsl import yaql_expression
 
+try:
+    from yaml import cyaml
+except ImportError:
+    cyaml = None
+
+
+class MuranoPlDict(dict):
+    pass
+
+
+class PyParser(yaml.reader.Reader, yaml.scanner.Scanner,
+               yaml.parser.Parser, yaml.composer.Composer):
+    def __init__(self, stream):
+        yaml.reader.Reader.__init__(self, stream)
+        yaml.scanner.Scanner.__init__(self)
+        yaml.parser.Parser.__init__(self)
+        yaml.composer.Composer.__init__(self)
+
+
+if cyaml is not None:
+    class CParser(cyaml.CParser):
+        def __init__(self, stream):
+            cyaml.CParser.__init__(self, stream)
+            self._stream = stream
+
+        def get_node(self):
+            node = cyaml.CParser.get_node(self)
+            if node is not None and not self.check_node():
+                self._fix_end_marks(node)
+            return node
+
+        def _fix_end_marks(self, node):
+            # libyaml moves the end of a stream that has no trailing line
+            # break to the beginning of the next line while pure-Python
+            # parser keeps it at the end of the last line. Align the marks
+            # of block collections closed by the end of the stream so that
+            # source file positions do not depend on the parser used
+            end_mark = node.end_mark
+            if end_mark.column != 0 or not isinstance(
+                    self._stream, (six.text_type, six.binary_type)):
+                return
+            last_line = self._stream
+            if isinstance(last_line, six.binary_type):
+                last_line = last_line[last_line.rfind(b'\n') + 1:].decode(
+                    'utf-8', 'replace')
+            if not last_line or last_line[-1] in u'\r\n\x85\u2028\u2029':
+                return
+            mark = yaml.Mark(end_mark.name, end_mark.index,
+                             end_mark.line - 1,
+                             len(last_line.splitlines()[-1]), None, None)
+            while (isinstance(node, yaml.CollectionNode) and
+                   not node.flow_style and
+                   node.end_mark.index == end_mark.index):
+                node.end_mark = mark
+                if not node.value:
+                    break
+                node = node.value[-1]
+                if isinstance(node, tuple):
+                    node = node[1]
 
-@helpers.memoize
-def get_loader(version):
-    version = helpers.parse_version(version)
 
-    class MuranoPlDict(dict):
-        pass
+# libyaml-backed parser is several times faster than the pure-Python one
+PARSER = PyParser if cyaml is None else CParser
+
+
+def _build_position(node, file_id):
+    return dsl_types.ExpressionFilePosition(
+        file_id,
+        node.start_mark.line + 1,
+        node.start_mark.column + 1,
+        node.end_mark.line + 1,
+        node.end_mark.column + 1)
+
+
+def create_loader(version, parser):
+    """Creates MuranoPL class loader on top of the given YAML parser
+
+    :param version: MuranoPL runtime version of the loaded classes
+    :param parser: YAML parser class, either :class:`PyParser` or
+                   libyaml-backed ``yaml.cyaml.CParser``
+    :return: function that takes file contents and file id and returns
+             list of documents
+    """
+    version = helpers.parse_version(version)
 
     class YaqlExpression(yaql_expression.YaqlExpression):
         @staticmethod
         def match(expr):
             return yaql_expression.YaqlExpression.is_expression(expr, version)
 
+    class MuranoPlYamlConstructor(yaml.constructor.SafeConstructor):
+        def construct_yaml_map(self, node):
+            data = MuranoPlDict()
+            data.source_file_position = _build_position(node, self.file_id)
+            yield data
+            value = self.construct_mapping(node)
+            data.update(value)
+
+    class YaqlYamlLoader(parser, MuranoPlYamlConstructor,
+                         yaml.resolver.Resolver):
+        def __init__(self, stream, file_id):
+            parser.__init__(self, stream)
+            MuranoPlYamlConstructor.__init__(self)
+            yaml.resolver.Resolver.__init__(self)
+            self.file_id = file_id
+
+    YaqlYamlLoader.add_constructor(
+        u'tag:yaml.org,2002:map',
+        MuranoPlYamlConstructor.construct_yaml_map)
+
+    # workaround for PyYAML bug: http://pyyaml.org/ticket/221
+    resolvers = {}
+    for k, v in yaml.resolver.Resolver.yaml_implicit_resolvers.items():
+        resolvers[k] = v[:]
+    YaqlYamlLoader.yaml_implicit_resolvers = resolvers
+
+    def yaql_constructor(loader, node):
+        value = loader.construct_scalar(node)
+        result = yaql_expression.YaqlExpression(value, version)
+        result.source_file_position = _build_position(node, loader.file_id)
+        return result
+
+    YaqlYamlLoader.add_constructor(u'!yaql', yaql_constructor)
+    YaqlYamlLoader.add_implicit_resolver(u'!yaql', YaqlExpression, None)
+
     def load(contents, file_id):
-        def build_position(node):
-            return dsl_types.ExpressionFilePosition(
-                file_id,
-                node.start_mark.line + 1,
-                node.start_mark.column + 1,
-                node.end_mark.line + 1,
-                node.end_mark.column + 1)
-
-        class MuranoPlYamlConstructor(yaml.constructor.SafeConstructor):
-            def construct_yaml_map(self, node):
-                data = MuranoPlDict()
-                data.source_file_position = build_position(node)
-                yield data
-                value = self.construct_mapping(node)
-                data.update(value)
-
-        class YaqlYamlLoader(yaml.SafeLoader, MuranoPlYamlConstructor):
-            pass
-
-        YaqlYamlLoader.add_constructor(
-            u'tag:yaml.org,2002:map',
-            MuranoPlYamlConstructor.construct_yaml_map)
-
-        # workaround for PyYAML bug: http://pyyaml.org/ticket/221
-        resolvers = {}
-        for k, v in yaml.SafeLoader.yaml_implicit_resolvers.items():
-            resolvers[k] = v[:]
-        YaqlYamlLoader.yaml_implicit_resolvers = resolvers
-
-        def yaql_constructor(loader, node):
-            value = loader.construct_scalar(node)
-            result = yaql_expression.YaqlExpression(value, version)
-            result.source_file_position = build_position(node)
+        loader = YaqlYamlLoader(contents, file_id)
+        try:
+            result = []
+            while loader.check_data():
+                document = loader.get_data()
+                if document:
+                    result.append(document)
             return result
-
-        YaqlYamlLoader.add_constructor(u'!yaql', yaql_constructor)
-        YaqlYamlLoader.add_implicit_resolver(u'!yaql', YaqlExpression, None)
-        return list(filter(
-            lambda t: t,
-            yaml.load_all(contents, Loader=YaqlYamlLoader))
-        )
+        finally:
+            loader.dispose()
 
     return load
+
+
+@helpers.memoize
+def get_loader(version):
+    return create_loader(version, PARSER)
+
+
+def _dump_position(position):
+    return [position.start_line, position.start_column,
+            position.end_line, position.end_column]
+
+
+def _restore_position(data, file_id):
+    return dsl_types.ExpressionFilePosition(file_id, *data)
+
+
+def dump(documents):
+    """Converts documents produced by the loader to JSON-compatible form
+
+    Mappings and YAQL expressions are stored together with their source
+    file positions so that :func:`restore` can rebuild the exact same
+    structure without YAML parsing.
+
+    :param documents: list of documents returned by the loader
+    :return: JSON-serializable structure or None if documents contain
+             values that cannot be represented in JSON
+    """
+    def rec(value):
+        if isinstance(value, yaql_expression.YaqlExpression):
+            return {'y': value.expression,
+                    'p': _dump_position(value.source_file_position)}
+        elif isinstance(value, MuranoPlDict):
+            return {'d': [[rec(k), rec(v)] for k, v in six.iteritems(value)],
+                    'p': _dump_position(value.source_file_position)}
+        elif isinstance(value, list):
+            return [rec(t) for t in value]
+        elif isinstance(value, (dict, set, datetime.date, six.binary_type)):
+            raise ValueError(value)
+        return value
+
+    try:
+        return [rec(doc) for doc in documents]
+    except ValueError:
+        return None
+
+
+def restore(data, file_id, version):
+    """Rebuilds documents from the form produced by :func:`dump`
+
+    :param data: value returned by :func:`dump`
+    :param file_id: file identifier used in source file positions
+    :param version: MuranoPL runtime version of the package
+    :return: list of documents equal to the one returned by the loader
+    """
+    version = helpers.parse_version(version)
+
+    def rec(value):
+        if isinstance(value, list):
+            return [rec(t) for t in value]
+        elif isinstance(value, dict):
+            position = _restore_position(value['p'], file_id)
+            if 'y' in value:
+                result = yaql_expression.YaqlExpression(value['y'], version)
+            else:
+                result = MuranoPlDict(
+                    (rec(k), rec(v)) for k, v in value['d'])
+            result.source_file_position = position
+            return result
+        return value
+
+    return [rec(doc) for doc in data]
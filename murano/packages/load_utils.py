@@ -21,6 +21,8 @@ import zipfile
 
 import six
 import yaml
+import yaml.constructor
+import yaml.resolver
 
 from murano.common.plugins import package_types_loader
 import murano.packages.exceptions as e
@@ -30,6 +32,18 @@ import murano.packages.mpl_package
 
 PLUGIN_LOADER = None
 
+if hasattr(yaml, 'CParser'):
+    # NOTE: yaml.CSafeLoader is not used directly because its constructors
+    # are altered by io.murano.system.Resources
+    class SafeLoader(yaml.CParser, yaml.constructor.SafeConstructor,
+                     yaml.resolver.Resolver):
+        def __init__(self, stream):
+            yaml.CParser.__init__(self, stream)
+            yaml.constructor.SafeConstructor.__init__(self)
+            yaml.resolver.Resolver.__init__(self)
+else:
+    SafeLoader = yaml.SafeLoader
+
 
 def get_plugin_loader():
     global PLUGIN_LOADER
@@ -89,7 +103,11 @@ def load_from_dir(source_directory, filename='manifest.yaml'):
 
     try:
         with open(full_path) as stream:
-            content = yaml.safe_load(stream)
+            loader = SafeLoader(stream)
+            try:
+                content = loader.get_single_data()
+            finally:
+                loader.dispose()
     except Exception as ex:
         trace = sys.exc_info()[2]
         six.reraise(
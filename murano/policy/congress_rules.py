@@ -14,6 +14,32 @@
 #    under the License.
 
 from murano.dsl import helpers
+from murano.engine import process_pool
+
+
+def transitive_closure(relations):
+    """Computes transitive closure on a directed graph.
+
+    In other words computes reachability within the graph.
+    E.g. {(1, 2), (2, 3)} -> {(1, 2), (2, 3), (1, 3)}
+    (1, 3) was added because there is path from 1 to 3 in the graph.
+
+    :param relations: list of relations/edges in form of tuples
+    :return: transitive closure including original relations
+    """
+    closure = set(relations)
+    while True:
+        # Attempts to discover new transitive relations
+        # by joining 2 subsequent relations/edges within the graph.
+        new_relations = {(x, w) for x, y in closure
+                         for q, w in closure if q == y}
+        # Creates union with already discovered relations.
+        closure_until_now = closure | new_relations
+        # If no new relations were discovered in last cycle
+        # the computation is finished.
+        if closure_until_now == closure:
+            return closure
+        closure = closure_until_now
 
 
 class CongressRulesManager(object):
@@ -56,7 +82,7 @@ class CongressRulesManager(object):
         relations = [(rel.source_id, rel.target_id)
                      for rel in self._rules
                      if isinstance(rel, RelationshipRule)]
-        closure = self.transitive_closure(relations)
+        closure = process_pool.run(transitive_closure, relations)
 
         for rel in closure:
             self._rules.append(ConnectedRule(rel[0], rel[1]))
@@ -65,28 +91,7 @@ class CongressRulesManager(object):
 
     @staticmethod
     def transitive_closure(relations):
-        """Computes transitive closure on a directed graph.
-
-        In other words computes reachability within the graph.
-        E.g. {(1, 2), (2, 3)} -> {(1, 2), (2, 3), (1, 3)}
-        (1, 3) was added because there is path from 1 to 3 in the graph.
-
-        :param relations: list of relations/edges in form of tuples
-        :return: transitive closure including original relations
-        """
-        closure = set(relations)
-        while True:
-            # Attempts to discover new transitive relations
-            # by joining 2 subsequent relations/edges within the graph.
-            new_relations = {(x, w) for x, y in closure
-                             for q, w in closure if q == y}
-            # Creates union with already discovered relations.
-            closure_until_now = closure | new_relations
-            # If no new relations were discovered in last cycle
-            # the computation is finished.
-            if closure_until_now == closure:
-                return closure
-            closure = closure_until_now
+        return transitive_closure(relations)
 
     def _walk(self, obj, owner_id, path=()):
 
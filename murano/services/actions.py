@@ -33,7 +33,8 @@ class ActionServices(object):
             'token': context.auth_token,
             'project_id': context.tenant,
             'user_id': context.user,
-            'id': environment.id
+            'id': environment.id,
+            'return_model_patch': True
         }
         if session.description['Objects'] is not None:
             task['model']['Objects']['?']['id'] = environment.id
@@ -42,6 +43,24 @@ class ActionServices(object):
 
         return task
 
+    @staticmethod
+    def get_task_model(description, environment_id):
+        """Object model of the task created for the session description
+
+        Returns the model the same as create_action_task puts to the task
+        without modifying the description. Used to restore the model the
+        engine has diffed its result against.
+        """
+        model = dict(description)
+        objects = model.get('Objects')
+        if objects is not None:
+            objects = dict(objects)
+            objects['?'] = dict(objects['?'], id=environment_id)
+            if 'services' in objects or 'applications' not in objects:
+                objects['applications'] = objects.pop('services', [])
+            model['Objects'] = objects
+        return model
+
     @staticmethod
     def update_task(action, session, task, unit):
         session.state = states.SessionState.DEPLOYING
@@ -89,7 +89,8 @@ class TestActionsApi(tb.ControllerTest, tb.MuranoApiTestCase):
                 }
             },
             'token': None,
-            'id': '12345'
+            'id': '12345',
+            'return_model_patch': True
         }
 
         req = self._post('/environments/12345/actions/actionID_action', b'{}')
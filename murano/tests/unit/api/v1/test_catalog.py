@@ -669,6 +669,40 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
             '/v1/catalog/packages/', params={'catalog': 'True'}))
         self.assertEqual(4, len(result['packages']))
 
+    def test_resolve_packages(self):
+        self._set_policy_rules({'get_package': ''})
+        self.expect_policy_check('get_package')
+
+        own = self._add_pkg('test_tenant', fully_qualified_name='test.App',
+                            classes=['test.App'])
+        self._add_pkg('test_tenant2', public=True,
+                      fully_qualified_name='test.App', classes=['test.App'])
+        library = self._add_pkg('test_tenant2', public=True,
+                                classes=['test.Lib', 'test.Lib2'])
+        self._add_pkg('test_tenant2', fully_qualified_name='test.Private')
+
+        body = {'packages': [{'fqn': 'test.App'},
+                             {'class_name': 'test.Lib2'},
+                             {'fqn': 'test.Private'},
+                             {'class_name': 'test.App'}]}
+        req = self._post('/catalog/packages/resolve',
+                         jsonutils.dump_as_bytes(body))
+        result = jsonutils.loads(req.get_response(self.api).body)
+
+        self.assertEqual(
+            [own.id, library.id, None, own.id],
+            [pkg and pkg['id'] for pkg in result['packages']])
+
+    def test_resolve_packages_invalid_body(self):
+        self._set_policy_rules({'get_package': ''})
+        for body in ({}, {'packages': []},
+                     {'packages': [{'fqn': 'a', 'class_name': 'b'}]},
+                     {'packages': [{'name': 'a'}]}):
+            self.expect_policy_check('get_package')
+            req = self._post('/catalog/packages/resolve',
+                             jsonutils.dump_as_bytes(body))
+            self.assertEqual(400, req.get_response(self.api).status_code)
+
     def _test_package(self, manifest='manifest.yaml'):
         package_dir = os.path.abspath(
             os.path.join(
@@ -747,6 +781,8 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
         req = self._patch(url, jsonutils.dump_as_bytes(data))
         result = self.controller.update(req, data, saved_package.id)
         self.assertEqual('test_name', result['name'])
+        self.mock_engine_rpc.invalidate_schemas.assert_called_once_with(
+            saved_package.fully_qualified_name)
         self.expect_policy_check('modify_package',
                                  {'package_id': saved_package.id})
 
@@ -756,6 +792,21 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
         self.assertRaises(exc.HTTPBadRequest, self.controller.update,
                           req, data, saved_package.id)
 
+    def test_delete_package(self):
+        self._set_policy_rules(
+            {'delete_package': ''}
+        )
+        saved_package = self._add_pkg('test_tenant')
+        self.expect_policy_check('delete_package',
+                                 {'package_id': saved_package.id})
+        url = '/v1/catalog/packages/' + str(saved_package.id)
+
+        req = self._delete(url)
+        self.controller.delete(req, saved_package.id)
+
+        self.mock_engine_rpc.invalidate_schemas.assert_called_once_with(
+            saved_package.fully_qualified_name)
+
     def test_modify_package_no_body(self):
         self._set_policy_rules(
             {'modify_package': ''}
@@ -1012,6 +1063,77 @@ class TestCatalogApi(test_base.ControllerTest, test_base.MuranoApiTestCase):
                 e.detail
             )
 
+    def _upload_package(self, mock_validate_body, mock_load_from_file):
+        package_meta = self.test_package.copy()
+        package_meta['name'] = 'test_package'
+        package_meta['fully_qualified_name'] = str(uuid.uuid4())
+        pkg_to_upload = mock.MagicMock(
+            __exit__=lambda obj, type, value, tb: False)
+        pkg_to_upload.__enter__().version = '1.0.0'
+        for k, v in PKG_PARAMS_MAP.items():
+            if v in package_meta.keys():
+                setattr(pkg_to_upload.__enter__(), k, package_meta[v])
+        for attr in ['fully_qualified_name', 'ui_definition', 'author',
+                     'supplier_logo', 'supplier', 'logo', 'type', 'archive',
+                     'class_definitions']:
+            package_meta.pop(attr, None)
+        mock_load_from_file.return_value = pkg_to_upload
+        mock_request = mock.MagicMock(context=mock.MagicMock(
+            tenant=self.tenant, auth_token='test_token'))
+
+        with tempfile.NamedTemporaryFile(delete=True) as temp_file:
+            temp_file.write(b"Random test content\n")
+            temp_file.seek(0)
+            mock_validate_body.return_value = \
+                (mock.MagicMock(file=temp_file), package_meta)
+            result = self.controller.upload(mock_request)
+        self.assertEqual('test_package', result['name'])
+        return result
+
+    @mock.patch('murano.packages.load_utils.load_from_file')
+    @mock.patch('murano.api.v1.catalog._validate_body')
+    @mock.patch('murano.common.policy.check')
+    def test_upload_package_cache_schemas(self, mock_policy_check,
+                                          mock_validate_body,
+                                          mock_load_from_file):
+        self.override_config('cache_schemas_on_upload', True, 'engine')
+
+        result = self._upload_package(mock_validate_body, mock_load_from_file)
+        self.mock_engine_rpc.invalidate_schemas.assert_called_once_with(
+            result['fully_qualified_name'])
+        self.mock_engine_rpc.cache_schemas.assert_called_once_with(
+            {'token': 'test_token', 'project_id': self.tenant},
+            result['fully_qualified_name'], '1.0.0')
+
+    @mock.patch('murano.packages.load_utils.load_from_file')
+    @mock.patch('murano.api.v1.catalog._validate_body')
+    @mock.patch('murano.common.policy.check')
+    def test_upload_package_without_cache_schemas(self, mock_policy_check,
+                                                  mock_validate_body,
+                                                  mock_load_from_file):
+        result = self._upload_package(mock_validate_body, mock_load_from_file)
+        self.mock_engine_rpc.invalidate_schemas.assert_called_once_with(
+            result['fully_qualified_name'])
+        self.mock_engine_rpc.cache_schemas.assert_not_called()
+
+    @mock.patch('murano.api.v1.catalog.LOG')
+    @mock.patch('murano.packages.load_utils.load_from_file')
+    @mock.patch('murano.api.v1.catalog._validate_body')
+    @mock.patch('murano.common.policy.check')
+    def test_upload_package_engine_unavailable(self, mock_policy_check,
+                                               mock_validate_body,
+                                               mock_load_from_file,
+                                               mock_log):
+        self.override_config('cache_schemas_on_upload', True, 'engine')
+        self.mock_engine_rpc.invalidate_schemas.side_effect = Exception
+        self.mock_engine_rpc.cache_schemas.side_effect = Exception
+
+        result = self._upload_package(mock_validate_body, mock_load_from_file)
+        self.assertTrue(self.mock_engine_rpc.cache_schemas.called)
+        self.assertEqual(2, mock_log.warning.call_count)
+        self.assertIsNotNone(db_catalog_api.package_get(
+            result['id'], mock.MagicMock(tenant=self.tenant)))
+
     @mock.patch('murano.common.policy.check')
     def test_upload_package_with_oversized_body(self, mock_policy_check):
         mock_policy_check.return_value = True
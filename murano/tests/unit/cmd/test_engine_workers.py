@@ -12,6 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import shutil
+import tempfile
+
 import mock
 
 from oslo_concurrency import processutils
@@ -48,3 +52,17 @@ class TestEngineWorkers(base.MuranoTestCase):
         engine.main()
         launch.assert_called_once_with(mock.ANY, mock.ANY,
                                        workers=processutils.get_worker_count())
+
+    @mock.patch.object(config, 'parse_args')
+    @mock.patch.object(logging, 'setup')
+    @mock.patch('oslo_service.service.launch')
+    def test_ready_files_removed(self, launch, setup, parse_args):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        for name in ('ready.1', 'ready.2', 'other'):
+            open(os.path.join(location, name), 'a').close()
+        self.override_config('ready_file', os.path.join(location, 'ready'),
+                             'engine')
+
+        engine.main()
+        self.assertEqual(['other'], os.listdir(location))
@@ -13,11 +13,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import mock
+import copy
+import os
+import shutil
+import tempfile
 
+import eventlet
+from eventlet import event
+import mock
+import oslo_messaging as messaging
+from oslo_serialization import jsonutils
 from oslo_service import service
 
 from murano.common import engine
+from murano.common import utils
 from murano.dsl import constants
 from murano.dsl import helpers
 from murano.dsl import murano_package
@@ -58,6 +67,62 @@ class TestEngineService(base.MuranoTestCase):
         self.engine.stop(graceful=True)
         self.assertTrue(mock_stop.called)
 
+    @mock.patch.object(service.Service, 'start')
+    @mock.patch('murano.common.engine.warm_up')
+    @mock.patch('murano.common.engine.messaging')
+    def test_start_with_warm_up(self, mock_messaging, mock_warm_up,
+                                mock_start):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.override_config('enable_warm_up', True, 'engine')
+        self.override_config('ready_file', os.path.join(location, 'ready'),
+                             'engine')
+        ready_file = os.path.join(location, 'ready.{0}'.format(os.getpid()))
+
+        def check_not_ready(*args, **kwargs):
+            self.assertFalse(self.engine.ready.ready())
+            self.assertFalse(os.path.exists(ready_file))
+        mock_warm_up.side_effect = check_not_ready
+
+        self.engine.start()
+        mock_warm_up.assert_called_once_with()
+        self.assertTrue(mock_messaging.get_rpc_server.return_value.
+                        start.called)
+        self.assertTrue(self.engine.ready.ready())
+        self.assertEqual(['ready.{0}'.format(os.getpid())],
+                         os.listdir(location))
+
+        self.engine.stop()
+        self.assertFalse(os.path.exists(ready_file))
+
+    @mock.patch.object(service.Service, 'start')
+    @mock.patch('murano.common.engine.warm_up')
+    @mock.patch('murano.common.engine.messaging')
+    def test_start_without_warm_up(self, mock_messaging, mock_warm_up,
+                                   mock_start):
+        self.engine.start()
+        self.assertFalse(mock_warm_up.called)
+        self.assertTrue(self.engine.ready.ready())
+
+    @mock.patch('murano.common.engine.contracts.Contract.prepare_contexts')
+    @mock.patch.object(package_loader, 'get_class',
+                       wraps=package_loader.get_class)
+    def test_warm_up(self, mock_get_class, mock_prepare_contexts):
+        meta = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                            os.pardir, os.pardir, 'meta')
+        self.override_config('load_packages_from', [meta], 'engine')
+        self.override_config('warm_up_packages',
+                             ['io.murano', 'io.murano.missing'], 'engine')
+
+        engine.warm_up()
+        self.assertEqual(
+            [mock.call(version) for version in constants.RUNTIME_VERSIONS],
+            mock_prepare_contexts.call_args_list)
+        loaded_classes = set(
+            call[0][1] for call in mock_get_class.call_args_list)
+        self.assertIn('io.murano.Object', loaded_classes)
+        self.assertIn('io.murano.Environment', loaded_classes)
+
 
 class TestTaskExecutor(base.MuranoTestCase):
     def setUp(self):
@@ -124,6 +189,40 @@ class TestTaskExecutor(base.MuranoTestCase):
         self.assertTrue(mock_create.called)
         self.assertTrue(mock_delete.called)
 
+    @mock.patch('murano.common.engine.auth_utils.delete_trust')
+    @mock.patch('murano.common.engine.auth_utils.create_trust')
+    @mock.patch('murano.common.engine.package_loader.'
+                'CombinedPackageLoader.import_fixation_table')
+    @mock.patch('murano.common.engine.TaskExecutor._execute')
+    def test_execute_with_model_patch(self, mock_execute, mock_loader,
+                                      mock_create, mock_delete):
+        self.task['return_model_patch'] = True
+        self.task['model']['Objects'] = {'?': {'id': 'my_env_id'}}
+        task_executor = engine.TaskExecutor(self.task)
+        mock_loader.return_value = {}
+        mock_create.return_value = 'trust_id'
+
+        def execute(loader):
+            task_executor._model['Objects'] = {
+                '?': {'id': 'my_env_id', 'name': 'env'}}
+            return {}
+
+        mock_execute.side_effect = execute
+        result = task_executor.execute()
+
+        self.assertNotIn('model', result)
+        self.assertIn({'op': 'add', 'path': '/Objects/?/name',
+                       'value': 'env'}, result['model_patch'])
+        self.assertEqual({'?': {'id': 'my_env_id'}},
+                         self.task['model']['Objects'])
+        self.assertEqual(utils.get_model_digest(self.task['model']),
+                         result['model_digest'])
+        full_result = task_executor.get_full_result(result)
+        self.assertNotIn('model_patch', full_result)
+        self.assertNotIn('model_digest', full_result)
+        self.assertEqual({'?': {'id': 'my_env_id', 'name': 'env'}},
+                         full_result['model']['Objects'])
+
     def test_private_execute(self):
         mock_loader = mock.Mock()
         result = self.task_executor._execute(mock_loader)
@@ -135,6 +234,76 @@ class TestTaskExecutor(base.MuranoTestCase):
         }
         self.assertEqual(expected, result)
 
+    def test_private_execute_with_profiler(self):
+        profiler_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profiler_dir)
+        self.override_config('profiler_dir', profiler_dir, 'engine')
+
+        self.task_executor._execute(mock.Mock())
+
+        files = sorted(os.listdir(profiler_dir))
+        self.assertEqual(2, len(files))
+        self.assertTrue(files[0].startswith('my_env_id-'))
+        self.assertTrue(files[0].endswith('.stacks'))
+        self.assertTrue(files[1].endswith('.stats'))
+
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'load')
+    def test_private_execute_lazy_model_loading(self, mock_load,
+                                                mock_finalize):
+        self.override_config('enable_lazy_model_loading', True, 'engine')
+        self.task_executor._model['Objects'] = {
+            '?': {'id': 'env_id', 'type': 'io.murano.Environment'},
+            'applications': [
+                {'?': {'id': 'my_obj_id', 'type': 'test.App'}},
+                {'?': {'id': 'other_obj_id', 'type': 'test.App'}}
+            ]
+        }
+        loaded_model = {}
+
+        def load(model):
+            loaded_model.update(copy.deepcopy(model))
+            return None
+
+        mock_load.side_effect = load
+        mock_finalize.side_effect = lambda obj=None: copy.deepcopy(
+            loaded_model)
+
+        self.task_executor._execute(mock.Mock())
+
+        self.assertEqual(
+            ['my_obj_id'],
+            [t['?']['id'] for t in loaded_model['Objects']['applications']])
+        self.assertEqual(
+            ['my_obj_id', 'other_obj_id'],
+            [t['?']['id']
+             for t in self.task_executor.model['Objects']['applications']])
+
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'load')
+    def test_private_execute_lazy_model_loading_restore_error(
+            self, mock_load, mock_finalize):
+        self.override_config('enable_lazy_model_loading', True, 'engine')
+        self.task_executor._model['Objects'] = {
+            '?': {'id': 'env_id', 'type': 'io.murano.Environment'},
+            'applications': [
+                {'?': {'id': 'my_obj_id', 'type': 'test.App'}},
+                {'?': {'id': 'other_obj_id', 'type': 'test.App'}}
+            ]
+        }
+        source_model = dict(self.task_executor._model)
+        self.task_executor._source_model = source_model
+        mock_load.return_value = None
+        mock_finalize.return_value = {'Objects': {
+            '?': {'id': 'env_id', 'type': 'io.murano.Environment'},
+            'applications': None
+        }}
+
+        result = self.task_executor._execute(mock.Mock())
+
+        self.assertTrue(result['action']['isException'])
+        self.assertEqual(source_model, self.task_executor.model)
+
     @mock.patch('murano.common.engine.auth_utils.delete_trust')
     @mock.patch('murano.common.engine.auth_utils.create_trust')
     def test_trust(self, mock_create, mock_delete):
@@ -226,34 +395,193 @@ class TestStaticActionExecutor(base.MuranoTestCase):
         self.assertTrue(mock_serializer.serialize.called)
 
 
+class TestStaticActionExecutorPool(base.MuranoTestCase):
+    def setUp(self):
+        super(TestStaticActionExecutorPool, self).setUp()
+        self.mock_loader = mock.patch.object(
+            engine.package_loader, 'CombinedPackageLoader').start()
+        self.mock_loader.side_effect = lambda session: mock.Mock()
+        self.mock_executor = mock.patch.object(
+            engine.dsl_executor, 'MuranoDslExecutor').start()
+        self.mock_executor.side_effect = lambda *args: mock.Mock()
+        mock.patch.object(engine, 'get_plugin_loader').start()
+        self.mock_timer = mock.patch.object(
+            engine.timeit, 'default_timer', return_value=0).start()
+        self.addCleanup(mock.patch.stopall)
+        self.pool = engine.StaticActionExecutorPool(max_size=2, ttl=60)
+
+    def _session(self, project_id='test_tenant', token='test_token'):
+        session = engine.execution_session.ExecutionSession()
+        session.project_id = project_id
+        session.token = token
+        return session
+
+    def _run(self, session):
+        with self.pool.executor(session) as executor:
+            return executor
+
+    def test_executor_reused(self):
+        executor = self._run(self._session())
+
+        self.assertIs(executor, self._run(self._session()))
+        self.assertEqual(1, self.mock_executor.call_count)
+        self.assertEqual(2, executor.recycle.call_count)
+        self.assertIsNot(executor, self._run(self._session(token='other')))
+        self.assertEqual(2, len(self.pool))
+
+    def test_executor_dropped(self):
+        executor = self._run(self._session('p1'))
+        pkg_loader = self.mock_executor.call_args[0][0]
+        self._run(self._session('p2'))
+        self._run(self._session('p3'))
+
+        self.assertEqual(2, len(self.pool))
+        pkg_loader.cleanup.assert_called_once_with()
+        self.mock_timer.return_value = 61
+        self.assertIsNot(executor, self._run(self._session('p2')))
+        self.assertEqual(1, len(self.pool))
+
+    def test_failed_executor_not_reused(self):
+        def fail():
+            with self.pool.executor(self._session()):
+                raise ValueError()
+
+        self.assertRaises(ValueError, fail)
+        pkg_loader = self.mock_executor.call_args[0][0]
+        pkg_loader.cleanup.assert_called_once_with()
+        self.assertEqual(0, len(self.pool))
+
+    def test_disabled(self):
+        self.pool = engine.StaticActionExecutorPool()
+        self._run(self._session())
+        pkg_loader = self.mock_executor.call_args[0][0]
+
+        pkg_loader.cleanup.assert_called_once_with()
+        self.assertEqual(0, len(self.pool))
+
+
 class TestSchemaEndpoint(base.MuranoTestCase):
 
     def setUp(self):
         super(TestSchemaEndpoint, self).setUp()
-        context_manager = mock_context_manager.MockContextManager()
-        self.context = context_manager.create_root_context(
-            constants.RUNTIME_VERSION_1_5)
+        self.credentials = {'token': 'test_token',
+                            'project_id': 'test_tenant'}
+        mock.patch.object(engine, 'SCHEMA_CACHE', None).start()
+        mock_schema_generator = mock.patch(
+            'murano.common.engine.schema_generator').start()
+        mock_package_loader = mock.patch(
+            'murano.common.engine.package_loader').start()
+        self.addCleanup(mock.patch.stopall)
 
-    @mock.patch('murano.common.engine.schema_generator')
-    @mock.patch('murano.common.engine.package_loader')
-    def test_generate_schema(self, mock_package_loader,
-                             mock_schema_generator):
-        mock_pkg_loader = mock.Mock(
-            spec=package_loader.CombinedPackageLoader)
+        self.package = mock.Mock(package_id='test_package_id',
+                                 version='1.0.0', classes=['test_class_name'])
+        self.package.name = 'test_package'
+        self.dependency = mock.Mock(package_id='test_dependency_id')
+        self.dependency.name = 'test_dependency'
+        self.pkg_loader = mock.Mock()
+        self.pkg_loader.api_loader.packages = [self.package, self.dependency]
+        self.pkg_loader.load_package.return_value = self.package
         mock_package_loader.CombinedPackageLoader().__enter__.return_value =\
-            mock_pkg_loader
-        mock_schema_generator.generate_schema.return_value = 'test_schema'
+            self.pkg_loader
+        self.find_class_package = mock_schema_generator.find_class_package
+        self.find_class_package.return_value = self.package
+        self.generate_schema = mock_schema_generator.generate_schema
+        self.generate_schema.side_effect = lambda *args: {'': {}}
+
+    def test_generate_schema(self):
+        self.package.package_id = None
+
+        for _ in range(2):
+            result = engine.SchemaEndpoint.generate_schema(
+                self.credentials, 'test_class_name', ['foo'], '=0')
+
+        self.assertEqual({'': {}}, result)
+        self.find_class_package.assert_called_with(
+            self.pkg_loader, 'test_class_name', '=0', None)
+        self.generate_schema.assert_called_with(
+            self.pkg_loader, mock.ANY, 'test_class_name', ['foo'], '=0', None)
+        self.assertEqual(2, self.generate_schema.call_count)
+
+    def test_generate_schema_cached(self):
+        result = engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name', ['foo', 'bar'])
+        result['modified'] = True
+        result = engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name', ['bar', 'foo'])
+
+        self.assertEqual({'': {}}, result)
+        self.assertEqual(1, self.generate_schema.call_count)
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+        self.assertEqual(2, self.generate_schema.call_count)
+
+    def test_generate_schema_cached_per_project(self):
+        other_credentials = {'token': 'other_token',
+                             'project_id': 'other_tenant'}
+        self.generate_schema.side_effect = [{'tenant': 'test_tenant'},
+                                            {'tenant': 'other_tenant'}]
+
+        for _ in range(2):
+            self.assertEqual(
+                {'tenant': 'test_tenant'},
+                engine.SchemaEndpoint.generate_schema(
+                    self.credentials, 'test_class_name'))
+            self.assertEqual(
+                {'tenant': 'other_tenant'},
+                engine.SchemaEndpoint.generate_schema(
+                    other_credentials, 'test_class_name'))
+        self.assertEqual(2, self.generate_schema.call_count)
+
+    @mock.patch.object(engine, 'get_task_scheduler')
+    def test_generate_schema_not_scheduled(self, mock_scheduler):
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+        engine.SchemaEndpoint.cache_schemas(
+            self.credentials, 'test_package', '1.0.0')
+
+        mock_scheduler.assert_not_called()
+
+    def test_invalidate_schemas(self):
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+
+        engine.SchemaEndpoint.invalidate_schemas({}, 'unknown_package')
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+        self.assertEqual(1, self.generate_schema.call_count)
+
+        engine.SchemaEndpoint.invalidate_schemas({}, 'test_package')
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+        self.assertEqual(2, self.generate_schema.call_count)
+
+    def test_invalidate_schemas_dependency_shadowed(self):
+        self.generate_schema.side_effect = [{'dependency': 'public'},
+                                            {'dependency': 'own'}]
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+
+        # the project uploads its own package with the name of the public
+        # dependency, which takes precedence from now on
+        self.dependency.package_id = 'own_dependency_id'
+        engine.SchemaEndpoint.invalidate_schemas({}, 'test_dependency')
 
-        arg1, arg2, arg3 = mock.Mock(), mock.Mock(), mock.Mock()
-        test_args = (arg1, arg2, arg3)
-        test_kwargs = {'foo': 'bar', 'class_name': 'test_class_name'}
+        self.assertEqual(
+            {'dependency': 'own'},
+            engine.SchemaEndpoint.generate_schema(
+                self.credentials, 'test_class_name'))
+        self.assertEqual(2, self.generate_schema.call_count)
 
-        result = engine.SchemaEndpoint.generate_schema(
-            self.context, *test_args, **test_kwargs)
+    def test_cache_schemas(self):
+        engine.SchemaEndpoint.cache_schemas(
+            self.credentials, 'test_package', '1.0.0')
 
-        self.assertEqual('test_schema', result)
-        mock_schema_generator.generate_schema.assert_called_once_with(
-            mock_pkg_loader, mock.ANY, *test_args, **test_kwargs)
+        self.generate_schema.assert_called_once_with(
+            self.pkg_loader, mock.ANY, 'test_class_name', None, '==1.0.0',
+            'test_package')
+        engine.SchemaEndpoint.generate_schema(
+            self.credentials, 'test_class_name')
+        self.assertEqual(1, self.generate_schema.call_count)
 
 
 class TestTaskProcessingEndpoint(base.MuranoTestCase):
@@ -297,13 +625,82 @@ class TestTaskProcessingEndpoint(base.MuranoTestCase):
         handle_task(self.context, self.task)
 
         mock_delete_trust.assert_called_once_with()
-        mock_rpc.api().process_result.assert_called_once_with(
-            mock.ANY, 'test_task_id')
+        mock_rpc.api().process_serialized_result.assert_called_once_with(
+            mock.ANY, 'test_task_id', False)
+        result = mock_rpc.api().process_serialized_result.call_args[0][0]
+        self.assertEqual(
+            self.task['model'], jsonutils.loads(result)['model'])
         self.assertEqual(2, mock_log.info.call_count)
         self.assertIn('Starting processing task:',
                       str(mock_log.info.mock_calls[0]))
-        self.assertIn('Finished processing task:',
-                      str(mock_log.info.mock_calls[1]))
+        self.assertEqual('Finished processing task: {0}'.format(result),
+                         mock_log.info.mock_calls[1][1][0])
+
+    @mock.patch.object(engine.TaskExecutor, '_delete_trust')
+    @mock.patch.object(engine.rpc, 'api')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    def test_handle_task_old_api(self, mock_finalize, mock_api,
+                                 mock_delete_trust):
+        mock_finalize.return_value = self.task['model']
+        mock_api().process_serialized_result.side_effect = \
+            messaging.RemoteError('NoSuchMethod')
+
+        engine.TaskProcessingEndpoint.handle_task(self.context, self.task)
+
+        mock_api().process_result.assert_called_once_with(
+            mock.ANY, 'test_task_id')
+        result = mock_api().process_result.call_args[0][0]
+        self.assertEqual(self.task['model'], result['model'])
+
+    @mock.patch.object(engine.TaskExecutor, '_delete_trust')
+    @mock.patch.object(engine.rpc, 'api')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    def test_handle_task_model_patch_rejected(self, mock_finalize, mock_api,
+                                              mock_delete_trust):
+        self.task['return_model_patch'] = True
+        mock_finalize.return_value = self.task['model']
+        mock_api().process_serialized_result.side_effect = [
+            messaging.RemoteError('ModelPatchError'), None]
+
+        engine.TaskProcessingEndpoint.handle_task(self.context, self.task)
+
+        calls = mock_api().process_serialized_result.call_args_list
+        self.assertEqual(2, len(calls))
+        self.assertEqual(('test_task_id', True), calls[0][0][1:])
+        self.assertIn('model_patch', jsonutils.loads(calls[0][0][0]))
+        result = jsonutils.loads(calls[1][0][0])
+        self.assertNotIn('model_patch', result)
+        self.assertEqual(self.task['model'], result['model'])
+
+    @mock.patch.object(engine.TaskExecutor, '_delete_trust')
+    @mock.patch.object(engine.rpc, 'api')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    def test_handle_task_model_patch_old_api(self, mock_finalize, mock_api,
+                                             mock_delete_trust):
+        self.task['return_model_patch'] = True
+        mock_finalize.return_value = self.task['model']
+        mock_api().process_serialized_result.side_effect = \
+            messaging.RemoteError('UnsupportedVersion')
+
+        engine.TaskProcessingEndpoint.handle_task(self.context, self.task)
+
+        result = mock_api().process_result.call_args[0][0]
+        self.assertNotIn('model_patch', result)
+        self.assertEqual(self.task['model'], result['model'])
+
+    @mock.patch.object(engine.TaskExecutor, '_delete_trust')
+    @mock.patch.object(engine.rpc, 'api')
+    @mock.patch.object(engine.dsl_executor.MuranoDslExecutor, 'finalize')
+    def test_handle_task_api_error(self, mock_finalize, mock_api,
+                                   mock_delete_trust):
+        mock_finalize.return_value = self.task['model']
+        mock_api().process_serialized_result.side_effect = \
+            messaging.RemoteError('ValueError')
+
+        self.assertRaises(messaging.RemoteError,
+                          engine.TaskProcessingEndpoint.handle_task,
+                          self.context, self.task)
+        mock_api().process_result.assert_not_called()
 
 
 class TestStaticActionEndpoint(base.MuranoTestCase):
@@ -357,3 +754,88 @@ class TestStaticActionEndpoint(base.MuranoTestCase):
                       str(mock_log.info.mock_calls[0]))
         self.assertIn('Finished execution of static action:',
                       str(mock_log.info.mock_calls[1]))
+
+    @mock.patch('murano.dsl.serializer.serialize')
+    @mock.patch('murano.common.engine.package_loader')
+    @mock.patch.object(engine, 'get_task_scheduler')
+    def test_call_static_action_not_scheduled(self, mock_scheduler,
+                                              mock_package_loader,
+                                              mock_serialize):
+        mock_serialize.return_value = {}
+
+        engine.StaticActionEndpoint.call_static_action(
+            self.context, self.task)
+
+        mock_scheduler.assert_not_called()
+
+
+class TestTaskScheduler(base.MuranoTestCase):
+    def setUp(self):
+        super(TestTaskScheduler, self).setUp()
+        self.traces = []
+        self.gates = {}
+
+    def _spawn(self, scheduler, name, project_id, environment_id=None):
+        gate = self.gates[name] = event.Event()
+
+        def task():
+            with scheduler.task(project_id, environment_id):
+                self.traces.append(name)
+                gate.wait()
+        thread = eventlet.spawn(task)
+        eventlet.sleep(0)
+        return thread
+
+    def test_concurrency_limit_and_fair_queuing(self):
+        scheduler = engine.TaskScheduler(max_concurrent_tasks=1)
+        threads = [self._spawn(scheduler, 'a', 'p1'),
+                   self._spawn(scheduler, 'b', 'p1'),
+                   self._spawn(scheduler, 'c', 'p1'),
+                   self._spawn(scheduler, 'd', 'p2')]
+
+        self.assertEqual(['a'], self.traces)
+        self.assertEqual(1, scheduler.running)
+        self.assertEqual(3, scheduler.queue_depth)
+        self.assertEqual({'p1': 2, 'p2': 1}, scheduler.queue_depths)
+        for name in 'abdc':
+            self.gates[name].send()
+            eventlet.sleep(0)
+        for thread in threads:
+            thread.wait()
+
+        self.assertEqual(['a', 'b', 'd', 'c'], self.traces)
+        self.assertEqual(0, scheduler.running)
+        self.assertEqual(0, scheduler.queue_depth)
+        self.assertEqual(4, scheduler.stats.tasks)
+        self.assertEqual(3, scheduler.stats.queued_tasks)
+        self.assertGreater(scheduler.stats.max_wait_time, 0)
+
+    def test_environment_tasks_serialized(self):
+        scheduler = engine.TaskScheduler()
+        threads = [self._spawn(scheduler, 'a', 'p1', 'env1'),
+                   self._spawn(scheduler, 'b', 'p1', 'env1'),
+                   self._spawn(scheduler, 'c', 'p1', 'env2')]
+
+        self.assertEqual(['a', 'c'], self.traces)
+        self.assertEqual(2, scheduler.running)
+        for name in 'acb':
+            self.gates[name].send()
+            eventlet.sleep(0)
+        for thread in threads:
+            thread.wait()
+
+        self.assertEqual(['a', 'c', 'b'], self.traces)
+        self.assertEqual(0, scheduler.stats.queued_tasks)
+
+    def test_killed_queued_task(self):
+        scheduler = engine.TaskScheduler(max_concurrent_tasks=1)
+        first = self._spawn(scheduler, 'a', 'p1')
+        killed = self._spawn(scheduler, 'b', 'p1')
+        killed.kill()
+        self.assertEqual(0, scheduler.queue_depth)
+        self.gates['a'].send()
+        first.wait()
+
+        self.assertEqual(0, scheduler.running)
+        self._spawn(scheduler, 'c', 'p2')
+        self.assertEqual(['a', 'c'], self.traces)
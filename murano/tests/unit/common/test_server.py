@@ -16,7 +16,9 @@
 from datetime import datetime
 import mock
 
+from murano.common import exceptions
 from murano.common import server
+from murano.common import utils
 from murano.services import states
 from murano.tests.unit import base
 from murano.tests.unit import utils as test_utils
@@ -190,6 +192,14 @@ class ServerTest(base.MuranoTestCase):
             'Environment result could not be handled, '
             'specified environment not found in database')
 
+    @mock.patch('murano.common.server.ResultEndpoint.process_result')
+    def test_process_serialized_result(self, mock_process_result):
+        self.result_endpoint.process_serialized_result(
+            self.dummy_context, '{"model": {"Objects": null}}', 'test_env_id')
+
+        mock_process_result.assert_called_once_with(
+            self.dummy_context, {'model': {'Objects': None}}, 'test_env_id')
+
     @mock.patch('murano.common.server.environments')
     @mock.patch('murano.common.server.session')
     def test_process_result_with_no_objects(self, mock_db_session,
@@ -203,6 +213,86 @@ class ServerTest(base.MuranoTestCase):
         mock_environments.EnvironmentServices.remove.assert_called_once_with(
             'test_env_id')
 
+    @mock.patch('murano.common.server.get_last_deployment')
+    @mock.patch('murano.common.server.models')
+    @mock.patch('murano.common.server.session')
+    def test_process_result_with_model_patch(self, mock_db_session,
+                                             mock_models,
+                                             mock_last_deployment):
+        test_result = {
+            'model_patch': [
+                {'op': 'add', 'path': '/Objects/applications/-',
+                 'value': 'app2'}
+            ],
+            'model_digest': utils.get_model_digest({
+                'Objects': {
+                    '?': {'id': 'test_env_id'},
+                    'applications': ['app1']
+                }
+            }),
+            'action': {
+                'isException': False
+            }
+        }
+        mock_env = mock.MagicMock(id='test_env_id',
+                                  tenant_id='test_tenant_id',
+                                  description=None,
+                                  version=1)
+        mock_db_session.get_session().query().get.return_value = mock_env
+        mock_db_session.get_session().query().filter_by().count.\
+            return_value = 0
+        mock_db_session.get_session().query().filter().first().\
+            description = {
+                'Objects': {
+                    '?': {'id': 'test_env_id'},
+                    'services': ['app1']
+                }
+            }
+
+        self.result_endpoint.process_result(self.dummy_context, test_result,
+                                            'test_env_id')
+
+        self.assertEqual({
+            'Objects': {
+                '?': {'id': 'test_env_id'},
+                'services': ['app1', 'app2']
+            }
+        }, mock_env.description)
+        self.assertEqual(2, mock_env.version)
+
+    @mock.patch('murano.common.server.session')
+    def test_apply_model_patch_without_session(self, mock_db_session):
+        unit = mock_db_session.get_session()
+        unit.query().filter().first.return_value = None
+
+        self.assertRaises(ValueError, server.apply_model_patch,
+                          unit, 'test_env_id', [], None)
+
+    @mock.patch('murano.common.server.session')
+    def test_apply_model_patch_digest_mismatch(self, mock_db_session):
+        unit = mock_db_session.get_session()
+        unit.query().filter().first().description = {'Objects': None}
+
+        self.assertRaises(
+            exceptions.ModelPatchError, server.apply_model_patch, unit,
+            'test_env_id', [], utils.get_model_digest({'Objects': {}}))
+        self.assertRaises(exceptions.ModelPatchError,
+                          server.apply_model_patch, unit, 'test_env_id', [],
+                          None)
+        self.assertEqual({'Objects': None}, server.apply_model_patch(
+            unit, 'test_env_id', [],
+            utils.get_model_digest({'Objects': None})))
+
+    @mock.patch('murano.common.server.session')
+    def test_apply_model_patch_conflict(self, mock_db_session):
+        unit = mock_db_session.get_session()
+        unit.query().filter().first().description = {'Objects': None}
+
+        self.assertRaises(
+            exceptions.ModelPatchError, server.apply_model_patch, unit,
+            'test_env_id', [{'op': 'remove', 'path': '/Objects/services'}],
+            utils.get_model_digest({'Objects': None}))
+
     @mock.patch('murano.common.server.instances')
     def test_track_instance(self, mock_instances):
         test_payload = {
@@ -12,9 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import datetime
 import json
 
+import jsonpatch
+
 from murano.common import utils
 
 from murano.tests.unit import base
@@ -136,3 +139,55 @@ class UtilsTests(base.MuranoTestCase):
 
         t2 = "Not a module"
         self.assertTrue(utils.is_different(t1, t2))
+
+    def test_get_model_digest(self):
+        model = collections.OrderedDict([('b', [1, {'c': None}]), ('a', 'x')])
+
+        self.assertEqual(utils.get_model_digest(model),
+                         utils.get_model_digest(
+                             {'a': u'x', 'b': [1, {'c': None}]}))
+        self.assertNotEqual(utils.get_model_digest(model),
+                            utils.get_model_digest({'a': 'x', 'b': [1]}))
+
+    def test_make_json_patch(self):
+        src = {
+            'Objects': {
+                '?': {'id': 'env'},
+                'applications': [{'?': {'id': 'app%d' % i}, 'flag': True}
+                                 for i in range(5)],
+                'a/b': 'c~d'
+            },
+            'Attributes': [],
+            'removed': 1
+        }
+        dst = json.loads(json.dumps(src))
+        del dst['removed']
+        dst['added'] = {'key': 'value'}
+        dst['Attributes'] = None
+        dst['Objects']['a/b'] = 'e'
+        applications = dst['Objects']['applications']
+        applications[1]['flag'] = 1
+        applications.insert(2, {'?': {'id': 'new'}})
+        del applications[4]
+
+        patch = utils.make_json_patch(src, dst)
+
+        self.assertEqual(dst, jsonpatch.apply_patch(src, patch))
+        self.assertNotIsInstance(
+            jsonpatch.apply_patch(src, patch)['Objects']['applications'][1][
+                'flag'], bool)
+        self.assertEqual([], utils.make_json_patch(src, src))
+
+    def test_make_json_patch_list_insertion(self):
+        src = {'applications': [{'?': {'id': 'app%d' % i}}
+                                for i in range(5)]}
+        dst = json.loads(json.dumps(src))
+        dst['applications'].insert(2, {'?': {'id': 'new'}})
+
+        self.assertEqual(
+            [{'op': 'add', 'path': '/applications/2',
+              'value': {'?': {'id': 'new'}}}],
+            utils.make_json_patch(src, dst))
+        self.assertEqual(
+            [{'op': 'remove', 'path': '/applications/2'}],
+            utils.make_json_patch(dst, src))
@@ -394,6 +394,35 @@ class CatalogDBTestCase(base.MuranoWithDBTestCase):
         res = api.package_search({}, self.context_admin)
         self.assertEqual(4, len(res))
 
+    def test_package_resolve(self):
+        own = api.package_upload(self._stub_package(
+            fully_qualified_name='test.App',
+            class_definitions=['test.App']), self.tenant_id)
+        api.package_upload(self._stub_package(
+            fully_qualified_name='test.App', is_public=True,
+            class_definitions=['test.App']), self.tenant_id_2)
+        public = api.package_upload(self._stub_package(
+            fully_qualified_name='test.Lib', is_public=True,
+            class_definitions=['test.Lib']), self.tenant_id_2)
+        api.package_upload(self._stub_package(
+            fully_qualified_name='test.Disabled', is_public=True,
+            enabled=False), self.tenant_id_2)
+
+        by_fqn, by_class = api.package_resolve(
+            ['test.App', 'test.Lib', 'test.Disabled', 'test.Missing'],
+            ['test.App', 'test.Lib'], self.context)
+        self.assertEqual({'test.App': own.id, 'test.Lib': public.id},
+                         {k: v.id for k, v in by_fqn.items()})
+        self.assertEqual({'test.App': own.id, 'test.Lib': public.id},
+                         {k: v.id for k, v in by_class.items()})
+
+        by_fqn, by_class = api.package_resolve(
+            ['test.App'], [], self.context_2)
+        self.assertNotEqual(own.id, by_fqn['test.App'].id)
+        self.assertEqual({}, by_class)
+
+        self.assertEqual(({}, {}), api.package_resolve([], [], self.context))
+
     def test_list_empty_categories(self):
         res = api.category_get_names()
         self.assertEqual(0, len(res))
@@ -73,7 +73,7 @@ class Runner(object):
             if item.startswith('test'):
                 return call
 
-    def __init__(self, model, package_loader, functions):
+    def __init__(self, model, package_loader, functions, profiler=None):
         if isinstance(model, six.string_types):
             model = object_model.Object(model)
         model = object_model.build_model(model)
@@ -82,12 +82,13 @@ class Runner(object):
 
         self.executor = executor.MuranoDslExecutor(
             package_loader, TestContextManager(functions),
-            execution_session.ExecutionSession())
+            execution_session.ExecutionSession(), profiler)
         self._root = self.executor.load(model)
         if self._root:
             self._root = self._root.object
         if 'ObjectsCopy' in model:
-            self.executor.object_store.cleanup()
+            self.executor.object_store.cleanup(
+                [self._root] if self._root else [])
 
     def _execute(self, name, obj, *args, **kwargs):
         try:
@@ -42,8 +42,9 @@ class DslTestCase(base.MuranoTestCase):
         self._runners = []
         eventlet.debug.hub_exceptions(False)
 
-    def new_runner(self, model):
-        r = runner.Runner(model, self.package_loader, self._functions)
+    def new_runner(self, model, profiler=None):
+        r = runner.Runner(model, self.package_loader, self._functions,
+                          profiler)
         self._runners.append(r)
         return r
 
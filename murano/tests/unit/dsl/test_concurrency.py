@@ -13,8 +13,9 @@
 #    under the License.
 
 import eventlet
+import mock
 
-
+from murano.dsl import murano_method
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -58,6 +59,22 @@ class TestConcurrency(test_case.DslTestCase):
     def test_isolated_default(self):
         self._runner.testCallIsolatedWithDefault()
         self.check_isolated_traces()
+        stats = self._runner.executor.lock_stats[
+            'TestConcurrency::isolatedWithDefault']
+        self.assertEqual(3, stats.acquisitions)
+        self.assertEqual(2, stats.contentions)
+        self.assertGreater(stats.wait_time, 0)
+
+    def test_meta_evaluated_once_per_method(self):
+        get_meta = murano_method.MuranoMethod.get_meta
+        with mock.patch.object(murano_method.MuranoMethod, 'get_meta',
+                               autospec=True,
+                               side_effect=get_meta) as mock_get_meta:
+            self._runner.testCallIsolatedWithDefault()
+            self._runner.testCallIsolatedWithDefault()
+        names = [call[0][0].name for call in mock_get_meta.call_args_list]
+        self.assertEqual(1, names.count('isolatedWithDefault'))
+        self.check_isolated_traces()
 
     def test_concurrent_explicit(self):
         self._runner.testCallConcurrentExplicit()
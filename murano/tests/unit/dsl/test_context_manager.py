@@ -12,8 +12,10 @@
 
 import mock
 
+from murano.dsl import constants
 from murano.dsl import context_manager
 from murano.dsl import yaql_integration
+from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
 
@@ -42,3 +44,48 @@ class TestContextManager(test_case.DslTestCase):
     def test_create_object_context(self):
         obj = 'obj'
         self.assertIsNone(self.context_manager.create_object_context(obj))
+
+
+class TestExecutorContexts(test_case.DslTestCase):
+    def setUp(self):
+        super(TestExecutorContexts, self).setUp()
+        self.runner = self.new_runner(om.Object('Empty'))
+        self.executor = self.runner.executor
+        self.murano_type = self.runner.root.type
+
+    def test_package_context_reused(self):
+        package = self.murano_type.package
+        self.assertIs(self.executor.create_package_context(package),
+                      self.executor.create_package_context(package))
+
+    def test_type_context_reused(self):
+        context = self.executor.create_type_context(self.murano_type)
+        self.assertIs(self.murano_type, context[constants.CTX_TYPE])
+        self.assertIs(context,
+                      self.executor.create_type_context(self.murano_type))
+
+        caller_context = yaql_integration.create_empty_context()
+        caller_context[constants.CTX_NAMES_SCOPE] = 'scope'
+        child_context = self.executor.create_type_context(
+            self.murano_type, caller_context)
+        self.assertIs(context, child_context.parent)
+        self.assertEqual('scope', child_context[constants.CTX_NAMES_SCOPE])
+        self.assertIsNone(context[constants.CTX_NAMES_SCOPE])
+
+    def test_type_context_rebuilt_on_change(self):
+        context = self.executor.create_type_context(self.murano_type)
+        self.murano_type.add_method('foo', {'Body': []})
+        new_context = self.executor.create_type_context(self.murano_type)
+        self.assertIsNot(context, new_context)
+        self.assertIs(new_context,
+                      self.executor.create_type_context(self.murano_type))
+
+    def test_call_context(self):
+        obj = self.runner.root
+        method = mock.Mock()
+        type_context = self.executor.create_type_context(self.murano_type)
+        context = self.executor._create_call_context(obj, method, None)
+        self.assertIs(type_context, context.parent)
+        self.assertIs(method, context[constants.CTX_CURRENT_METHOD])
+        self.assertIs(obj, context[constants.CTX_THIS])
+        self.assertIsNone(type_context[constants.CTX_CURRENT_METHOD])
@@ -12,10 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
 import six
 
+from murano.dsl import constants
+from murano.dsl.contracts import contracts
 from murano.dsl import dsl
 from murano.dsl import exceptions
+from murano.dsl import yaql_expression
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
 
@@ -351,3 +355,39 @@ class TestContractsTransform(test_case.DslTestCase):
         self.assertEqual('6', self._runner.testNotTypedListArgs())
         self.assertEqual('6', self._runner.testTypedList())
         self.assertEqual(2, self._runner.testListDict())
+
+
+class TestContractCompiler(test_case.DslTestCase):
+    def _compile(self, expression):
+        return contracts.Contract._compile(yaql_expression.YaqlExpression(
+            expression, constants.RUNTIME_VERSION_1_3))
+
+    def test_compile_contract_methods(self):
+        self.assertIsNotNone(self._compile('$'))
+        self.assertIsNotNone(self._compile('$.string().notNull()'))
+        self.assertIsNotNone(self._compile('$.int().check($ > 0)'))
+        self.assertIsNotNone(self._compile(
+            '$.class(res:Instance, res:LinuxInstance)'))
+
+    def test_compile_falls_back_to_yaql(self):
+        self.assertIsNone(self._compile('len($) > 0'))
+        self.assertIsNone(self._compile('$.string().toUpper()'))
+        self.assertIsNone(self._compile('$.string(1)'))
+        self.assertIsNone(self._compile(
+            '$.template(Node, excludeProperties => [nodes])'))
+
+    def test_compiled_contract(self):
+        compiled = self._compile('$.int().notNull()')
+        context = contracts.Contract._prepare_transform_context(
+            constants.RUNTIME_VERSION_1_3, True).create_child_context()
+        self.assertEqual(123, compiled('123', context))
+        self.assertRaises(exceptions.ContractViolationException,
+                          compiled, None, context)
+
+    def test_compiled_once(self):
+        runner = self.new_runner(om.Object('ContractExamples'))
+        with mock.patch.object(contracts.Contract, '_compile',
+                               wraps=contracts.Contract._compile) as compile:
+            runner.testStringContract('a')
+            runner.testStringContract('b')
+        self.assertEqual(1, compile.call_count)
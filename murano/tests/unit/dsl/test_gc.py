@@ -12,7 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from murano.dsl import exceptions
+from murano.dsl import helpers
 from murano.dsl.principal_objects import garbage_collector
 from murano.tests.unit.dsl.foundation import object_model as om
 from murano.tests.unit.dsl.foundation import test_case
@@ -48,6 +51,59 @@ class TestGC(test_case.DslTestCase):
         self.assertItemsEqual(['node1', 'node2'], self.traces[:2])
         self.assertEqual('root', self.traces[-1])
 
+    @mock.patch('murano.dsl.object_store.gc')
+    def test_model_objects_destroyed_without_gc(self, mock_gc):
+        model = om.Object(
+            'TestGCNode', 'root',
+            value='root',
+            nodes=[om.Object('TestGCNode', 'node1', value='node1')]
+        )
+        model_copy = om.Object(
+            'TestGCNode', 'root',
+            value='root',
+            nodes=[
+                om.Object('TestGCNode', 'node1', value='node1'),
+                om.Object(
+                    'TestGCNode', 'node2',
+                    value='node2',
+                    nodes=[om.Object('TestGCNode', 'node3', value='node3')]
+                )
+            ]
+        )
+        self.new_runner({'Objects': model, 'ObjectsCopy': model_copy})
+        self.assertEqual(['node3', 'node2'], self.traces)
+        self.assertFalse(mock_gc.collect.called)
+
+    @mock.patch('murano.dsl.object_store.gc.collect')
+    def test_object_held_by_extension_not_destroyed(self, mock_collect):
+        class Helper(object):
+            __slots__ = ['objects']
+
+        class Extension(object):
+            def __init__(self, obj):
+                self.helper = Helper()
+                self.helper.objects = (obj,)
+
+        runner = self.new_runner(om.Object(
+            'TestGCNode', 'root',
+            value='root',
+            nodes=[om.Object('TestGCNode', 'node1', value='node1')]
+        ))
+        root = runner.root
+        store = runner.executor.object_store
+        for part in helpers.traverse(root, lambda t: t._parents.values()):
+            if 'nodes' in part._properties:
+                part._properties['nodes'] = []
+        root._extension = Extension(store.get('node1'))
+
+        store.cleanup([root])
+        self.assertEqual([], self.traces)
+
+        root._extension = None
+        store.cleanup([root])
+        self.assertEqual(['node1'], self.traces)
+        self.assertFalse(mock_collect.called)
+
     def test_collect_from_code(self):
         self.runner.testObjectsCollect()
         self.assertEqual(['B', 'A'], self.traces)
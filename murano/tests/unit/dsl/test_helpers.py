@@ -413,3 +413,22 @@ class TestParseVersionSpec(base.MuranoTestCase):
         version_spec = semantic_version.Spec('<=1', '<=1.11')
         expected = semantic_version.Spec('<1.12.0-0', '<2.0.0-0')
         self.check(expected, version_spec)
+
+
+class TestLruCache(base.MuranoTestCase):
+    def test_eviction_order(self):
+        cache = helpers.LruCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(1, cache.get('a'))
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_disabled_cache(self):
+        cache = helpers.LruCache(0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, len(cache))
@@ -0,0 +1,99 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import eventlet.event
+
+from murano.dsl import lock_table
+from murano.tests.unit import base
+
+
+class TestLockTable(base.MuranoTestCase):
+    def setUp(self):
+        super(TestLockTable, self).setUp()
+        self.table = lock_table.LockTable()
+        self.traces = []
+
+    def _locked(self, name, value, event=None):
+        with self.table.acquire('scope', value, name, 'method'):
+            self.traces.append(name + '-before')
+            if event is None:
+                eventlet.sleep(0)
+            else:
+                event.wait()
+            self.traces.append(name + '-after')
+
+    def test_canonize(self):
+        self.assertEqual(lock_table.canonize({'a': [1, {2: 3}]}),
+                         lock_table.canonize({'a': [1, {2: 3}]}))
+        self.assertNotEqual(lock_table.canonize([1, 2]),
+                            lock_table.canonize((1, 2)))
+        self.assertRaises(TypeError, lock_table.canonize, bytearray())
+
+    def test_waiters_queue(self):
+        event = eventlet.event.Event()
+        pool = eventlet.GreenPool()
+        pool.spawn(self._locked, 't1', {'arg': [1]}, event)
+        pool.spawn(self._locked, 't2', {'arg': [1]})
+        pool.spawn(self._locked, 't3', {'arg': [1]})
+        eventlet.sleep(0)
+        event.send()
+        pool.waitall()
+
+        self.assertEqual(['t1-before', 't1-after', 't2-before', 't2-after',
+                          't3-before', 't3-after'], self.traces)
+        self.assertEqual(0, len(self.table))
+        stats = self.table.stats['method']
+        self.assertEqual(3, stats.acquisitions)
+        self.assertEqual(2, stats.contentions)
+        self.assertGreaterEqual(stats.wait_time, stats.max_wait_time)
+
+    def test_different_values(self):
+        pool = eventlet.GreenPool()
+        pool.spawn(self._locked, 't1', {'arg': 1})
+        pool.spawn(self._locked, 't2', {'arg': 2})
+        pool.waitall()
+
+        self.assertEqual(['t1-before', 't2-before', 't1-after', 't2-after'],
+                         self.traces)
+        self.assertEqual(0, self.table.stats['method'].contentions)
+
+    def test_unhashable_values(self):
+        pool = eventlet.GreenPool()
+        pool.spawn(self._locked, 't1', {'arg': bytearray(b'1')})
+        pool.spawn(self._locked, 't2', {'arg': bytearray(b'1')})
+        pool.spawn(self._locked, 't3', {'arg': bytearray(b'2')})
+        pool.waitall()
+
+        self.assertEqual(['t1-before', 't3-before', 't1-after', 't3-after',
+                          't2-before', 't2-after'], self.traces)
+        self.assertEqual(0, len(self.table))
+
+    def test_reentrant(self):
+        with self.table.acquire('scope', 1, 't1'):
+            with self.table.acquire('scope', 1, 't1'):
+                self.assertEqual(1, len(self.table))
+            self.assertEqual(1, len(self.table))
+        self.assertEqual(0, len(self.table))
+
+    def test_killed_waiter(self):
+        event = eventlet.event.Event()
+        owner = eventlet.spawn(self._locked, 't1', 1, event)
+        eventlet.sleep(0)
+        waiter = eventlet.spawn(self._locked, 't2', 1)
+        eventlet.sleep(0)
+        waiter.kill()
+        event.send()
+        owner.wait()
+
+        self.assertEqual(['t1-before', 't1-after'], self.traces)
+        self.assertEqual(0, len(self.table))
@@ -0,0 +1,71 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import six
+
+from murano.dsl import profiler
+from murano.tests.unit.dsl.foundation import object_model as om
+from murano.tests.unit.dsl.foundation import test_case
+
+
+class TestProfiler(test_case.DslTestCase):
+    def setUp(self):
+        super(TestProfiler, self).setUp()
+        self.profiler = profiler.Profiler()
+        self.profiler.start()
+        self.addCleanup(self.profiler.stop)
+
+    def test_method_calls(self):
+        runner = self.new_runner(om.Object('TestProfiler'), self.profiler)
+        runner.testCalls()
+
+        stats = self.profiler.stats
+        self.assertEqual(1, stats['TestProfiler::testCalls'].calls)
+        self.assertEqual(3, stats['TestProfiler::inner'].calls)
+        self.assertEqual(3, stats['TestProfiler::leaf'].calls)
+        for item in six.itervalues(stats):
+            self.assertGreaterEqual(item.inclusive, item.exclusive)
+            self.assertGreaterEqual(item.exclusive, 0)
+        self.assertTrue(any(name.startswith('yaql TestProfiler.yaml:')
+                            for name in stats))
+
+        stream = six.StringIO()
+        self.profiler.write_collapsed_stacks(stream)
+        paths = [line.rsplit(' ', 1)[0]
+                 for line in stream.getvalue().splitlines()]
+        leaf_paths = [path.split(';') for path in paths
+                      if path.endswith('TestProfiler::leaf')]
+        self.assertTrue(leaf_paths)
+        for path in leaf_paths:
+            # calls from the Parallel block threads have full paths too
+            self.assertEqual('TestProfiler::testCalls', path[0])
+            self.assertIn('TestProfiler::inner', path)
+
+    def test_wait_time(self):
+        self.profiler.enter('Test::outer')
+        self.profiler.enter('Test::inner')
+        eventlet.sleep(0.01)
+        self.profiler.exit()
+        self.profiler.exit()
+
+        stats = self.profiler.stats
+        self.assertGreaterEqual(stats['Test::inner'].wait, 0.005)
+        self.assertEqual(stats['Test::inner'].wait, stats['Test::outer'].wait)
+        stream = six.StringIO()
+        self.profiler.write_collapsed_stacks(stream)
+        self.assertIn('Test::outer;Test::inner;[wait] ', stream.getvalue())
+        self.assertNotIn('Test::outer;[wait] ', stream.getvalue())
+
+        stream = six.StringIO()
+        self.profiler.write_stats(stream)
+        self.assertEqual(3, len(stream.getvalue().splitlines()))
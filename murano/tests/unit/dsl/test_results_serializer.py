@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
 import six
 from testtools import matchers
 
@@ -78,6 +79,38 @@ class TestResultsSerializer(test_case.DslTestCase):
         self._test_data_in_section('Objects', serialized)
         self._test_data_in_section('ObjectsCopy', serialized)
 
+    def test_references_serialized_in_single_pass(self):
+        runner = self.new_runner(om.Object(
+            'TestObjectsCopyMergeSampleClass', 'rootNode',
+            value='node1',
+            nodes=[
+                om.Object('TestObjectsCopyMergeSampleClass', 'node2',
+                          value='node2',
+                          nodes=[om.Ref('rootNode'), om.Ref('node2')])
+            ]))
+
+        with mock.patch.object(serializer, '_pass3_serialize') as mock_pass3:
+            serialized = runner.serialized_model['Objects']
+
+        mock_pass3.assert_not_called()
+        self.assertEqual('node2', serialized['nodes'][0]['?']['id'])
+        self.assertEqual(['rootNode', 'node2'],
+                         serialized['nodes'][0]['nodes'])
+
+    def test_objects_copy_has_no_designer_data(self):
+        serialized = self._runner.serialized_model
+        objects = serialized['Objects']
+        objects_copy = serialized['ObjectsCopy']
+        self.assertIn('_actions', objects['?'])
+        self.assertNotIn('_actions', objects_copy['?'])
+        self.assertNotIn('_actions', objects_copy['sampleClass']['?'])
+        del objects['?']['_actions']
+        del objects['sampleClass']['?']['_actions']
+        del objects['sampleClass']['classProperty']['?']['_actions']
+        self.assertEqual(objects, objects_copy)
+        self.assertIsNot(objects['sampleClass']['arbitraryProperty'],
+                         objects_copy['sampleClass']['arbitraryProperty'])
+
     def test_actions(self):
         """Test that information on actions can be invoked
 
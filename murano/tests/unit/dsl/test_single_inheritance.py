@@ -32,3 +32,29 @@ class TestSingleInheritance(test_case.DslTestCase):
              'SingleInheritanceChild::method2',
              'SingleInheritanceParent::method2'],
             self.traces)
+
+    def test_symbol_lookup_cached(self):
+        child = self._runner.root.type
+        method = child.find_single_method('method1')
+        self.assertIs(method, child.find_single_method('method1'))
+        self.assertEqual([method], child.find_method('method1'))
+        self.assertIs(child.all_method_names, child.all_method_names)
+
+    def test_symbol_lookup_invalidated(self):
+        child = self._runner.root.type
+        parent = child.parents[0]
+        self.assertEqual([], child.find_method('method3'))
+        self.assertNotIn('method3', child.all_method_names)
+
+        method = parent.add_method('method3', {'Body': []})
+        self.assertIs(method, child.find_single_method('method3'))
+        self.assertIn('method3', child.all_method_names)
+
+    def test_symbol_lookup_not_invalidated_by_descendants(self):
+        child = self._runner.root.type
+        parent = child.parents[0]
+        names = parent.all_method_names
+
+        child.add_method('method3', {'Body': []})
+        self.assertIs(names, parent.all_method_names)
+        self.assertIn('method3', child.all_method_names)
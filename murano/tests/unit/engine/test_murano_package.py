@@ -0,0 +1,80 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+
+from murano.engine import murano_package
+from murano.tests.unit import base
+
+
+class TestClassConfig(base.MuranoTestCase):
+    def setUp(self):
+        super(TestClassConfig, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.override_config('class_configs', self.location, 'engine')
+        murano_package.CLASS_CONFIGS_CACHE.clear()
+        self.addCleanup(murano_package.CLASS_CONFIGS_CACHE.clear)
+
+        app_package = mock.Mock(
+            full_name='test.package', version='1.2.3',
+            runtime_version='1.4', requirements={}, meta=None)
+        self.loader = mock.Mock()
+        self.package = murano_package.MuranoPackage(self.loader, app_package)
+
+    def _write_config(self, file_name, config, mtime=None):
+        path = os.path.join(self.location, file_name)
+        with open(path, 'w') as f:
+            json.dump(config, f)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def _get_config(self):
+        with mock.patch.object(
+                self.package, '_find_class_config',
+                wraps=self.package._find_class_config) as find_mock:
+            config = self.package.get_class_config('test.Class')
+        return config, find_mock.call_count
+
+    def test_config_cached(self):
+        self._write_config('test.Class-1.2.json', {'a': 1})
+        self.assertEqual(({'a': 1}, 1), self._get_config())
+        config, calls = self._get_config()
+        self.assertEqual(({'a': 1}, 0), (config, calls))
+
+        config['a'] = 2
+        self.assertEqual(({'a': 1}, 0), self._get_config())
+
+    def test_missing_config_cached(self):
+        self.assertEqual(({}, 1), self._get_config())
+        self.assertEqual(({}, 0), self._get_config())
+
+    def test_config_changed(self):
+        self._write_config('test.Class-1.2.json', {'a': 1}, 1000)
+        self.assertEqual(({'a': 1}, 1), self._get_config())
+
+        self._write_config('test.Class-1.2.json', {'a': 2}, 2000)
+        self.assertEqual(({'a': 2}, 1), self._get_config())
+
+    def test_config_added(self):
+        os.utime(self.location, (1000, 1000))
+        self.assertEqual(({}, 1), self._get_config())
+
+        self._write_config('test.Class-1.2.3.json', {'a': 3})
+        os.utime(self.location, (2000, 2000))
+        self.assertEqual(({'a': 3}, 1), self._get_config())
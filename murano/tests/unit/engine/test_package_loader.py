@@ -14,13 +14,16 @@
 #    under the License.
 
 import collections
+import email.message
 from muranoclient.common import exceptions as muranoclient_exc
+from muranoclient.v1 import packages as muranoclient_packages
 import os
 import shutil
 import tempfile
 
 import mock
 import semantic_version
+from six.moves.urllib import request as urllib_request
 import testtools
 
 from murano.dsl import exceptions as dsl_exceptions
@@ -41,6 +44,7 @@ class TestPackageCache(base.MuranoTestCase):
         self.override_config('packages_cache', self.location, 'engine')
 
         self._patch_loader_client()
+        self.addCleanup(mock.patch.stopall)
         self.loader = package_loader.ApiPackageLoader(None)
 
     def tearDown(self):
@@ -479,6 +483,204 @@ class TestPackageCache(base.MuranoTestCase):
                                     expected_error_msg):
             self.loader._get_package_by_definition(package)
 
+    def _stream_package(self, package_data, content_length=None,
+                        content_encoding=None):
+        api = mock.MagicMock()
+        response = api.request.return_value
+        response.status_code = 200
+        response.headers = {'content-length': str(
+            len(package_data) if content_length is None else content_length)}
+        if content_encoding:
+            response.headers['content-encoding'] = content_encoding
+        response.iter_content.return_value = [
+            package_data[:100], package_data[100:]]
+        self.murano_client.packages = muranoclient_packages.PackageManager(
+            api)
+        return api
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_get_package_by_definition_streamed(self):
+        path, _ = utils.compose_package(
+            'test', self.location, archive_dir=self.location)
+        with open(path, 'rb') as f:
+            package_data = f.read()
+        api = self._stream_package(package_data)
+        existing_files = set(os.listdir(self.location))
+
+        package = mock.MagicMock()
+        package.fully_qualified_name = 'io.murano.apps.test'
+        package.id = '123'
+        package.version = '0.0.1'
+
+        app_package = self.loader._get_package_by_definition(package)
+        self.assertEqual('io.murano.apps.test', app_package.full_name)
+        api.request.assert_called_once_with(
+            '/v1/catalog/packages/123/download', 'GET',
+            log=False, stream=True)
+        self.assertEqual(
+            {'io.murano.apps.test', '123_download.lock'},
+            set(os.listdir(self.location)) - existing_files)
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_get_package_by_definition_incomplete_download(self):
+        path, _ = utils.compose_package(
+            'test', self.location, archive_dir=self.location)
+        with open(path, 'rb') as f:
+            package_data = f.read()
+        self._stream_package(package_data, len(package_data) + 1)
+
+        package = mock.MagicMock()
+        package.fully_qualified_name = 'io.murano.apps.test'
+        package.id = '123'
+        package.version = '0.0.1'
+
+        expected_error_msg = 'Unable to extract package data for {0}'\
+                             .format(package.id)
+        with self.assertRaisesRegex(pkg_exc.PackageLoadError,
+                                    expected_error_msg):
+            self.loader._get_package_by_definition(package)
+        self.assertFalse(os.path.exists(os.path.join(
+            self.location, 'io.murano.apps.test')))
+
+    @testtools.skipIf(os.name == 'nt', "Doesn't work on Windows")
+    def test_get_package_by_definition_encoded_download(self):
+        path, _ = utils.compose_package(
+            'test', self.location, archive_dir=self.location)
+        with open(path, 'rb') as f:
+            package_data = f.read()
+        self._stream_package(package_data, len(package_data) // 2, 'gzip')
+
+        package = mock.MagicMock()
+        package.fully_qualified_name = 'io.murano.apps.test'
+        package.id = '123'
+        package.version = '0.0.1'
+
+        app_package = self.loader._get_package_by_definition(package)
+        self.assertEqual('io.murano.apps.test', app_package.full_name)
+
+    @mock.patch.object(package_loader, 'HTTP_SESSION', None)
+    def test_http_session_does_not_store_cookies(self):
+        session = package_loader.get_http_session()
+        request = urllib_request.Request('http://murano.example.com/v1')
+        headers = email.message.Message()
+        headers['Set-Cookie'] = 'session=tenant1; Path=/'
+        response = mock.Mock()
+        response.info.return_value = headers
+
+        session.cookies.extract_cookies(response, request)
+
+        self.assertEqual(0, len(session.cookies))
+
+    @mock.patch('murano.engine.package_loader.auth_utils')
+    def test_glare_token_refreshed_in_place(self, mock_auth_utils):
+        self._unpatch_loader_client()
+        self.override_config('packages_service', 'glare', group='engine')
+        session = mock_auth_utils.get_client_session.return_value
+        session.auth.get_token.return_value = 'token1'
+        session.get_endpoint.return_value = 'test_endpoint/v3'
+        mock_auth_utils.get_session_client_parameters.return_value = {
+            'endpoint': 'test_endpoint/v3'}
+
+        client = self.loader.client
+        glare = self.loader._glare_client
+        self.assertIs(package_loader.get_http_session(), session.session)
+
+        session.auth.get_token.return_value = 'token2'
+        self.assertIs(client, self.loader.client)
+        self.assertIs(glare, self.loader._glare_client)
+        self.assertEqual('token2', glare.http_client.auth_token)
+        self.assertEqual(2, mock_auth_utils.get_client_session.call_count)
+
+    @mock.patch.object(package_loader.ApiPackageLoader,
+                       '_get_package_by_definition')
+    def test_prefetch_requirements(self, mock_get_package):
+        api = mock.MagicMock()
+        api.json_request.return_value = (mock.Mock(), {'packages': [
+            {'id': '123', 'fully_qualified_name': 'io.murano.apps.dep'},
+            None]})
+        self.murano_client.packages = muranoclient_packages.PackageManager(
+            api)
+        mock_get_package.return_value = mock.Mock(requirements={})
+        app_package = mock.Mock(requirements=collections.OrderedDict([
+            ('io.murano.apps.dep', '>=0.0.1'),
+            ('io.murano.apps.missing', '')]))
+
+        self.loader._prefetch_requirements(app_package)
+        api.json_request.assert_called_once_with(
+            '/v1/catalog/packages/resolve', 'POST',
+            data={'packages': [{'fqn': 'io.murano.apps.dep'},
+                               {'fqn': 'io.murano.apps.missing'}]})
+        mock_get_package.assert_called_once_with(mock.ANY)
+        self.assertEqual('123', mock_get_package.call_args[0][0].id)
+
+        package_definition = self.loader._get_definition(
+            {'fqn': 'io.murano.apps.dep', 'version': '>=0.0.1'})
+        self.assertEqual('123', package_definition.id)
+        self.assertRaises(LookupError, self.loader._get_definition,
+                          {'fqn': 'io.murano.apps.missing'})
+        api.get.assert_not_called()
+
+        # already resolved requirements are not requested again
+        self.loader._prefetch_requirements(app_package)
+        api.json_request.assert_called_once_with(
+            '/v1/catalog/packages/resolve', 'POST', data=mock.ANY)
+
+    def test_prefetch_requirements_not_supported(self):
+        api = mock.MagicMock()
+        api.json_request.side_effect = muranoclient_exc.HTTPNotFound
+        self.murano_client.packages = muranoclient_packages.PackageManager(
+            api)
+        app_package = mock.Mock(requirements={'io.murano.apps.dep': ''})
+
+        self.loader._prefetch_requirements(app_package)
+        self.loader._prefetch_requirements(
+            mock.Mock(requirements={'io.murano.apps.other': ''}))
+        self.assertEqual(1, api.json_request.call_count)
+        self.assertEqual({}, self.loader._resolved_definitions)
+
+    def test_prefetch_requirements_chunked(self):
+        self.override_config('api_limit_max', 1, group='murano')
+        api = mock.MagicMock()
+        api.json_request.side_effect = [
+            (mock.Mock(), {'packages': [None]}),
+            (mock.Mock(), {'packages': [None]})]
+        self.murano_client.packages = muranoclient_packages.PackageManager(
+            api)
+        app_package = mock.Mock(requirements=collections.OrderedDict([
+            ('io.murano.apps.dep1', ''), ('io.murano.apps.dep2', '')]))
+
+        self.loader._prefetch_requirements(app_package)
+        api.json_request.assert_has_calls([
+            mock.call('/v1/catalog/packages/resolve', 'POST',
+                      data={'packages': [{'fqn': 'io.murano.apps.dep1'}]}),
+            mock.call('/v1/catalog/packages/resolve', 'POST',
+                      data={'packages': [{'fqn': 'io.murano.apps.dep2'}]})])
+        self.assertEqual(
+            {('fqn', 'io.murano.apps.dep1'): None,
+             ('fqn', 'io.murano.apps.dep2'): None},
+            self.loader._resolved_definitions)
+
+    @mock.patch.object(package_loader, 'LOG')
+    def test_prefetch_requirements_failed(self, mock_log):
+        api = mock.MagicMock()
+        api.json_request.side_effect = [
+            muranoclient_exc.HTTPBadRequest,
+            (mock.Mock(), {'packages': [None]})]
+        self.murano_client.packages = muranoclient_packages.PackageManager(
+            api)
+
+        self.loader._prefetch_requirements(
+            mock.Mock(requirements={'io.murano.apps.dep': ''}))
+        self.assertEqual({}, self.loader._resolved_definitions)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+        # only the failed request falls back to per-package queries
+        self.loader._prefetch_requirements(
+            mock.Mock(requirements={'io.murano.apps.other': ''}))
+        self.assertEqual(2, api.json_request.call_count)
+        self.assertEqual({('fqn', 'io.murano.apps.other'): None},
+                         self.loader._resolved_definitions)
+
     def test_try_cleanup_cache_with_null_package_directory(self):
         # Test null package directory causes early return.
         result = self.loader.try_cleanup_cache(None, None)
@@ -512,6 +714,84 @@ class TestPackageCache(base.MuranoTestCase):
                       str(mock_log.warning.mock_calls[0]))
 
 
+class TestPackagesCacheManager(base.MuranoTestCase):
+    def setUp(self):
+        super(TestPackagesCacheManager, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.override_config('packages_cache', self.location, 'engine')
+        self.manager = package_loader.PackagesCacheManager(self.location)
+
+    def _add_package(self, fqn, package_id, size, mtime):
+        path = os.path.join(self.location, fqn, '1.0.0', package_id)
+        os.makedirs(path)
+        with open(os.path.join(path, 'manifest.yaml'), 'wb') as f:
+            f.write(b'0' * size)
+        for lock_type in ('usage', 'download'):
+            open(os.path.join(self.location, '{}_{}.lock'.format(
+                package_id, lock_type)), 'w').close()
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_no_budget(self):
+        self._add_package('io.murano.a', 'a1', 10, 100)
+        self.assertEqual(0, self.manager.enforce_quota())
+        self.assertEqual(0, self.manager.evictions)
+
+    def test_evict_by_entries(self):
+        self.override_config('packages_cache_max_entries', 2, 'engine')
+        oldest = self._add_package('io.murano.a', 'a1', 10, 100)
+        self._add_package('io.murano.b', 'b1', 10, 300)
+        self._add_package('io.murano.c', 'c1', 10, 200)
+
+        self.assertEqual(1, self.manager.enforce_quota())
+        self.assertFalse(os.path.exists(oldest))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.location, 'io.murano.a')))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.location, 'a1_usage.lock')))
+        self.assertEqual(['io.murano.b', 'io.murano.c'], sorted(
+            name for name in os.listdir(self.location)
+            if not name.endswith('.lock')))
+        self.assertEqual(1, self.manager.evictions)
+
+    def test_evict_by_size(self):
+        self.override_config('packages_cache_max_size', 1, 'engine')
+        first = self._add_package('io.murano.a', 'a1', 400 * 1024, 100)
+        second = self._add_package('io.murano.a', 'a2', 400 * 1024, 200)
+        third = self._add_package('io.murano.b', 'b1', 400 * 1024, 300)
+
+        self.assertEqual(1, self.manager.enforce_quota())
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+
+    def test_packages_in_use_not_evicted(self):
+        self.override_config('packages_cache_max_entries', 1, 'engine')
+        in_use = self._add_package('io.murano.a', 'a1', 10, 100)
+        kept = self._add_package('io.murano.b', 'b1', 10, 200)
+        evicted = self._add_package('io.murano.c', 'c1', 10, 300)
+
+        with package_loader.usage_mem_locks['a1'].read_lock():
+            self.assertEqual(1, self.manager.enforce_quota(keep='b1'))
+        self.assertTrue(os.path.exists(in_use))
+        self.assertTrue(os.path.exists(kept))
+        self.assertFalse(os.path.exists(evicted))
+
+    def test_record_hit(self):
+        self.override_config('packages_cache_max_entries', 1, 'engine')
+        used = self._add_package('io.murano.a', 'a1', 10, 100)
+        unused = self._add_package('io.murano.b', 'b1', 10, 200)
+
+        self.manager.record_hit(used)
+        self.manager.record_miss()
+        self.manager.enforce_quota()
+        self.assertTrue(os.path.exists(used))
+        self.assertFalse(os.path.exists(unused))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 1},
+                         self.manager.statistics)
+
+
 class TestCombinedPackageLoader(base.MuranoTestCase):
 
     def setUp(self):
@@ -633,3 +913,142 @@ class TestCombinedPackageLoader(base.MuranoTestCase):
 
         self.assertEqual(sorted(expected_table.items()),
                          sorted(table.items()))
+
+
+class TestClassDefinitionsCache(base.MuranoTestCase):
+
+    def setUp(self):
+        super(TestClassDefinitionsCache, self).setUp()
+        self.addCleanup(setattr, package_loader,
+                        'CLASS_DEFINITIONS_CACHE', None)
+        package_loader.CLASS_DEFINITIONS_CACHE = None
+
+        self.package = mock.MagicMock()
+        self.package.full_name = 'test.package'
+        self.package.version = semantic_version.Version('1.0.0')
+        self.package.runtime_version = semantic_version.Version('1.4.0')
+        self.package.get_class.return_value = (
+            'Name: test.Class', 'test.yaml')
+
+    def test_definition_reused(self):
+        first = package_loader.get_class(self.package, 'test.Class', 'id1')
+        second = package_loader.get_class(self.package, 'test.Class', 'id1')
+        self.assertIs(first, second)
+        self.package.get_class.assert_called_once_with('test.Class')
+
+    def test_package_id_change_invalidates(self):
+        first = package_loader.get_class(self.package, 'test.Class', 'id1')
+        second = package_loader.get_class(self.package, 'test.Class', 'id2')
+        self.assertIsNot(first, second)
+        self.assertEqual(2, self.package.get_class.call_count)
+
+    def test_no_package_id_not_cached(self):
+        package_loader.get_class(self.package, 'test.Class')
+        package_loader.get_class(self.package, 'test.Class')
+        self.assertEqual(2, self.package.get_class.call_count)
+
+    def test_invalidate_class_definitions(self):
+        package_loader.get_class(self.package, 'test.Class', 'id1')
+        package_loader.invalidate_class_definitions('test.package')
+        package_loader.get_class(self.package, 'test.Class', 'id1')
+        self.assertEqual(2, self.package.get_class.call_count)
+
+    def _persist_class(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.package.source_directory = location
+        self.package.get_class.return_value = (
+            b'Name: test.Class\n'
+            b'Methods:\n'
+            b'  foo:\n'
+            b'    Body:\n'
+            b'      - Return: $.bar.baz()\n', 'test.yaml')
+        original = package_loader.get_class(
+            self.package, 'test.Class', 'id1', persist=True)
+        package_loader.CLASS_DEFINITIONS_CACHE.clear()
+        return original
+
+    def test_persisted_definition_restored(self):
+        original = self._persist_class()
+
+        with mock.patch('murano.engine.package_loader.yaql_yaml_loader.'
+                        'get_loader') as mock_get_loader:
+            restored = package_loader.get_class(
+                self.package, 'test.Class', 'id1', persist=True)
+            self.assertFalse(mock_get_loader.called)
+
+        self.assertEqual(str(original), str(restored))
+        expr = restored[0]['Methods']['foo']['Body'][0]['Return']
+        self.assertEqual('$.bar.baz()', expr.expression)
+        self.assertEqual(5, expr.source_file_position.start_line)
+        self.assertEqual('test.yaml', expr.source_file_position.file_path)
+        self.assertEqual(
+            1, restored[0].source_file_position.start_line)
+
+    def test_persisted_definition_validated(self):
+        self._persist_class()
+        self.package.get_class.return_value = (
+            b'Name: test.Class2\n', 'test.yaml')
+
+        restored = package_loader.get_class(
+            self.package, 'test.Class', 'id1', persist=True)
+        self.assertEqual('test.Class2', restored[0]['Name'])
+
+        package_loader.CLASS_DEFINITIONS_CACHE.clear()
+        restored = package_loader.get_class(
+            self.package, 'test.Class', 'id2', persist=True)
+        self.assertEqual('test.Class2', restored[0]['Name'])
+
+
+class TestDirectoryPackageLoaderIndex(base.MuranoTestCase):
+
+    def setUp(self):
+        super(TestDirectoryPackageLoaderIndex, self).setUp()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.addCleanup(package_loader.LOCAL_PACKAGES_INDEX.clear)
+        package_loader.LOCAL_PACKAGES_INDEX.clear()
+
+        self.package_dir = os.path.join(self.location, 'test.package')
+        os.makedirs(os.path.join(self.package_dir, 'Classes'))
+        with open(os.path.join(self.package_dir, 'manifest.yaml'), 'w') as f:
+            f.write('Format: 1.4\n'
+                    'Type: Library\n'
+                    'FullName: test.package\n'
+                    'Classes:\n'
+                    '  test.Class: Class.yaml\n')
+        self.class_file = os.path.join(
+            self.package_dir, 'Classes', 'Class.yaml')
+        with open(self.class_file, 'w') as f:
+            f.write('Name: test.Class\n')
+
+    @mock.patch('murano.engine.package_loader.load_utils.load_from_dir',
+                wraps=package_loader.load_utils.load_from_dir)
+    def test_unchanged_package_not_reloaded(self, mock_load_from_dir):
+        package_loader.DirectoryPackageLoader(self.location)
+        loader = package_loader.DirectoryPackageLoader(self.location)
+
+        mock_load_from_dir.assert_called_once_with(self.package_dir)
+        self.assertEqual(['test.package'],
+                         [p.name for p in loader.packages])
+
+    @mock.patch('murano.engine.package_loader.load_utils.load_from_dir',
+                wraps=package_loader.load_utils.load_from_dir)
+    def test_changed_package_reloaded(self, mock_load_from_dir):
+        package_loader.DirectoryPackageLoader(self.location)
+        mtime = os.path.getmtime(self.class_file) + 10
+        os.utime(self.class_file, (mtime, mtime))
+        package_loader.DirectoryPackageLoader(self.location)
+
+        self.assertEqual(2, mock_load_from_dir.call_count)
+
+    def test_removed_package_pruned(self):
+        package_loader.DirectoryPackageLoader(self.location)
+        self.assertIn(self.package_dir, package_loader.LOCAL_PACKAGES_INDEX)
+
+        shutil.rmtree(self.package_dir)
+        loader = package_loader.DirectoryPackageLoader(self.location)
+
+        self.assertNotIn(self.package_dir,
+                         package_loader.LOCAL_PACKAGES_INDEX)
+        self.assertEqual([], list(loader.packages))
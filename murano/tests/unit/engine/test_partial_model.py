@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+from murano.engine import partial_model
+from murano.tests.unit import base
+
+
+def _obj(object_id, **kwargs):
+    kwargs['?'] = {'id': object_id, 'type': 'test.Class'}
+    return kwargs
+
+
+def _ids(values):
+    return [partial_model.get_object_id(t) for t in values]
+
+
+class TestPartialModel(base.MuranoTestCase):
+    def setUp(self):
+        super(TestPartialModel, self).setUp()
+        self.objects = _obj(
+            'env',
+            defaultNetworks={'environment': _obj('net')},
+            applications=[
+                _obj('app1', instance=_obj('instance1'),
+                     servers=[_obj('server1'), _obj('server2')]),
+                _obj('app2', database='app3'),
+                _obj('app3'),
+                _obj('app4', environment='env')
+            ])
+        self.model = {
+            'Objects': self.objects,
+            'ObjectsCopy': copy.deepcopy(self.objects),
+            'Attributes': [
+                ['app1', 'test.Class', 'key', 'value1'],
+                ['app2', 'test.Class', 'key', 'value2']
+            ]
+        }
+
+    def test_load_referenced_objects(self):
+        partial = partial_model.PartialModel(self.model, ['app2'])
+
+        self.assertFalse(partial.complete)
+        objects = partial.model['Objects']
+        self.assertEqual(['app2', 'app3'], _ids(objects['applications']))
+        self.assertEqual(
+            'net', partial_model.get_object_id(
+                objects['defaultNetworks']['environment']))
+        self.assertEqual(
+            ['app2', 'app3'],
+            _ids(partial.model['ObjectsCopy']['applications']))
+        self.assertEqual([['app2', 'test.Class', 'key', 'value2']],
+                         partial.model['Attributes'])
+        self.assertEqual(4, len(self.objects['applications']))
+
+    def test_load_owners(self):
+        partial = partial_model.PartialModel(self.model, ['server2'])
+
+        applications = partial.model['Objects']['applications']
+        self.assertEqual(['app1'], _ids(applications))
+        self.assertEqual('instance1', partial_model.get_object_id(
+            applications[0]['instance']))
+        self.assertEqual(['server2'], _ids(applications[0]['servers']))
+
+    def test_load_objects_to_destroy(self):
+        del self.objects['applications'][2]
+        partial = partial_model.PartialModel(self.model, ['app4'])
+
+        self.assertEqual(
+            ['app4'], _ids(partial.model['Objects']['applications']))
+        self.assertEqual(
+            ['app3', 'app4'],
+            _ids(partial.model['ObjectsCopy']['applications']))
+
+    def test_unknown_object(self):
+        partial = partial_model.PartialModel(self.model, ['unknown'])
+
+        self.assertTrue(partial.complete)
+        self.assertEqual(self.model, partial.model)
+
+    def test_restore(self):
+        partial = partial_model.PartialModel(self.model, ['server2'])
+        result = copy.deepcopy(partial.model)
+        result['Objects']['applications'][0]['servers'].append(
+            _obj('server3'))
+        result['ObjectsCopy'] = copy.deepcopy(result['Objects'])
+
+        result = partial.restore(result)
+
+        for key in ('Objects', 'ObjectsCopy'):
+            applications = result[key]['applications']
+            self.assertEqual(['app1', 'app2', 'app3', 'app4'],
+                             _ids(applications))
+            self.assertEqual(['server1', 'server2', 'server3'],
+                             _ids(applications[0]['servers']))
+            self.assertIs(self.objects['applications'][1]
+                          if key == 'Objects' else
+                          self.model['ObjectsCopy']['applications'][1],
+                          applications[1])
+        self.assertEqual(self.model['Attributes'], result['Attributes'])
+
+    def test_restore_removed_owner(self):
+        partial = partial_model.PartialModel(self.model, ['server2'])
+        result = copy.deepcopy(partial.model)
+        del result['Objects']['applications'][0]
+
+        result = partial.restore(result)
+
+        self.assertEqual(['app2', 'app3', 'app4'],
+                         _ids(result['Objects']['applications']))
+
+    def test_restore_after_list_of_owner_changed(self):
+        self.objects['applications'][0]['groups'] = [
+            _obj('group1'), {'servers': [_obj('server3')]}]
+        self.model['ObjectsCopy'] = copy.deepcopy(self.objects)
+        partial = partial_model.PartialModel(self.model, ['group1'])
+        result = copy.deepcopy(partial.model)
+        self.assertEqual(
+            ['server3'],
+            _ids(result['Objects']['applications'][0]['groups'][1][
+                'servers']))
+        self.assertEqual(
+            [], result['Objects']['applications'][0]['servers'])
+        del result['Objects']['applications'][0]['groups'][0]
+
+        result = partial.restore(result)
+
+        app1 = result['Objects']['applications'][0]
+        self.assertEqual(['server3'], _ids(app1['groups'][0]['servers']))
+        self.assertEqual(['server1', 'server2'], _ids(app1['servers']))
+        self.assertEqual(['app1', 'app2', 'app3', 'app4'],
+                         _ids(result['Objects']['applications']))
+
+    def test_restore_removed_owner_list(self):
+        partial = partial_model.PartialModel(self.model, ['server2'])
+        result = copy.deepcopy(partial.model)
+        result['Objects']['applications'][0]['servers'] = None
+
+        self.assertRaises(partial_model.RestoreError, partial.restore, result)
@@ -0,0 +1,57 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+
+import eventlet
+
+from murano.engine import process_pool
+from murano.tests.unit import base
+
+
+class TestProcessPool(base.MuranoTestCase):
+    def setUp(self):
+        super(TestProcessPool, self).setUp()
+        self.override_config('process_pool_size', 1, 'engine')
+        self.addCleanup(process_pool.shutdown)
+
+    def test_run_in_worker_process(self):
+        pool = process_pool.get_pool()
+
+        self.assertIs(pool, process_pool.get_pool())
+        self.assertNotEqual(os.getpid(), process_pool.run(os.getpid))
+        self.assertEqual((3, 1), process_pool.run(divmod, 7, 2))
+
+    def test_concurrent_calls(self):
+        threads = [eventlet.spawn(process_pool.run, divmod, i, 2)
+                   for i in range(5)]
+
+        self.assertEqual([divmod(i, 2) for i in range(5)],
+                         [t.wait() for t in threads])
+
+    def test_exception(self):
+        self.assertRaises(ValueError, process_pool.run, int, 'x')
+        self.assertEqual(1, process_pool.run(int, '1'))
+
+    def test_dead_worker_replaced(self):
+        pid = process_pool.run(os.getpid)
+        os.kill(pid, 9)
+        eventlet.sleep(0.1)
+
+        self.assertEqual(os.getpid(), process_pool.run(os.getpid))
+        self.assertNotIn(process_pool.run(os.getpid), (pid, os.getpid()))
+
+    def test_disabled(self):
+        self.override_config('process_pool_size', 0, 'engine')
+
+        self.assertIsNone(process_pool.get_pool())
+        self.assertEqual(os.getpid(), process_pool.run(os.getpid))
@@ -0,0 +1,87 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import six
+import testtools
+
+from murano.dsl import dsl_types
+from murano.engine import yaql_yaml_loader
+from murano.tests.unit import base
+
+
+CLASS_SOURCE = u"""Namespaces:
+  =: test
+
+Name: Class
+Properties:
+  name:
+    Contract: $.string().notNull()
+    Default: [1, {a: 2}]
+Methods:
+  foo:
+    Body:
+      - Return: $.name
+  bar:
+    Body:
+      - Return: !yaql 'str'
+      # comment"""
+
+
+class TestYaqlYamlLoader(base.MuranoTestCase):
+    def _load(self, parser, contents):
+        loader = yaql_yaml_loader.create_loader('1.4', parser)
+        return loader(contents, 'test.yaml')
+
+    def _flatten(self, value, result=None):
+        result = [] if result is None else result
+        position = getattr(value, 'source_file_position', None)
+        if position is not None:
+            result.append((
+                type(value).__name__, six.text_type(value),
+                position.start_line, position.start_column,
+                position.end_line, position.end_column))
+        if isinstance(value, dict):
+            for k, v in six.iteritems(value):
+                self._flatten(k, result)
+                self._flatten(v, result)
+        elif isinstance(value, list):
+            for t in value:
+                self._flatten(t, result)
+        elif position is None:
+            result.append(value)
+        return result
+
+    def test_load(self):
+        result = self._load(yaql_yaml_loader.PyParser, CLASS_SOURCE)
+        self.assertEqual(1, len(result))
+        cls = result[0]
+        self.assertIsInstance(cls, yaql_yaml_loader.MuranoPlDict)
+        self.assertEqual(1, cls.source_file_position.start_line)
+        expr = cls['Methods']['foo']['Body'][0]['Return']
+        self.assertIsInstance(expr, dsl_types.YaqlExpression)
+        self.assertEqual(12, expr.source_file_position.start_line)
+        self.assertEqual(17, expr.source_file_position.start_column)
+        self.assertEqual(
+            'str', six.text_type(cls['Methods']['bar']['Body'][0]['Return']))
+
+    @testtools.skipIf(yaql_yaml_loader.cyaml is None,
+                      'libyaml is not available')
+    def test_libyaml_parser(self):
+        self.assertIs(yaql_yaml_loader.CParser, yaql_yaml_loader.PARSER)
+        for contents in (CLASS_SOURCE, CLASS_SOURCE + u'\n',
+                         CLASS_SOURCE.encode('utf-8'),
+                         u'---\na: $.b\n---\nc:\n  - d\n  -'):
+            self.assertEqual(
+                self._flatten(self._load(
+                    yaql_yaml_loader.PyParser, contents)),
+                self._flatten(self._load(
+                    yaql_yaml_loader.CParser, contents)))
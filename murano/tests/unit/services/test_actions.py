@@ -62,7 +62,8 @@ class TestActions(test_base.MuranoTestCase):
             'token': 'test_token',
             'project_id': 'test_tenant',
             'user_id': 'test_user',
-            'id': mock_environment.id
+            'id': mock_environment.id,
+            'return_model_patch': True
         }
 
         task = actions.ActionServices.create_action_task(mock_action_name,
@@ -74,6 +75,30 @@ class TestActions(test_base.MuranoTestCase):
 
         self.assertEqual(expected_task, task)
 
+    def test_get_task_model(self):
+        description = {
+            'Objects': {
+                '?': {'id': 'old_id'},
+                'services': ['service1', 'service2']
+            },
+            'project_id': 'XXX'
+        }
+        expected = {
+            'Objects': {
+                '?': {'id': '456'},
+                'applications': ['service1', 'service2']
+            },
+            'project_id': 'XXX'
+        }
+
+        model = actions.ActionServices.get_task_model(description, '456')
+
+        self.assertEqual(expected, model)
+        self.assertEqual('old_id', description['Objects']['?']['id'])
+        self.assertIn('services', description['Objects'])
+        self.assertEqual(
+            expected, actions.ActionServices.get_task_model(expected, '456'))
+
     @mock.patch('murano.services.actions.models')
     def test_update_task(self, mock_models):
         mock_models.Task = mock.MagicMock()
@@ -25,6 +25,7 @@ from yaql.language import utils
 import murano.dsl.helpers as helpers
 import murano.dsl.namespace_resolver as ns_resolver
 import murano.dsl.yaql_expression as yaql_expression
+import murano.dsl.yaql_integration as yaql_integration
 from murano.tests.unit import base
 
 ROOT_CLASS = 'io.murano.Object'
@@ -149,6 +150,25 @@ class TestYaqlExpression(base.MuranoTestCase):
             parse_mock.side_effect = exceptions.YaqlLexicalException
             self.assertFalse(expr.is_expression('', self._version))
 
+    def test_parsed_expressions_shared(self):
+        yaql_integration.PARSED_EXPRESSIONS.clear()
+        with mock.patch('murano.dsl.yaql_integration.choose_yaql_engine',
+                        wraps=yaql_integration.choose_yaql_engine) as engine:
+            self.assertTrue(yaql_expression.YaqlExpression.is_expression(
+                '$.instance', self._version))
+            expr1 = yaql_expression.YaqlExpression(
+                '$.instance', self._version)
+            expr2 = yaql_expression.YaqlExpression(
+                '$.instance', self._version)
+            self.assertEqual(1, engine.call_count)
+
+            version = semantic_version.Version.coerce('1.3')
+            expr3 = yaql_expression.YaqlExpression('$.instance', version)
+            self.assertEqual(2, engine.call_count)
+
+        self.assertIs(expr1._parsed_expression, expr2._parsed_expression)
+        self.assertIsNot(expr1._parsed_expression, expr3._parsed_expression)
+
     def test_property(self):
         self.assertRaises(TypeError,
                           yaql_expression.YaqlExpression,
@@ -0,0 +1,137 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compares orphan detection strategies of ObjectStore.cleanup.
+
+Usage: python tools/benchmarks/garbage_collection.py [objects] [heap] [repeat]
+
+Loads a model of `objects` applications (200 by default) each owning a
+server and a volume, with half of the applications deleted since the last
+deployment, and measures ObjectStore.cleanup with and without explicit
+roots. `heap` (200000 by default) unrelated Python objects are allocated
+beforehand to emulate the heap of an engine worker, as gc.collect() cost
+depends on it. Prints the best time of `repeat` runs for each strategy.
+"""
+
+from __future__ import print_function
+
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from murano.dsl import helpers
+from murano.tests.unit.dsl.foundation import runner
+from murano.tests.unit.dsl.foundation import test_package_loader
+
+CLASS_DEFINITION = """
+Name: GCBenchmark
+
+Properties:
+  applications:
+    Contract: [$.class(GCBenchmarkApp)]
+
+---
+
+Name: GCBenchmarkApp
+
+Properties:
+  server:
+    Contract: $.class(GCBenchmarkResource)
+  volume:
+    Contract: $.class(GCBenchmarkResource)
+
+Methods:
+  .destroy:
+    Body:
+      - Return: null
+
+---
+
+Name: GCBenchmarkResource
+
+Properties:
+  name:
+    Contract: $.string()
+
+Methods:
+  .destroy:
+    Body:
+      - Return: null
+"""
+
+
+def _create_loader(directory):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    sys_loader = test_package_loader.TestPackageLoader(
+        os.path.join(root, 'meta', 'io.murano', 'Classes'), 'io.murano')
+    with open(os.path.join(directory, 'GCBenchmark.yaml'), 'w') as f:
+        f.write(CLASS_DEFINITION)
+    return test_package_loader.TestPackageLoader(
+        directory, 'tests', sys_loader)
+
+
+def _resource(name):
+    return {'?': {'id': name, 'type': 'GCBenchmarkResource'}, 'name': name}
+
+
+def _build_model(count):
+    applications = [{
+        '?': {'id': 'app{0}'.format(i), 'type': 'GCBenchmarkApp'},
+        'server': _resource('server{0}'.format(i)),
+        'volume': _resource('volume{0}'.format(i))
+    } for i in range(count)]
+    objects = {
+        '?': {'id': 'root', 'type': 'GCBenchmark'},
+        'applications': applications[::2]
+    }
+    objects_copy = copy.deepcopy(objects)
+    objects_copy['applications'] = applications
+    return {'Objects': objects, 'ObjectsCopy': objects_copy}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    heap = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    ballast = [{'value': [i]} for i in range(heap)]
+    directory = tempfile.mkdtemp()
+    try:
+        loader = _create_loader(directory)
+        model = _build_model(count)
+
+        def cleanup(with_roots):
+            r = runner.Runner('GCBenchmark', loader, {})
+            executor = r.executor
+            root = executor.load(copy.deepcopy(model))
+            roots = [r.root, root] if with_roots else None
+            with helpers.with_object_store(executor.object_store):
+                start = timeit.default_timer()
+                destroyed = executor.object_store.cleanup(roots)
+                elapsed = timeit.default_timer() - start
+            executor.finalize()
+            assert destroyed == count // 2 * 3, destroyed
+            return elapsed
+
+        for name, with_roots in (('gc', False), ('roots', True)):
+            best = min(cleanup(with_roots) for _ in range(repeat))
+            print('{0:>6}: {1:.2f} ms'.format(name, best * 1000))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        del ballast
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures the overhead of MuranoDslExecutor.invoke_method.
+
+Usage: python tools/benchmarks/invoke_method.py [calls] [repeat]
+
+Calls empty MuranoPL methods `calls` times (10000 by default) and prints
+the best per-call time of `repeat` runs for:
+
+* instance and static methods called from MuranoPL code,
+* an instance method invoked directly through the executor.
+
+For the direct calls it also prints the number of yaql contexts created
+per call.
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from yaql.language import contexts
+
+from murano.dsl import helpers
+from murano.tests.unit.dsl.foundation import runner
+from murano.tests.unit.dsl.foundation import test_package_loader
+
+CLASS_DEFINITION = """
+Name: InvokeBenchmark
+
+Methods:
+  noop:
+    Body:
+      - Return: null
+
+  staticNoop:
+    Usage: Static
+    Body:
+      - Return: null
+
+  testInstanceCalls:
+    Arguments:
+      - calls:
+          Contract: $.int().notNull()
+    Body:
+      - $i: 0
+      - While: $i < $calls
+        Do:
+          - $.noop()
+          - $i: $i + 1
+
+  testStaticCalls:
+    Arguments:
+      - calls:
+          Contract: $.int().notNull()
+    Body:
+      - $i: 0
+      - While: $i < $calls
+        Do:
+          - :InvokeBenchmark.staticNoop()
+          - $i: $i + 1
+"""
+
+
+def _create_runner(directory):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    sys_loader = test_package_loader.TestPackageLoader(
+        os.path.join(root, 'meta', 'io.murano', 'Classes'), 'io.murano')
+    with open(os.path.join(directory, 'InvokeBenchmark.yaml'), 'w') as f:
+        f.write(CLASS_DEFINITION)
+    loader = test_package_loader.TestPackageLoader(
+        directory, 'tests', sys_loader)
+    return runner.Runner('InvokeBenchmark', loader, {})
+
+
+def _count_contexts(func):
+    counter = [0]
+    original_init = contexts.ContextBase.__init__
+
+    def init(self, *args, **kwargs):
+        counter[0] += 1
+        original_init(self, *args, **kwargs)
+
+    contexts.ContextBase.__init__ = init
+    try:
+        func()
+    finally:
+        contexts.ContextBase.__init__ = original_init
+    return counter[0]
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        r = _create_runner(directory)
+        executor = r.executor
+        obj = r.root
+        method = obj.type.find_single_method('noop')
+
+        def direct_calls():
+            with helpers.with_object_store(executor.object_store):
+                for _ in range(calls):
+                    executor.invoke_method(
+                        method, obj, None, (), {}, invoke_action=False)
+
+        benchmarks = [
+            ('instance', lambda: r.testInstanceCalls(calls)),
+            ('static', lambda: r.testStaticCalls(calls)),
+            ('direct', direct_calls)
+        ]
+        for name, func in benchmarks:
+            func()
+            best = min(timeit.repeat(func, number=1, repeat=repeat))
+            print('{0:>9}: {1:.2f} us per call'.format(
+                name, best / calls * 1000000))
+        print('{0:>9}: {1:.1f} per call'.format(
+            'contexts', _count_contexts(direct_calls) / float(calls)))
+        executor.finalize(obj)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures the time of object model serialization.
+
+Usage: python tools/benchmarks/model_serialization.py [objects] [repeat]
+
+Serializes an object model of `objects` objects (1000 by default) which
+reference each other and prints the best time of `repeat` runs.
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from murano.dsl import executor
+from murano.dsl import serializer
+from murano.engine import execution_session
+from murano.tests.unit.dsl.foundation import object_model as om
+from murano.tests.unit.dsl.foundation import runner
+from murano.tests.unit.dsl.foundation import test_package_loader
+
+CLASS_DEFINITION = """
+Name: ModelBenchmark
+
+Properties:
+  name:
+    Contract: $.string().notNull()
+  tags:
+    Contract: [$.string()]
+  settings:
+    Contract:
+      $.string().notNull(): $.string()
+  parent:
+    Contract: $.class(ModelBenchmark)
+  peers:
+    Contract: [$.class(ModelBenchmark)]
+  children:
+    Contract: [$.class(ModelBenchmark)]
+"""
+
+
+def _create_loader(directory):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    sys_loader = test_package_loader.TestPackageLoader(
+        os.path.join(root, 'meta', 'io.murano', 'Classes'), 'io.murano')
+    with open(os.path.join(directory, 'ModelBenchmark.yaml'), 'w') as f:
+        f.write(CLASS_DEFINITION)
+    return test_package_loader.TestPackageLoader(
+        directory, 'tests', sys_loader)
+
+
+def _create_model(objects):
+    children = [
+        om.Object('ModelBenchmark', 'child-{0}'.format(i),
+                  name='child {0}'.format(i), tags=['a', 'b'],
+                  settings={'key': 'value'}, parent=om.Ref('root'),
+                  peers=[om.Ref('child-{0}'.format((i + 1) % (objects - 1)))])
+        for i in range(objects - 1)
+    ]
+    return {'Objects': om.build_model(om.Object(
+        'ModelBenchmark', 'root', name='root', children=children))}
+
+
+def main():
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    directory = tempfile.mkdtemp()
+    try:
+        model_executor = executor.MuranoDslExecutor(
+            _create_loader(directory), runner.TestContextManager({}),
+            execution_session.ExecutionSession())
+        root = model_executor.load(_create_model(objects))
+
+        def serialize():
+            serializer.serialize_model(root, model_executor)
+
+        best = min(timeit.repeat(serialize, number=1, repeat=repeat))
+        print('{0:.2f} ms per {1} objects'.format(best * 1000, objects))
+        model_executor.finalize()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
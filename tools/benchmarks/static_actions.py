@@ -0,0 +1,126 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures the latency of static action calls.
+
+Usage: python tools/benchmarks/static_actions.py [calls] [repeat]
+
+Calls a static action of a package loaded from a local directory (along
+with the core library from meta/) `calls` times (50 by default) through
+StaticActionExecutor with the static action executor pool disabled and
+enabled. Prints the best average per-call time of `repeat` runs for each.
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from murano.common import config
+from murano.common import engine
+
+MANIFEST = """
+Format: 1.4
+Type: Library
+FullName: io.murano.benchmarks
+Name: Static actions benchmark
+Classes:
+  io.murano.benchmarks.StaticActions: StaticActions.yaml
+"""
+
+CLASS_DEFINITION = """
+Namespaces:
+  =: io.murano.benchmarks
+  std: io.murano
+
+Name: StaticActions
+Extends: std:Application
+
+Methods:
+  summarize:
+    Usage: Static
+    Scope: Public
+    Arguments:
+      - values:
+          Contract: [$.int().notNull()]
+    Body:
+      - Return:
+          count: len($values)
+          sum: $values.sum()
+"""
+
+
+def _create_package(directory):
+    package_dir = os.path.join(directory, 'io.murano.benchmarks')
+    os.makedirs(os.path.join(package_dir, 'Classes'))
+    with open(os.path.join(package_dir, 'manifest.yaml'), 'w') as f:
+        f.write(MANIFEST)
+    with open(os.path.join(package_dir, 'Classes', 'StaticActions.yaml'),
+              'w') as f:
+        f.write(CLASS_DEFINITION)
+
+
+def _create_task(i):
+    return {
+        'action': {
+            'method': 'summarize',
+            'args': {'values': list(range(i % 10 + 1))},
+            'class_name': 'io.murano.benchmarks.StaticActions',
+            'pkg_name': 'io.murano.benchmarks',
+            'class_version': '=0'
+        },
+        'token': 'token',
+        'project_id': 'project',
+        'user_id': 'user',
+        'id': 'task{0}'.format(i)
+    }
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    directory = tempfile.mkdtemp()
+    try:
+        _create_package(directory)
+        config.CONF([], project='murano')
+        config.CONF.set_override(
+            'load_packages_from',
+            [os.path.join(root, 'meta'), directory], 'engine')
+        tasks = [_create_task(i) for i in range(calls)]
+
+        def run():
+            start = timeit.default_timer()
+            for task in tasks:
+                result = engine.StaticActionExecutor(task).execute()
+                assert result['count'] == len(task['action']['args'][
+                    'values']), result
+            elapsed = timeit.default_timer() - start
+            engine.get_static_action_pool().clear()
+            return elapsed / calls
+
+        for name, pool_size in (('no pool', 0), ('pool', 10)):
+            config.CONF.set_override(
+                'static_action_executor_pool_size', pool_size, 'engine')
+            engine.STATIC_ACTION_POOL = None
+            best = min(run() for _ in range(repeat))
+            print('{0:>8}: {1:.2f} ms'.format(name, best * 1000))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compares pure-Python and libyaml-backed MuranoPL class loading.
+
+Usage: python tools/benchmarks/yaml_loader.py [package_dir] [repeat]
+
+Loads every class of the package (meta/io.murano by default) with both
+parsers and prints the best time of `repeat` runs for each of them.
+YAQL expressions are parsed once before measuring so that only YAML
+processing is compared.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+from murano.engine import yaql_yaml_loader
+
+
+def _read_classes(package_dir):
+    result = []
+    for root, _, files in os.walk(os.path.join(package_dir, 'Classes')):
+        for name in sorted(files):
+            if name.endswith('.yaml'):
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    result.append((f.read(), path))
+    return result
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    package_dir = (sys.argv[1] if len(sys.argv) > 1
+                   else os.path.join(root, 'meta', 'io.murano'))
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    classes = _read_classes(package_dir)
+
+    parsers = [('pure-Python', yaql_yaml_loader.PyParser)]
+    if yaql_yaml_loader.cyaml is not None:
+        parsers.append(('libyaml', yaql_yaml_loader.CParser))
+    else:
+        print('libyaml is not available')
+
+    print('{0} classes from {1}'.format(len(classes), package_dir))
+    results = {}
+    for name, parser in parsers:
+        loader = yaql_yaml_loader.create_loader('1.4', parser)
+
+        def load_all():
+            for contents, file_id in classes:
+                loader(contents, file_id)
+
+        load_all()
+        results[name] = min(timeit.repeat(load_all, number=1, repeat=repeat))
+        print('{0:>12}: {1:.4f} s'.format(name, results[name]))
+
+    if len(results) == 2:
+        print('     speedup: {0:.2f}x'.format(
+            results['pure-Python'] / results['libyaml']))
+
+
+if __name__ == '__main__':
+    main()